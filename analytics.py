@@ -0,0 +1,170 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Replays directories of recorded Quoridor games across processes and computes statistics
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from records import replay_games
+
+
+class GameStats:
+    """
+    A class that adds up statistics over replayed games. Its size does not grow with the number of games,
+    so partial results from many workers can be merged.
+    """
+
+    def __init__(self):
+        """
+        Initializes data members of the GameStats class.
+        """
+        self._games = 0
+        self._moves = 0
+        self._lengths = {}  # number of games with each number of moves
+        self._fences = [0, 0, 0]  # fences placed by each player, indexed by player number
+        self._wins = [0, 0, 0]  # games won by each player; index 0 counts unfinished games
+        self._first_mover_wins = 0  # games won by the player that made the first move
+        self._rejected = 0  # moves the game did not allow when replayed
+        self._mismatches = 0  # games whose number of rejected moves differs from the recorded legality
+
+    def add_game(self, game, moves, rejected):
+        """
+        Adds a replayed game.
+        :param game: QuoridorGame after the replay
+        :param moves: list of (player, move, legal) tuples of the game
+        :param rejected: number of moves the game did not allow
+        """
+        self._games += 1
+        self._moves += len(moves)
+        self._lengths[len(moves)] = self._lengths.get(len(moves), 0) + 1
+        self._rejected += rejected
+        for player, move, legal in moves:
+            if move[0] != "p" and legal:
+                self._fences[player] += 1
+        recorded_rejected = sum(1 for record in moves if not record[2])
+        if recorded_rejected != rejected:
+            self._mismatches += 1
+        winner = game.get_current_state()
+        self._wins[winner] += 1
+        if moves and winner == moves[0][0]:
+            self._first_mover_wins += 1
+
+    def merge(self, other):
+        """
+        Adds the statistics of another GameStats to this one.
+        """
+        self._games += other._games
+        self._moves += other._moves
+        for length, count in other._lengths.items():
+            self._lengths[length] = self._lengths.get(length, 0) + count
+        for player in range(3):
+            self._fences[player] += other._fences[player]
+            self._wins[player] += other._wins[player]
+        self._first_mover_wins += other._first_mover_wins
+        self._rejected += other._rejected
+        self._mismatches += other._mismatches
+
+    def get_games(self):
+        """ Returns the number of games added. """
+        return self._games
+
+    def to_dict(self):
+        """
+        Returns the statistics as a JSON-ready dict.
+        """
+        games = self._games or 1
+        return {
+            "games": self._games,
+            "moves": self._moves,
+            "mean_length": self._moves / games,
+            "lengths": {str(length): count for length, count in sorted(self._lengths.items())},
+            "fences_per_game": {"player1": self._fences[1] / games, "player2": self._fences[2] / games},
+            "wins": {"player1": self._wins[1], "player2": self._wins[2], "unfinished": self._wins[0]},
+            "first_mover_win_rate": self._first_mover_wins / games,
+            "rejected_moves": self._rejected,
+            "legality_mismatches": self._mismatches,
+        }
+
+
+def analyze_chunk(task):
+    """
+    Replays the games that start in a byte range of an archive file and returns their GameStats.
+    :param task: tuple of (path, start, stop)
+    """
+    path, start, stop = task
+    stats = GameStats()
+    for game, moves, rejected in replay_games(path, start, stop):
+        stats.add_game(game, moves, rejected)
+    return stats
+
+
+def make_tasks(paths, chunk_size):
+    """
+    Splits archive files into (path, start, stop) byte ranges of about chunk_size bytes.
+    """
+    tasks = []
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_size):
+            tasks.append((path, start, start + chunk_size))
+    return tasks
+
+
+def run_pipeline(directory, pattern="*.qrg", processes=None, chunk_size=4 * 1024 * 1024,
+                 progress=None, progress_interval=1.0):
+    """
+    Replays every archive in a directory across a pool of processes and returns the merged statistics.
+    Archives are split into byte ranges so large files are shared between workers, and each worker
+    streams its range from a memory map, so memory use does not grow with the size of the archives.
+    :param directory: directory of game record archives
+    :param pattern: glob pattern of the archive file names
+    :param processes: number of worker processes; os.cpu_count() by default
+    :param chunk_size: bytes of archive replayed per task
+    :param progress: callable taking (tasks done, tasks, games done, games per second),
+                     called every progress_interval seconds
+    :param progress_interval: seconds between calls to progress
+    :return: GameStats of all the games
+    """
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    tasks = make_tasks(paths, chunk_size)
+    total = GameStats()
+    start_time = time.perf_counter()
+    last_report = start_time
+    done = 0
+    with multiprocessing.Pool(processes) as pool:
+        for stats in pool.imap_unordered(analyze_chunk, tasks):
+            total.merge(stats)
+            done += 1
+            now = time.perf_counter()
+            if progress is not None and (now - last_report >= progress_interval or done == len(tasks)):
+                progress(done, len(tasks), total.get_games(), total.get_games() / (now - start_time))
+                last_report = now
+    return total
+
+
+def main(argv=None):
+    """
+    Runs the pipeline from the command line and prints the statistics as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Compute statistics over directories of recorded Quoridor games.")
+    parser.add_argument("directory", help="directory of game record archives")
+    parser.add_argument("--pattern", default="*.qrg", help="glob pattern of the archive file names")
+    parser.add_argument("--processes", type=int, help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=4 * 1024 * 1024, help="bytes replayed per task")
+    args = parser.parse_args(argv)
+
+    def report(done, tasks, games, rate):
+        print("%d/%d chunks, %d games, %.0f games/s" % (done, tasks, games, rate), file=sys.stderr)
+
+    stats = run_pipeline(args.directory, args.pattern, args.processes, args.chunk_size, report)
+    print(json.dumps(stats.to_dict(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,498 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Steps and evaluates many Quoridor games at once with NumPy arrays
+
+import numpy as np
+
+from quoridor import QuoridorGame, BOARD_SIZE, UNREACHABLE, square_index, square_coordinates
+
+SQUARES = BOARD_SIZE * BOARD_SIZE
+
+# Actions: 0 to 80 move the pawn to the square, 81 to 161 place an h fence on square - 81,
+# 162 to 242 place a v fence on square - 162
+H_FENCE_ACTIONS = SQUARES
+V_FENCE_ACTIONS = 2 * SQUARES
+ACTIONS = 3 * SQUARES
+
+# Directions in the tables below: up, down, left, right
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+_PERPENDICULAR = ((LEFT, RIGHT), (LEFT, RIGHT), (UP, DOWN), (UP, DOWN))
+
+# _NEIGHBORS[square, direction] is the square one step away, or -1 off the board.
+# _BLOCKERS[square, direction] is the column of the fence array (h fences then v fences, then one
+# always-set column) whose fence blocks that step; steps off the board point at the always-set column.
+_NEIGHBORS = np.full((SQUARES, 4), -1, dtype=np.int64)
+_BLOCKERS = np.full((SQUARES, 4), 2 * SQUARES, dtype=np.int64)
+for _square in range(SQUARES):
+    _x, _y = square_coordinates(_square)
+    if _y > 0:
+        _NEIGHBORS[_square, UP] = _square - BOARD_SIZE
+        _BLOCKERS[_square, UP] = _square  # h fence on the current cell
+    if _y < BOARD_SIZE - 1:
+        _NEIGHBORS[_square, DOWN] = _square + BOARD_SIZE
+        _BLOCKERS[_square, DOWN] = _square + BOARD_SIZE  # h fence on the cell downwards
+    if _x > 0:
+        _NEIGHBORS[_square, LEFT] = _square - 1
+        _BLOCKERS[_square, LEFT] = SQUARES + _square  # v fence on the current cell
+    if _x < BOARD_SIZE - 1:
+        _NEIGHBORS[_square, RIGHT] = _square + 1
+        _BLOCKERS[_square, RIGHT] = SQUARES + _square + 1  # v fence on the cell to the right
+
+# Goal row of each player (index 0 is Player1)
+_GOAL_ROWS = np.array([BOARD_SIZE - 1, 0])
+
+# Compact encoding of a position, one uint8 row per position: the squares of Player1's and Player2's pawns,
+# the fences they have left, the player to move, then the h fence and v fence bitmasks of QuoridorGame
+# (bit y * 9 + x set for a fence on that cell) as little-endian bytes
+PAWNS_COLUMN = 0
+FENCES_LEFT_COLUMN = 2
+TURN_COLUMN = 4
+FENCE_BYTES = (SQUARES + 7) // 8
+H_FENCES_COLUMN = 5
+V_FENCES_COLUMN = H_FENCES_COLUMN + FENCE_BYTES
+ENCODED_BYTES = V_FENCES_COLUMN + FENCE_BYTES
+
+
+class CrossCheckError(Exception):
+    """ Raised in cross-check mode when the batch disagrees with QuoridorGame. """
+    pass
+
+
+def reachable(h_fences, v_fences, start):
+    """
+    Returns a (N, 9, 9) bool array of the squares reachable from the start squares of each game.
+    :param h_fences: (N, 9, 9) bool array of horizontal fences, indexed [game, row, column]
+    :param v_fences: (N, 9, 9) bool array of vertical fences
+    :param start: (N, 9, 9) bool array of the squares to start from
+    """
+    # A step between two rows is open if the lower cell has no h fence; between two columns if the right cell
+    # has no v fence
+    open_rows = ~h_fences[:, 1:, :]
+    open_columns = ~v_fences[:, :, 1:]
+    region = start.copy()
+    while True:
+        grown = region.copy()
+        grown[:, :-1, :] |= region[:, 1:, :] & open_rows  # upward
+        grown[:, 1:, :] |= region[:, :-1, :] & open_rows  # downward
+        grown[:, :, :-1] |= region[:, :, 1:] & open_columns  # leftward
+        grown[:, :, 1:] |= region[:, :, :-1] & open_columns  # rightward
+        if np.array_equal(grown, region):
+            return region
+        region = grown
+
+
+def pawn_moves(pawns, fences, player):
+    """
+    Returns a (N, 81) bool array of the squares a player can move its pawn to in each game.
+    :param pawns: (N, 2) int array of the squares of Player1's and Player2's pawns
+    :param fences: (N, 163) bool array of h fences, v fences and an always-set column
+    :param player: (N,) int array of the player in each game: 0 for Player1, 1 for Player2
+    """
+    size = len(pawns)
+    games = np.arange(size)
+    squares = pawns[games, player]
+    opponents = pawns[games, 1 - player]
+    steps = ~np.take_along_axis(fences, _BLOCKERS[squares], axis=1)
+    opponent_steps = ~np.take_along_axis(fences, _BLOCKERS[opponents], axis=1)
+    targets = _NEIGHBORS[squares]
+    hops = _NEIGHBORS[opponents]
+
+    mask = np.zeros((size, SQUARES), dtype=bool)
+    for direction in range(4):
+        open_step = steps[:, direction]
+        face_to_face = open_step & (targets[:, direction] == opponents)
+        # Fence-cleared adjacent moves
+        move = open_step & ~face_to_face
+        mask[games[move], targets[move, direction]] = True
+        # Hop over the opponent pawn, or move diagonally if the hop is blocked
+        hop = face_to_face & opponent_steps[:, direction]
+        mask[games[hop], hops[hop, direction]] = True
+        blocked = face_to_face & ~opponent_steps[:, direction]
+        for side in _PERPENDICULAR[direction]:
+            diagonal = blocked & opponent_steps[:, side]
+            mask[games[diagonal], hops[diagonal, side]] = True
+    return mask
+
+
+def shortest_paths(fences, goals, starts):
+    """
+    Breadth-first search from the goal squares of every game at once, one layer of squares per iteration,
+    until the start square of every game is reached or cut off. Pawns are ignored, as in the distance maps
+    of QuoridorGame.
+    :param fences: (N, 163) bool array of h fences, v fences and an always-set column
+    :param goals: (N, 81) bool array of the goal squares of each game
+    :param starts: (N,) int array of the square to search for in each game
+    :return: tuple of a (N,) int32 array of the distance from the start square to the nearest goal square,
+             or UNREACHABLE, and a (N,) int64 array of the number of shortest paths from the start square
+    """
+    size = len(fences)
+    # A step between two rows is open if the lower cell has no h fence; between two columns if the right cell
+    # has no v fence
+    open_rows = ~fences[:, :SQUARES].reshape(size, BOARD_SIZE, BOARD_SIZE)[:, 1:, :]
+    open_columns = ~fences[:, SQUARES:2 * SQUARES].reshape(size, BOARD_SIZE, BOARD_SIZE)[:, :, 1:]
+    frontier = goals.reshape(size, BOARD_SIZE, BOARD_SIZE)
+    unvisited = ~frontier
+    paths = frontier.astype(np.int64)  # shortest paths from the squares of the frontier, 0 elsewhere
+    rows, columns = np.divmod(starts, BOARD_SIZE)
+    games = np.arange(size)  # the games still searching, as indexes into the arrays returned
+    distances = np.where(frontier[games, rows, columns], 0, UNREACHABLE).astype(np.int32)
+    counts = paths[games, rows, columns]
+    searching = distances == UNREACHABLE
+    distance = 0
+    while searching.any():
+        if searching.sum() * 2 < len(games):
+            # Drop the games that are done, so long searches do not drag the whole batch along
+            open_rows, open_columns = open_rows[searching], open_columns[searching]
+            unvisited, paths = unvisited[searching], paths[searching]
+            rows, columns, games = rows[searching], columns[searching], games[searching]
+            searching = searching[searching]
+        distance += 1
+        # Every shortest path from a square of the next layer continues through a neighbor in the frontier
+        incoming = np.zeros_like(paths)
+        incoming[:, :-1, :] += np.where(open_rows, paths[:, 1:, :], 0)  # from the row below
+        incoming[:, 1:, :] += np.where(open_rows, paths[:, :-1, :], 0)  # from the row above
+        incoming[:, :, :-1] += np.where(open_columns, paths[:, :, 1:], 0)  # from the right
+        incoming[:, :, 1:] += np.where(open_columns, paths[:, :, :-1], 0)  # from the left
+        incoming *= unvisited
+        unvisited &= incoming == 0
+        paths = incoming
+        reached = paths[np.arange(len(games)), rows, columns]
+        found = searching & (reached > 0)
+        distances[games[found]] = distance
+        counts[games[found]] = reached[found]
+        # Games whose frontier is empty have cut the start square off
+        searching &= ~found & paths.any(axis=(1, 2))
+    return distances, counts
+
+
+def encode_positions(games):
+    """
+    Returns the (N, 27) uint8 array of the compact encoding of a list of QuoridorGames.
+    """
+    encoded = np.zeros((len(games), ENCODED_BYTES), dtype=np.uint8)
+    for i, game in enumerate(games):
+        if game.get_board_size() != BOARD_SIZE or game.get_player_count() != 2:
+            raise ValueError("the encoded games are standard two-player games")
+        row = encoded[i]
+        row[PAWNS_COLUMN:PAWNS_COLUMN + 2] = (game.get_pawn_square(1), game.get_pawn_square(2))
+        row[FENCES_LEFT_COLUMN:FENCES_LEFT_COLUMN + 2] = (game.get_fences_left(1), game.get_fences_left(2))
+        row[TURN_COLUMN] = game.get_current_turn()
+        row[H_FENCES_COLUMN:V_FENCES_COLUMN] = np.frombuffer(game.get_h_fences().to_bytes(FENCE_BYTES, "little"),
+                                                             dtype=np.uint8)
+        row[V_FENCES_COLUMN:] = np.frombuffer(game.get_v_fences().to_bytes(FENCE_BYTES, "little"), dtype=np.uint8)
+    return encoded
+
+
+def decode_positions(encoded):
+    """
+    Decodes an array of compactly encoded positions.
+    :param encoded: (N, 27) uint8 array
+    :return: tuple of the (N, 2) int64 array of pawn squares, the (N, 163) bool fence array with its
+             always-set column, the (N, 2) int8 array of fences left and the (N,) int8 array of the player to move
+    """
+    encoded = np.asarray(encoded, dtype=np.uint8)
+    if encoded.ndim != 2 or encoded.shape[1] != ENCODED_BYTES:
+        raise ValueError("encoded positions must be an (N, %d) array" % ENCODED_BYTES)
+    pawns = encoded[:, PAWNS_COLUMN:PAWNS_COLUMN + 2].astype(np.int64)
+    fences = np.ones((len(encoded), 2 * SQUARES + 1), dtype=bool)
+    fences[:, :SQUARES] = np.unpackbits(encoded[:, H_FENCES_COLUMN:V_FENCES_COLUMN], axis=1,
+                                        count=SQUARES, bitorder="little")
+    fences[:, SQUARES:2 * SQUARES] = np.unpackbits(encoded[:, V_FENCES_COLUMN:], axis=1,
+                                                   count=SQUARES, bitorder="little")
+    fences_left = encoded[:, FENCES_LEFT_COLUMN:FENCES_LEFT_COLUMN + 2].astype(np.int8)
+    turn = encoded[:, TURN_COLUMN].astype(np.int8)
+    return pawns, fences, fences_left, turn
+
+
+def _evaluate(pawns, fences):
+    """
+    Returns the features of evaluate_positions() for the pawn and fence arrays of N games.
+    """
+    size = len(pawns)
+    # Both players' searches run as one batch of 2N games
+    goals = np.zeros((2, size, BOARD_SIZE, BOARD_SIZE), dtype=bool)
+    for player in range(2):
+        goals[player, :, _GOAL_ROWS[player], :] = True
+    distances, counts = shortest_paths(np.concatenate((fences, fences)), goals.reshape(2 * size, SQUARES),
+                                       pawns.T.reshape(-1))
+    path_lengths = distances.reshape(2, size).T
+    path_counts = counts.reshape(2, size).T
+    mobility = np.empty((size, 2), dtype=np.int32)
+    for player in range(2):
+        mobility[:, player] = pawn_moves(pawns, fences, np.full(size, player)).sum(axis=1)
+    return {
+        "path_lengths": np.ascontiguousarray(path_lengths),
+        "path_counts": np.ascontiguousarray(path_counts),
+        "mobility": mobility,
+    }
+
+
+def evaluate_positions(positions, chunk_size=4096):
+    """
+    Computes shortest-path features of many positions at once with a vectorized breadth-first search.
+    :param positions: list of QuoridorGames, or (N, 27) uint8 array of compactly encoded positions
+    :param chunk_size: positions searched together, at least 1; bounds the memory of the search
+    :return: dict of (N, 2) arrays, one column per player:
+             "path_lengths", int32: moves on the shortest path from the pawn to the goal baseline,
+             ignoring pawns, or UNREACHABLE if the pawn is cut off;
+             "path_counts", int64: number of shortest paths from the pawn to the goal baseline;
+             "mobility", int32: number of squares the pawn could move to if it were the player's turn
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if not isinstance(positions, np.ndarray):
+        positions = encode_positions(positions)
+    pawns, fences, _, _ = decode_positions(positions)
+    chunks = [_evaluate(pawns[start:start + chunk_size], fences[start:start + chunk_size])
+              for start in range(0, len(pawns), chunk_size)]
+    if not chunks:
+        return _evaluate(pawns, fences)
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+class BatchQuoridor:
+    """
+    A class that holds N Quoridor games in NumPy arrays and computes legal moves and applies moves
+    for all of them at once, with the same rules as QuoridorGame.
+    """
+
+    def __init__(self, games, cross_check=False):
+        """
+        Initializes data members of the BatchQuoridor class with N games at the starting position.
+        :param games: number of games N
+        :param cross_check: if True, every game is mirrored by a QuoridorGame and every legal-move mask
+                            and step is compared against it; a disagreement raises CrossCheckError
+        """
+        self._size = games
+        self._pawns = np.zeros((games, 2), dtype=np.int64)  # square of Player1's and Player2's pawn
+        self._fences = np.zeros((games, 2 * SQUARES + 1), dtype=bool)  # h fences, v fences, always-set column
+        self._fences_left = np.zeros((games, 2), dtype=np.int8)
+        self._turn = np.zeros(games, dtype=np.int8)  # 1 or 2
+        self._state = np.zeros(games, dtype=np.int8)  # 0 unfinished, 1 or 2 for the winner
+        self._cross_check = cross_check
+        self._games = [None] * games if cross_check else None
+        self.reset()
+
+    @classmethod
+    def from_games(cls, games, cross_check=False):
+        """
+        Returns a BatchQuoridor holding the positions of a list of QuoridorGames.
+        """
+        batch = cls(len(games), cross_check)
+        for i, game in enumerate(games):
+            batch.load_game(i, game)
+        return batch
+
+    def get_size(self):
+        """ Returns the number of games N. """
+        return self._size
+
+    def get_turn(self):
+        """ Returns the (N,) array of the player to move in each game. """
+        return self._turn
+
+    def get_state(self):
+        """ Returns the (N,) array of game states: 0 unfinished, 1 or 2 for the winner. """
+        return self._state
+
+    def get_pawns(self):
+        """ Returns the (N, 2) array of the squares (y * 9 + x) of Player1's and Player2's pawns. """
+        return self._pawns
+
+    def get_fences_left(self):
+        """ Returns the (N, 2) array of the fences Player1 and Player2 have left. """
+        return self._fences_left
+
+    def get_h_fences(self):
+        """ Returns the (N, 81) bool array of horizontal fences. """
+        return self._fences[:, :SQUARES]
+
+    def get_v_fences(self):
+        """ Returns the (N, 81) bool array of vertical fences. """
+        return self._fences[:, SQUARES:2 * SQUARES]
+
+    def reset(self, indexes=None):
+        """
+        Resets games to the starting position.
+        :param indexes: games to reset; all games by default
+        """
+        if indexes is None:
+            indexes = np.arange(self._size)
+        self._pawns[indexes, 0] = square_index((4, 0))
+        self._pawns[indexes, 1] = square_index((4, 8))
+        self._fences[indexes, :] = False
+        self._fences[indexes, 2 * SQUARES] = True
+        self._fences_left[indexes, :] = 10
+        self._turn[indexes] = 1
+        self._state[indexes] = 0
+        if self._cross_check:
+            for i in np.atleast_1d(indexes):
+                self._games[i] = QuoridorGame()
+
+    def encode(self):
+        """
+        Returns the (N, 27) uint8 array of the compact encoding of the positions, as read by evaluate_positions().
+        """
+        encoded = np.zeros((self._size, ENCODED_BYTES), dtype=np.uint8)
+        encoded[:, PAWNS_COLUMN:PAWNS_COLUMN + 2] = self._pawns
+        encoded[:, FENCES_LEFT_COLUMN:FENCES_LEFT_COLUMN + 2] = self._fences_left
+        encoded[:, TURN_COLUMN] = self._turn
+        encoded[:, H_FENCES_COLUMN:V_FENCES_COLUMN] = np.packbits(self._fences[:, :SQUARES], axis=1,
+                                                                  bitorder="little")
+        encoded[:, V_FENCES_COLUMN:] = np.packbits(self._fences[:, SQUARES:2 * SQUARES], axis=1, bitorder="little")
+        return encoded
+
+    def evaluate(self):
+        """
+        Returns the shortest-path features of every game, as evaluate_positions() does.
+        """
+        return _evaluate(self._pawns, self._fences)
+
+    def load_game(self, index, game):
+        """
+        Copies the position of a QuoridorGame into the game at the index. The QuoridorGame is left untouched;
+        a cross-checked batch mirrors the position in a copy of its own.
+        """
+        if game.get_board_size() != BOARD_SIZE or game.get_player_count() != 2:
+            raise ValueError("the batched games are standard two-player games")
+        self._pawns[index] = (game.get_pawn_square(1), game.get_pawn_square(2))
+        self._fences[index, :] = False
+        self._fences[index, 2 * SQUARES] = True
+        board = game.get_board()
+        for row in board:
+            for cell in row:
+                square = square_index(cell.get_coordinates())
+                self._fences[index, square] = cell.get_h_fence() == 1
+                self._fences[index, SQUARES + square] = cell.get_v_fence() == 1
+        self._fences_left[index] = (game.get_fences_left(1), game.get_fences_left(2))
+        self._turn[index] = game.get_current_turn()
+        self._state[index] = game.get_current_state()
+        if self._cross_check:
+            self._games[index] = QuoridorGame.from_game_state(game.get_game_state())
+
+    def pawn_move_mask(self):
+        """
+        Returns a (N, 81) bool array of the squares the player to move can move its pawn to in each game.
+        Finished games have no moves.
+        """
+        player = self._turn.astype(np.int64) - 1
+        mask = pawn_moves(self._pawns, self._fences, player)
+        mask[self._state != 0] = False
+
+        if self._cross_check:
+            for i, game in enumerate(self._games):
+                expected = np.zeros(SQUARES, dtype=bool)
+                if game.get_current_state() == 0:
+                    for coordinates in game.valid_moves():
+                        expected[square_index(coordinates)] = True
+                if not np.array_equal(mask[i], expected):
+                    raise CrossCheckError("pawn moves differ in game %d" % i)
+        return mask
+
+    def fence_mask(self):
+        """
+        Returns a (N, 162) bool array of the fences the player to move may place in each game:
+        h fences on squares 0 to 80 then v fences. Fences are only checked against the edges of the board,
+        fences already placed and fences left; step() also rejects fences that cut a pawn off from its goal.
+        """
+        games = np.arange(self._size)
+        player = self._turn.astype(np.int64) - 1
+        mask = ~self._fences[:, :2 * SQUARES]
+        mask[:, :BOARD_SIZE] = False  # h fences on the top edge
+        mask[:, SQUARES:2 * SQUARES:BOARD_SIZE] = False  # v fences on the left edge
+        mask &= ((self._fences_left[games, player] > 0) & (self._state == 0))[:, None]
+        return mask
+
+    def action_mask(self):
+        """
+        Returns a (N, 243) bool array of the actions of step(): pawn moves from pawn_move_mask()
+        followed by the fences from fence_mask().
+        """
+        return np.concatenate((self.pawn_move_mask(), self.fence_mask()), axis=1)
+
+    def _cuts_path(self, games, fences):
+        """
+        Returns a bool array of whether placing the fences (columns of the fence array) in the games
+        would leave a pawn without a path to its goal baseline.
+        """
+        h_fences = self._fences[games, :SQUARES].copy()
+        v_fences = self._fences[games, SQUARES:2 * SQUARES].copy()
+        is_h = fences < SQUARES
+        h_fences[is_h, fences[is_h]] = True
+        v_fences[~is_h, fences[~is_h] - SQUARES] = True
+        h_fences = h_fences.reshape(-1, BOARD_SIZE, BOARD_SIZE)
+        v_fences = v_fences.reshape(-1, BOARD_SIZE, BOARD_SIZE)
+        cuts = np.zeros(len(games), dtype=bool)
+        for player in range(2):
+            start = np.zeros((len(games), SQUARES), dtype=bool)
+            start[np.arange(len(games)), self._pawns[games, player]] = True
+            region = reachable(h_fences, v_fences, start.reshape(-1, BOARD_SIZE, BOARD_SIZE))
+            cuts |= ~region[:, _GOAL_ROWS[player], :].any(axis=1)
+        return cuts
+
+    def step(self, actions):
+        """
+        Makes one move in every game.
+        :param actions: (N,) int array of actions: 0 to 80 move the pawn to the square (y * 9 + x),
+                        81 to 161 place an h fence on square - 81, 162 to 242 place a v fence on square - 162
+        :return: (N,) bool array of whether each move was legal and made; illegal moves and moves in
+                 finished games change nothing
+        """
+        requested = np.asarray(actions, dtype=np.int64)
+        games = np.arange(self._size)
+        player = self._turn.astype(np.int64) - 1
+        # Actions out of range are illegal; they are replaced so they can still be used as indexes
+        in_range = (requested >= 0) & (requested < ACTIONS)
+        actions = np.where(in_range, requested, 0)
+        is_pawn = in_range & (actions < SQUARES)
+        legal = np.zeros(self._size, dtype=bool)
+
+        # Pawn moves
+        pawn_mask = self.pawn_move_mask()
+        pawn_games = games[is_pawn]
+        pawn_legal = pawn_mask[pawn_games, actions[pawn_games]]
+        moved = pawn_games[pawn_legal]
+        self._pawns[moved, player[moved]] = actions[moved]
+        legal[moved] = True
+        won = moved[actions[moved] // BOARD_SIZE == _GOAL_ROWS[player[moved]]]
+        self._state[won] = self._turn[won]
+
+        # Fences
+        fence_games = games[in_range & ~is_pawn]
+        fences = actions[fence_games] - SQUARES
+        fence_legal = self.fence_mask()[fence_games, fences]
+        fence_games, fences = fence_games[fence_legal], fences[fence_legal]
+        keep = ~self._cuts_path(fence_games, fences)
+        fence_games, fences = fence_games[keep], fences[keep]
+        self._fences[fence_games, fences] = True
+        self._fences_left[fence_games, player[fence_games]] -= 1
+        legal[fence_games] = True
+
+        # Switch to next player's turn unless the move won the game
+        switch = legal & (self._state == 0)
+        self._turn[switch] = 3 - self._turn[switch]
+
+        if self._cross_check:
+            self._check_step(requested, legal)
+        return legal
+
+    def _check_step(self, actions, legal):
+        """
+        Makes the same moves in the mirrored QuoridorGames and compares the results.
+        """
+        for i, game in enumerate(self._games):
+            action = int(actions[i])
+            player = game.get_current_turn()
+            if 0 <= action < SQUARES:
+                expected = game.move_pawn(player, square_coordinates(action))
+            elif SQUARES <= action < ACTIONS:
+                fence_type = "h" if action < V_FENCE_ACTIONS else "v"
+                expected = game.place_fence(player, fence_type, square_coordinates((action - SQUARES) % SQUARES))
+            else:
+                expected = False
+            if expected != bool(legal[i]):
+                raise CrossCheckError("legality of action %d differs in game %d" % (action, i))
+            if (game.get_current_turn() != self._turn[i] or game.get_current_state() != self._state[i] or
+                    (game.get_pawn_square(1), game.get_pawn_square(2)) != tuple(self._pawns[i]) or
+                    (game.get_fences_left(1), game.get_fences_left(2)) != tuple(self._fences_left[i])):
+                raise CrossCheckError("position differs in game %d after action %d" % (i, action))
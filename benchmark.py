@@ -0,0 +1,305 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Benchmarks the hot paths of the Quoridor rules engine on seeded positions
+
+import argparse
+import copy
+import json
+import platform
+import random
+import sys
+import time
+
+from quoridor import QuoridorGame, BOARD_SIZE
+
+
+def random_move(game, rng, fence_rate=0.3):
+    """
+    Returns a random legal move for the player to move, as a make_move tuple.
+    """
+    player = game.get_current_turn()
+    if game.get_fences_left(player) > 0 and rng.random() < fence_rate:
+        fences = game.valid_fences()
+        if fences:
+            return rng.choice(fences)
+    return "p", rng.choice(game.valid_moves())
+
+
+def make_positions(seed, count, size=BOARD_SIZE, players=2):
+    """
+    Returns a list of count unfinished positions reached by random play from the seed,
+    on a size x size board with the number of players.
+    The same seed and count always give the same positions.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = QuoridorGame(size, players)
+        for i in range(rng.randrange(0, 40)):
+            game.make_move(game.get_current_turn(), random_move(game, rng))
+            if game.get_current_state() != 0:
+                break
+        if game.get_current_state() == 0:
+            positions.append(game)
+    return positions
+
+
+def player_pawns(game):
+    """
+    Returns the coordinates of the pawn of the player to move and of the opponent pawn.
+    """
+    player = game.get_current_turn()
+    coordinates = game.get_geometry().square_coordinates
+    return (coordinates[game.get_pawn_square(player)],
+            coordinates[game.get_pawn_square(game.next_player(player))])
+
+
+def _time_calls(calls, repeat, setup=None):
+    """
+    Times a list of no-argument callables, repeat times, and returns the fastest total in seconds.
+    :param setup: no-argument callable run before each repeat, outside the timing
+    """
+    best = None
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for call in calls:
+            call()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def bench_pos_adjacent_moves(positions, repeat):
+    """ Times QuoridorGame.pos_adjacent_moves on the pawn of the player to move. """
+    calls = []
+    for game in positions:
+        pawn = player_pawns(game)[0]
+        size = game.get_board_size()
+        calls.append(lambda pawn=pawn, size=size: QuoridorGame.pos_adjacent_moves(pawn, size))
+    return len(calls), _time_calls(calls, repeat)
+
+
+def bench_fence_checker(positions, repeat):
+    """ Times QuoridorGame.fence_checker on the adjacent moves of the pawn of the player to move. """
+    calls = []
+    for game in positions:
+        pawn = player_pawns(game)[0]
+        adjacent = QuoridorGame.pos_adjacent_moves(pawn, game.get_board_size())
+        calls.append(lambda game=game, pawn=pawn, adjacent=adjacent: game.fence_checker(pawn, list(adjacent)))
+    return len(calls), _time_calls(calls, repeat)
+
+
+def bench_pawn_interaction(positions, repeat):
+    """ Times QuoridorGame.pawn_interaction on the Fence-cleared moves of the pawn of the player to move. """
+    calls = []
+    for game in positions:
+        pawn, opponent = player_pawns(game)
+        cleared = game.fence_checker(pawn, QuoridorGame.pos_adjacent_moves(pawn, game.get_board_size()))
+        calls.append(lambda game=game, pawn=pawn, opponent=opponent, cleared=cleared:
+                     game.pawn_interaction(pawn, opponent, list(cleared)))
+    return len(calls), _time_calls(calls, repeat)
+
+
+def _fresh_copies(positions):
+    """
+    Returns deep copies of the positions with their legal-move caches cleared, so the timed calls
+    generate the moves instead of looking them up.
+    """
+    copies = [copy.deepcopy(game) for game in positions]
+    for game in copies:
+        game._clear_move_cache()
+    return copies
+
+
+def bench_valid_moves(positions, repeat):
+    """ Times QuoridorGame.valid_moves with the legal-move cache cleared before every repeat. """
+    calls = [game.valid_moves for game in positions]
+
+    def clear_caches():
+        for game in positions:
+            game._clear_move_cache()
+
+    return len(calls), _time_calls(calls, repeat, clear_caches)
+
+
+def bench_valid_moves_cached(positions, repeat):
+    """ Times QuoridorGame.valid_moves when the moves of the position are already cached. """
+    calls = [game.valid_moves for game in positions]
+    for call in calls:
+        call()
+    return len(calls), _time_calls(calls, repeat)
+
+
+def bench_move_pawn(positions, repeat):
+    """
+    Times QuoridorGame.move_pawn with a legal move, on a fresh copy of each position for every call,
+    so the legality check generates the pawn moves.
+    """
+    best = None
+    calls = 0
+    rng = random.Random(0)
+    moves = [(game.get_current_turn(), rng.choice(game.valid_moves())) for game in positions]
+    for i in range(repeat):
+        copies = _fresh_copies(positions)
+        start = time.perf_counter()
+        for game, (player, coordinates) in zip(copies, moves):
+            game.move_pawn(player, coordinates)
+        elapsed = time.perf_counter() - start
+        calls = len(copies)
+        if best is None or elapsed < best:
+            best = elapsed
+    return calls, best
+
+
+def bench_place_fence(positions, repeat):
+    """ Times QuoridorGame.place_fence with a legal fence, on a fresh copy of each position for every call. """
+    rng = random.Random(0)
+    fences = []
+    for game in positions:
+        candidates = game.valid_fences()
+        if candidates:
+            fences.append((game, game.get_current_turn(), rng.choice(candidates)))
+    best = None
+    for i in range(repeat):
+        games = _fresh_copies([game for game, player, fence in fences])
+        copies = [(copy, player, fence) for copy, (game, player, fence) in zip(games, fences)]
+        start = time.perf_counter()
+        for game, player, (fence_type, coordinates) in copies:
+            game.place_fence(player, fence_type, coordinates)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return len(fences), best
+
+
+def bench_random_games(positions, repeat):
+    """ Times whole games of random play, one per position seed, from the starting position. """
+    best = None
+    games = len(positions) // 10 or 1
+    size, players = positions[0].get_board_size(), positions[0].get_player_count()
+    for i in range(repeat):
+        start = time.perf_counter()
+        for seed in range(games):
+            rng = random.Random(seed)
+            game = QuoridorGame(size, players)
+            while game.get_current_state() == 0:
+                move = random_move(game, rng, fence_rate=0.1)
+                if move[0] == "p":
+                    game.move_pawn(game.get_current_turn(), move[1])
+                else:
+                    game.place_fence(game.get_current_turn(), move[0], move[1])
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return games, best
+
+
+BENCHMARKS = {
+    "pos_adjacent_moves": bench_pos_adjacent_moves,
+    "fence_checker": bench_fence_checker,
+    "pawn_interaction": bench_pawn_interaction,
+    "valid_moves": bench_valid_moves,
+    "valid_moves_cached": bench_valid_moves_cached,
+    "move_pawn": bench_move_pawn,
+    "place_fence": bench_place_fence,
+    "random_games": bench_random_games,
+}
+
+
+def run_benchmarks(seed=0, positions=500, repeat=5, names=None, size=BOARD_SIZE, players=2):
+    """
+    Runs the benchmarks on the seeded positions and returns the results as a JSON-ready dict.
+    Each benchmark reports the number of calls and the time per call of its fastest repeat.
+    """
+    games = make_positions(seed, positions, size, players)
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        calls, elapsed = benchmark(games, repeat)
+        results[name] = {"calls": calls, "seconds": elapsed, "us_per_call": elapsed / calls * 1e6}
+    return {
+        "seed": seed,
+        "positions": positions,
+        "repeat": repeat,
+        "size": size,
+        "players": players,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+# Settings that must match for two runs to be compared, with the value of a baseline that predates them
+COMPARED_SETTINGS = (("seed", None), ("positions", None), ("size", BOARD_SIZE), ("players", 2))
+
+
+def compare(baseline, current, threshold):
+    """
+    Compares two benchmark result dicts and returns a list of (name, baseline us, current us, change)
+    for the benchmarks that got slower by more than the threshold (0.1 is 10%).
+    :raises ValueError: if the runs timed different positions: another seed, number of positions,
+                        board size or number of players
+    """
+    differences = ["%s %s != %s" % (setting, baseline.get(setting, default), current.get(setting, default))
+                   for setting, default in COMPARED_SETTINGS
+                   if baseline.get(setting, default) != current.get(setting, default)]
+    if differences:
+        raise ValueError("the baseline was run on other positions: " + ", ".join(differences))
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["us_per_call"]
+        after = result["us_per_call"]
+        change = after / before - 1
+        if change > threshold:
+            regressions.append((name, before, after, change))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks from the command line and returns the exit status: 1 if a benchmark regressed,
+    2 if the baseline was run on other positions and cannot be compared.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Quoridor rules engine hot paths.")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the benchmark positions")
+    parser.add_argument("--positions", type=int, default=500, help="number of benchmark positions")
+    parser.add_argument("--repeat", type=int, default=5, help="repeats of each benchmark; the fastest counts")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE, help="board size, such as 25 for stress tests")
+    parser.add_argument("--players", type=int, choices=(2, 4), default=2, help="number of players")
+    parser.add_argument("--output", help="file to save the results to as JSON")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown against the baseline that fails the run (default 0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.seed, args.positions, args.repeat, args.only, args.size, args.players)
+    for name, result in current["results"].items():
+        print("%-20s %8d calls %10.2f us/call" % (name, result["calls"], result["us_per_call"]))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        try:
+            regressions = compare(baseline, current, args.threshold)
+        except ValueError as error:
+            print("cannot compare: %s" % error, file=sys.stderr)
+            return 2
+        for name, before, after, change in regressions:
+            print("REGRESSION %s: %.2f -> %.2f us/call (%+.0f%%)" % (name, before, after, change * 100))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
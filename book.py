@@ -0,0 +1,447 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Opening book and pawn-race endgame tables for Quoridor, stored on disk and memory mapped
+
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+
+from quoridor import QuoridorGame, BOARD_SIZE, BOTTOM_EDGE, TOP_EDGE, pawn_moves, mask_squares
+from transposition import encode_move, decode_move
+
+SQUARES = BOARD_SIZE * BOARD_SIZE
+
+# Both files are open-addressing hash tables keyed by a 64-bit Zobrist hash, so a lookup reads one or a few
+# slots whatever the size of the file. Key 0 marks an empty slot.
+# Opening book: header (magic, slots, entries), then slots of (key, move, score, games); the score is
+# from -SCORE_SCALE (the move loses) to SCORE_SCALE (the move wins), for the player to move
+BOOK_MAGIC = b"QBK1"
+_BOOK_HEADER = struct.Struct("<4sII")
+_BOOK_SLOT = struct.Struct("<QHhI")
+# Endgame tables: header (magic, slots, tables), then index slots of (fence hash, byte offset of the table),
+# then the tables; each table is an int16 value for every (Player1 square, Player2 square, player to move)
+ENDGAME_MAGIC = b"QEG1"
+_ENDGAME_HEADER = struct.Struct("<4sII")
+_ENDGAME_SLOT = struct.Struct("<QQ")
+_TABLE_ENTRIES = SQUARES * SQUARES * 2
+_TABLE_BYTES = _TABLE_ENTRIES * 2
+SCORE_SCALE = 32767
+
+
+def _slot_count(entries):
+    """ Returns a power of two number of slots that keeps the table at most half full. """
+    slots = 1
+    while slots < 2 * entries:
+        slots *= 2
+    return slots
+
+
+def _find_slot(data, offset, slots, slot_struct, key):
+    """
+    Returns the fields of the slot holding the key in a memory-mapped hash table, or None.
+    """
+    mask = slots - 1
+    slot = key & mask
+    while True:
+        fields = slot_struct.unpack_from(data, offset + slot * slot_struct.size)
+        if fields[0] == key:
+            return fields
+        if fields[0] == 0:
+            return None
+        slot = (slot + 1) & mask
+
+
+def _hash_table(entries, slot_struct):
+    """
+    Returns the bytes of the slots of a hash table holding the entries, a dict of key to tuple of fields.
+    """
+    slots = _slot_count(len(entries))
+    data = bytearray(slots * slot_struct.size)
+    taken = bytearray(slots)
+    for key, fields in entries.items():
+        if key == 0:
+            continue  # reserved for empty slots
+        slot = key & (slots - 1)
+        while taken[slot]:
+            slot = (slot + 1) & (slots - 1)
+        taken[slot] = 1
+        slot_struct.pack_into(data, slot * slot_struct.size, key, *fields)
+    return slots, data
+
+
+def _replay(moves):
+    """
+    Yields the QuoridorGame before every move of a game, followed by the player and move.
+    The moves are (player, move) or (player, move, legal) tuples; moves recorded as rejected
+    and moves the game does not allow are skipped.
+    """
+    game = QuoridorGame()
+    for record in moves:
+        if len(record) > 2 and not record[2]:
+            continue
+        player, move = record[0], record[1]
+        move = (move[0], tuple(move[1]))
+        if not game.make_move(player, move):
+            continue
+        game.unmake_move()
+        yield game, player, move
+        game.make_move(player, move)
+
+
+def collect_opening_stats(games, plies=10):
+    """
+    Tallies the moves played in the first plies of games.
+    :param games: iterable of move lists, such as selfplay results' "moves" or records.read_games()
+    :param plies: moves from the start of each game to tally
+    :return: dict of position hash to dict of move to [games, wins for the player that moved]
+    """
+    stats = {}
+    for moves in games:
+        positions = []
+        game = None
+        for game, player, move in _replay(moves):
+            if len(positions) < plies and game.get_current_state() == 0:
+                positions.append((game.get_hash(), player, move))
+        winner = game.get_current_state() if game is not None else 0
+        for key, player, move in positions:
+            tally = stats.setdefault(key, {}).setdefault(move, [0, 0])
+            tally[0] += 1
+            if winner == player:
+                tally[1] += 1
+    return stats
+
+
+def opening_entries(stats, min_games=2):
+    """
+    Chooses the book move of every position from collect_opening_stats: the move with the best win rate
+    among the moves played in at least min_games games.
+    :return: dict of position hash to (encoded move, score, games), the score scaling the win rate from
+             -SCORE_SCALE (never won) to SCORE_SCALE (always won)
+    """
+    entries = {}
+    for key, moves in stats.items():
+        best = None
+        for move, (played, won) in moves.items():
+            if played < min_games:
+                continue
+            rate = won / played
+            if best is None or (rate, played) > best[0]:
+                best = ((rate, played), move)
+        if best is not None:
+            (rate, played), move = best
+            entries[key] = (encode_move(move), int(round((2 * rate - 1) * SCORE_SCALE)), played)
+    return entries
+
+
+def search_opening_entries(plies=2, time_limit=0.2, branching=3):
+    """
+    Builds book entries by searching the positions reached from the start in the first plies,
+    following the best branching moves of each position.
+    :return: dict of position hash to (encoded move, score, 1), the search score scaled from
+             -SCORE_SCALE (a lost position) to SCORE_SCALE (a won position)
+    """
+    from search import SearchEngine, WIN_SCORE
+    engine = SearchEngine(time_limit)
+    entries = {}
+    frontier = [[]]
+    for ply in range(plies):
+        next_frontier = []
+        for line in frontier:
+            game = QuoridorGame()
+            for player, move in line:
+                game.make_move(player, move)
+            if game.get_current_state() != 0 or game.get_hash() in entries:
+                continue
+            player = game.get_current_turn()
+            result = engine.search(game)
+            score = max(-WIN_SCORE, min(WIN_SCORE, result.get_score())) * SCORE_SCALE // WIN_SCORE
+            entries[game.get_hash()] = (encode_move(result.get_move()), score, 1)
+            for move in engine.order_moves(game, player, result.get_move())[:branching]:
+                if game.make_move(player, move):
+                    game.unmake_move()
+                    next_frontier.append(line + [(player, move)])
+        frontier = next_frontier
+    return entries
+
+
+def write_book(entries, path):
+    """
+    Writes opening book entries (position hash to (encoded move, score, games)) to a file.
+    """
+    slots, data = _hash_table(entries, _BOOK_SLOT)
+    with open(path, "wb") as file:
+        file.write(_BOOK_HEADER.pack(BOOK_MAGIC, slots, len(entries)))
+        file.write(data)
+
+
+class OpeningBook:
+    """
+    A class that looks up book moves in a memory-mapped opening book file.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes data members of the OpeningBook class by memory mapping the file.
+        """
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._slots, self._entries = _BOOK_HEADER.unpack_from(self._data, 0)
+        if magic != BOOK_MAGIC:
+            raise ValueError("not an opening book file")
+
+    def get_size(self):
+        """ Returns the number of positions in the book. """
+        return self._entries
+
+    def probe(self, key):
+        """
+        Looks up a position by its Zobrist hash.
+        :return: tuple (move, score, games) or None if the position is not in the book
+        """
+        fields = _find_slot(self._data, _BOOK_HEADER.size, self._slots, _BOOK_SLOT, key)
+        if fields is None:
+            return None
+        return decode_move(fields[1]), fields[2], fields[3]
+
+    def get_move(self, game):
+        """
+        Returns the book move of the game's position, as a make_move tuple, or None.
+        """
+        entry = self.probe(game.get_hash())
+        return entry[0] if entry is not None else None
+
+    def close(self):
+        """ Closes the memory map. """
+        self._data.close()
+
+
+def table_index(p1_square, p2_square, player):
+    """ Returns the index of a position in an endgame table. """
+    return (p1_square * SQUARES + p2_square) * 2 + player - 1
+
+
+def solve_race(h_fences, v_fences):
+    """
+    Solves every pawn race on a fence layout, with neither player able to place a fence, by retrograde analysis.
+    :param h_fences: bitmask of the cells with a horizontal fence
+    :param v_fences: bitmask of the cells with a vertical fence
+    :return: array of int16 indexed by table_index(): n > 0 if the player to move wins in n moves (counting
+             both players' moves), -n if the player to move loses in n moves, 0 if neither or the game is over
+    """
+    goals = (None, BOTTOM_EDGE, TOP_EDGE)
+    distance = array("h", [0]) * _TABLE_ENTRIES
+    wins = bytearray(_TABLE_ENTRIES)  # 1 if the player to move wins, 2 if they lose, 0 if not resolved
+    children_left = array("B", [0]) * _TABLE_ENTRIES
+    parents = [None] * _TABLE_ENTRIES
+    queue = []
+
+    for p1_square in range(SQUARES):
+        for p2_square in range(SQUARES):
+            if p1_square == p2_square:
+                continue
+            pawns = (1 << p1_square) | (1 << p2_square)
+            for player in (1, 2):
+                index = table_index(p1_square, p2_square, player)
+                squares = (None, p1_square, p2_square)
+                if (1 << squares[3 - player]) & goals[3 - player]:
+                    # The other player reached the goal baseline; the player to move has lost
+                    wins[index] = 2
+                    queue.append(index)
+                    continue
+                if (1 << squares[player]) & goals[player]:
+                    continue  # cannot happen in a game
+                moves = mask_squares(pawn_moves(squares[player], pawns, h_fences, v_fences))
+                children_left[index] = len(moves)
+                for square in moves:
+                    if player == 1:
+                        child = table_index(square, p2_square, 2)
+                    else:
+                        child = table_index(p1_square, square, 1)
+                    if parents[child] is None:
+                        parents[child] = []
+                    parents[child].append(index)
+
+    # Work backwards from the finished games, nearest first
+    for index in queue:
+        for parent in parents[index] or ():
+            if wins[parent]:
+                continue
+            if wins[index] == 2:
+                wins[parent] = 1  # a move that leaves the opponent lost wins
+                distance[parent] = distance[index] + 1
+                queue.append(parent)
+            else:
+                children_left[parent] -= 1
+                if children_left[parent] == 0:
+                    wins[parent] = 2  # every move leaves the opponent winning
+                    distance[parent] = distance[index] + 1
+                    queue.append(parent)
+
+    table = array("h", [0]) * _TABLE_ENTRIES
+    for index in range(_TABLE_ENTRIES):
+        if wins[index] == 1:
+            table[index] = distance[index]
+        elif wins[index] == 2 and distance[index] > 0:
+            table[index] = -distance[index]
+    return table
+
+
+def endgame_layouts(games):
+    """
+    Yields the QuoridorGame of every game at the move when both players have run out of fences.
+    :param games: iterable of move lists, such as selfplay results' "moves" or records.read_games()
+    """
+    for moves in games:
+        for game, player, move in _replay(moves):
+            if game.get_fences_left(1) == 0 and game.get_fences_left(2) == 0:
+                yield game
+                break
+
+
+def write_endgame_tables(games, path):
+    """
+    Solves the pawn race on the fence layout of every game and writes the tables to a file.
+    Games with the same fence layout share one table.
+    :param games: iterable of QuoridorGames, such as endgame_layouts()
+    :return: number of tables written
+    """
+    layouts = {}
+    for game in games:
+        layouts.setdefault(game.get_fence_hash(), (game.get_h_fences(), game.get_v_fences()))
+    slots = _slot_count(len(layouts))
+    first_table = _ENDGAME_HEADER.size + slots * _ENDGAME_SLOT.size
+    offsets = {}
+    for i, key in enumerate(layouts):
+        offsets[key] = (first_table + i * _TABLE_BYTES,)
+    slots, index = _hash_table(offsets, _ENDGAME_SLOT)
+    with open(path, "wb") as file:
+        file.write(_ENDGAME_HEADER.pack(ENDGAME_MAGIC, slots, len(layouts)))
+        file.write(index)
+        for key, (h_fences, v_fences) in layouts.items():
+            table = solve_race(h_fences, v_fences)
+            if sys.byteorder != "little":
+                table.byteswap()
+            file.write(table.tobytes())
+    return len(layouts)
+
+
+class EndgameTables:
+    """
+    A class that looks up exact pawn-race results in a memory-mapped endgame table file in constant time.
+    A game seldom ends with a fence layout seen in the recorded games; with solve_missing the races of
+    other layouts are solved when first probed (tens of milliseconds each) and the most recent ones are
+    kept in memory, otherwise probing them returns None.
+    """
+
+    def __init__(self, path=None, solve_missing=False, cache_size=16):
+        """
+        Initializes data members of the EndgameTables class by memory mapping the file.
+        :param path: endgame table file, or None for no file
+        :param solve_missing: if True, layouts not in the file are solved when probed instead of returning None
+        :param cache_size: number of solved layouts not in the file kept in memory
+        """
+        self._data = None
+        self._slots = 0
+        self._tables = 0
+        if path is not None:
+            with open(path, "rb") as file:
+                self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self._slots, self._tables = _ENDGAME_HEADER.unpack_from(self._data, 0)
+            if magic != ENDGAME_MAGIC:
+                raise ValueError("not an endgame table file")
+        self._value = struct.Struct("<h")
+        self._solve_missing = solve_missing
+        self._cache_size = cache_size
+        self._solved = {}  # fence hash to solve_race table, least recently used first
+
+    def get_size(self):
+        """ Returns the number of fence layouts in the file. """
+        return self._tables
+
+    def _solved_table(self, game):
+        """
+        Returns the table of the game's fence layout from the in-memory cache, solving it if needed.
+        """
+        key = game.get_fence_hash()
+        table = self._solved.pop(key, None)
+        if table is None:
+            table = solve_race(game.get_h_fences(), game.get_v_fences())
+            if len(self._solved) >= self._cache_size:
+                del self._solved[next(iter(self._solved))]
+        self._solved[key] = table  # most recently used last
+        return table
+
+    def probe(self, game):
+        """
+        Returns the exact result of the game's position when neither player has fences left: n > 0 if the
+        player to move wins in n moves, -n if they lose in n moves, 0 if neither, or None if a player has
+        fences left, the game is over or the fence layout is not in the file. With solve_missing, layouts
+        not in the file are solved and cached instead.
+        """
+        if game.get_board_size() != BOARD_SIZE or game.get_player_count() != 2:
+            return None  # the tables are for the standard game
+        if game.get_current_state() != 0 or game.get_fences_left(1) != 0 or game.get_fences_left(2) != 0:
+            return None
+        index = table_index(game.get_pawn_square(1), game.get_pawn_square(2), game.get_current_turn())
+        fields = None
+        if self._data is not None:
+            fields = _find_slot(self._data, _ENDGAME_HEADER.size, self._slots, _ENDGAME_SLOT,
+                                game.get_fence_hash())
+        if fields is None:
+            if not self._solve_missing:
+                return None
+            return self._solved_table(game)[index]
+        return self._value.unpack_from(self._data, fields[1] + index * 2)[0]
+
+    def close(self):
+        """ Closes the memory map. """
+        if self._data is not None:
+            self._data.close()
+
+
+def main(argv=None):
+    """
+    Builds an opening book or endgame tables from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Build Quoridor opening books and endgame tables.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    opening = commands.add_parser("opening", help="build an opening book from recorded games")
+    opening.add_argument("archives", nargs="+", help="game record archives")
+    opening.add_argument("--output", required=True)
+    opening.add_argument("--plies", type=int, default=10, help="moves from the start of each game to use")
+    opening.add_argument("--min-games", type=int, default=2, help="games a move needs to be chosen")
+    searched = commands.add_parser("search", help="build an opening book by searching the first moves")
+    searched.add_argument("--output", required=True)
+    searched.add_argument("--plies", type=int, default=2)
+    searched.add_argument("--time-limit", type=float, default=0.2, help="seconds of search per position")
+    searched.add_argument("--branching", type=int, default=3, help="moves followed from each position")
+    endgames = commands.add_parser("endgames", help="build endgame tables from the layouts of recorded games")
+    endgames.add_argument("archives", nargs="+", help="game record archives")
+    endgames.add_argument("--output", required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "search":
+        entries = search_opening_entries(args.plies, args.time_limit, args.branching)
+        write_book(entries, args.output)
+        print("%d positions" % len(entries))
+        return 0
+
+    from records import read_games
+
+    def archive_games():
+        for archive in args.archives:
+            yield from read_games(archive)
+
+    if args.command == "opening":
+        entries = opening_entries(collect_opening_stats(archive_games(), args.plies), args.min_games)
+        write_book(entries, args.output)
+        print("%d positions" % len(entries))
+    else:
+        print("%d tables" % write_endgame_tables(endgame_layouts(archive_games()), args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Command line entry point to play Quoridor, run self-play batches and benchmark the engine
+
+import argparse
+import functools
+import json
+import random
+import sys
+import time
+
+from quoridor import QuoridorGame, BOARD_SIZE
+
+# Self-play players by name; the callables are looked up in selfplay when a batch is run
+SELFPLAY_PLAYERS = ("random", "shortest", "search")
+
+
+def parse_move(text):
+    """
+    Returns the move tuple of a move typed as "p x y", "h x y" or "v x y", or None if it is not a move.
+    """
+    parts = text.replace(",", " ").split()
+    if len(parts) != 3 or parts[0] not in ("p", "h", "v"):
+        return None
+    try:
+        return parts[0], (int(parts[1]), int(parts[2]))
+    except ValueError:
+        return None
+
+
+def computer_move(game, time_limit):
+    """
+    Returns the computer's move for the player to move: the search engine's in a two-player game,
+    otherwise a step along a shortest path to the goal baseline.
+    """
+    if game.get_player_count() == 2:
+        from search import SearchEngine  # imported here so starting a game does not load it
+        return SearchEngine(time_limit).search(game).get_move()
+    from selfplay import shortest_path_player
+    return shortest_path_player(game, random.Random())
+
+
+def play(size=BOARD_SIZE, players=2, computer=(), time_limit=1.0, read=input, write=print):
+    """
+    Plays an interactive game. Each turn the board is shown and the player types a move as "p x y" to
+    move the pawn or "h x y" / "v x y" to place a fence; "moves" lists the legal pawn moves, "undo" takes
+    back the last move (and the computer's moves after it) and "quit" ends the game.
+    :param size: board size
+    :param players: 2 or 4
+    :param computer: numbers of the players moved by the computer
+    :param time_limit: seconds the computer searches for each move
+    :param read: callable that prompts for and returns a line of input
+    :param write: callable that shows a line of output
+    :return: the winner, or 0 if the game was left unfinished
+    """
+    game = QuoridorGame(size, players)
+    while game.get_current_state() == 0:
+        player = game.get_current_turn()
+        if player in computer:
+            move = computer_move(game, time_limit)
+            game.make_move(player, move)
+            write("Player%d plays %s %d %d" % (player, move[0], move[1][0], move[1][1]))
+            continue
+        game.print_board()
+        try:
+            text = read("Player%d (%d fences left)> " % (player, game.get_fences_left(player))).strip()
+        except EOFError:
+            return 0
+        if text == "quit":
+            return 0
+        if text == "moves":
+            write(" ".join("%d,%d" % coordinates for coordinates in game.valid_moves()))
+            continue
+        if text == "undo":
+            # Take back the computer's replies too, so it is a human player's turn again
+            while game.unmake_move() is not None and game.get_current_turn() in computer:
+                pass
+            continue
+        move = parse_move(text)
+        if move is None:
+            write('type "p x y", "h x y" or "v x y", "moves", "undo" or "quit"')
+        elif not game.make_move(player, move):
+            write("illegal move")
+    game.print_board()
+    write("Player%d wins" % game.get_current_state())
+    return game.get_current_state()
+
+
+def run_selfplay_batch(player1, player2, games, processes=None, seed=0, max_moves=400, time_limit=0.01,
+                       output=None, progress=None, depth=None):
+    """
+    Plays a self-play batch and returns its summary.
+    :param player1: name of Player1 in SELFPLAY_PLAYERS
+    :param player2: name of Player2 in SELFPLAY_PLAYERS
+    :param games: number of games to play
+    :param processes: number of worker processes; os.cpu_count() by default
+    :param seed: seed of the run
+    :param max_moves: moves after which a game is stopped as a draw
+    :param time_limit: seconds the search player searches for each move
+    :param output: path of a game record archive to write the games to
+    :param progress: callable taking (games done, games, games per second)
+    :param depth: if set, the search player searches to this depth with no time limit, for reproducible runs
+    :return: dict with the number of games, wins of each player, draws, mean length and games per second
+    """
+    import selfplay  # imported here so the other commands start without it
+    players = {
+        "random": selfplay.random_player,
+        "shortest": selfplay.shortest_path_player,
+        "search": functools.partial(selfplay.search_player, time_limit=time_limit, depth=depth),
+    }
+    wins = [0, 0, 0]
+    moves = 0
+    writer = None
+    file = None
+    if output:
+        from records import RecordWriter
+        file = open(output, "wb")
+        writer = RecordWriter(file)
+    start = time.perf_counter()
+    try:
+        for result in selfplay.run_selfplay(players[player1], players[player2], games, processes, seed,
+                                            max_moves=max_moves, keep_moves=writer is not None,
+                                            progress=progress):
+            wins[result["winner"]] += 1
+            moves += result["length"]
+            if writer is not None:
+                writer.write_game(result["moves"])
+    finally:
+        if file is not None:
+            file.close()
+    elapsed = time.perf_counter() - start
+    return {
+        "games": games,
+        "wins": {"player1": wins[1], "player2": wins[2], "draws": wins[0]},
+        "mean_length": moves / games if games else 0.0,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    """
+    Runs the play, selfplay or bench command and returns the exit status.
+    """
+    parser = argparse.ArgumentParser(description="Play Quoridor, run self-play batches and benchmark the engine.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    play_parser = commands.add_parser("play", help="play an interactive game")
+    play_parser.add_argument("--size", type=int, default=BOARD_SIZE, help="board size")
+    play_parser.add_argument("--players", type=int, choices=(2, 4), default=2, help="number of players")
+    play_parser.add_argument("--computer", type=int, nargs="+", default=[], help="players moved by the computer")
+    play_parser.add_argument("--time-limit", type=float, default=1.0, help="seconds the computer searches a move")
+    selfplay_parser = commands.add_parser("selfplay", help="play a batch of games between two players")
+    selfplay_parser.add_argument("--games", type=int, default=100, help="number of games")
+    selfplay_parser.add_argument("--player1", choices=SELFPLAY_PLAYERS, default="shortest", help="Player1")
+    selfplay_parser.add_argument("--player2", choices=SELFPLAY_PLAYERS, default="random", help="Player2")
+    selfplay_parser.add_argument("--processes", type=int, help="number of worker processes")
+    selfplay_parser.add_argument("--seed", type=int, default=0, help="seed of the run")
+    selfplay_parser.add_argument("--max-moves", type=int, default=400, help="moves after which a game is a draw")
+    selfplay_parser.add_argument("--time-limit", type=float, default=0.01, help="seconds the search player searches")
+    selfplay_parser.add_argument("--depth", type=int,
+                                 help="search to this depth instead of for --time-limit, for reproducible games")
+    selfplay_parser.add_argument("--output", help="game record archive to write the games to")
+    commands.add_parser("bench", add_help=False,
+                        help="benchmark engine throughput; takes the options of benchmark.py")
+    args, extra = parser.parse_known_args(argv)
+
+    if args.command == "bench":
+        import benchmark  # imported here so the other commands start without it
+        return benchmark.main(extra)
+    if extra:
+        parser.error("unrecognized arguments: %s" % " ".join(extra))
+
+    if args.command == "play":
+        play(args.size, args.players, set(args.computer), args.time_limit)
+        return 0
+
+    def report(done, games, rate):
+        print("%d/%d games, %.1f games/s" % (done, games, rate), file=sys.stderr)
+
+    summary = run_selfplay_batch(args.player1, args.player2, args.games, args.processes, args.seed,
+                                 args.max_moves, args.time_limit, args.output, report, args.depth)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Monte Carlo Tree Search player for Quoridor
+
+import math
+import random
+import time
+
+from quoridor import mask_squares
+from search import blocking_fences
+
+
+class Node:
+    """ A class that creates a node of the search tree: the position after a move. """
+    __slots__ = ("_move", "_player", "_key", "_parent", "_children", "_untried", "_visits", "_wins")
+
+    def __init__(self, move, player, key, parent=None):
+        self._move = move  # move that led to the position; None for the root
+        self._player = player  # player that made the move
+        self._key = key  # Zobrist hash of the position
+        self._parent = parent
+        self._children = []
+        self._untried = None  # moves not expanded yet; None until the node is first visited
+        self._visits = 0
+        self._wins = 0.0  # playouts won by the player that made the move
+
+    def get_move(self):
+        """ Returns the move that led to the node. """
+        return self._move
+
+    def get_visits(self):
+        """ Returns the number of playouts through the node. """
+        return self._visits
+
+    def get_win_rate(self):
+        """ Returns the share of playouts through the node won by the player that made the move. """
+        if self._visits == 0:
+            return 0.0
+        return self._wins / self._visits
+
+    def select_child(self, exploration):
+        """ Returns the child with the highest UCT score. """
+        log_visits = math.log(self._visits)
+        best = None
+        best_score = -1.0
+        for child in self._children:
+            score = child._wins / child._visits + exploration * math.sqrt(log_visits / child._visits)
+            if score > best_score:
+                best_score = score
+                best = child
+        return best
+
+
+class MCTSPlayer:
+    """
+    A class that chooses moves in a QuoridorGame with Monte Carlo Tree Search (UCT).
+    The tree is kept between moves, and playouts are played with fast moves biased towards shortest paths.
+    """
+
+    def __init__(self, time_limit=0.1, playouts=None, exploration=1.4, greedy=0.8, fence_rate=0.1,
+                 playout_depth=60, seed=None):
+        """
+        Initializes data members of the MCTSPlayer class.
+        :param time_limit: seconds allowed per move, used if playouts is None; at least one playout is played
+        :param playouts: number of playouts per move instead of a time limit; at least one is played
+        :param exploration: UCT exploration constant
+        :param greedy: chance that a playout pawn move follows the shortest path rather than a random move
+        :param fence_rate: chance that a playout move tries a random fence
+        :param playout_depth: moves played in a playout before it is scored by path length
+        :param seed: seed for the random number generator
+        """
+        self._time_limit = time_limit
+        self._playouts = playouts
+        self._exploration = exploration
+        self._greedy = greedy
+        self._fence_rate = fence_rate
+        self._playout_depth = playout_depth
+        self._random = random.Random(seed)
+        self._root = None
+        self._last_playouts = 0
+        self._last_elapsed = 0.0
+
+    def get_root(self):
+        """ Returns the root Node of the tree, the position of the last move chosen. """
+        return self._root
+
+    def get_playouts_per_second(self):
+        """ Returns the playout speed of the last call to choose_move. """
+        if self._last_elapsed <= 0:
+            return 0.0
+        return self._last_playouts / self._last_elapsed
+
+    def choose_move(self, game):
+        """
+        Runs playouts from the position and returns the most visited move for the player to move,
+        as a ("p" | "h" | "v", (x, y)) tuple for QuoridorGame.make_move. The game is left as it was given.
+        :param game: two-player QuoridorGame that has not been won
+        :return: move tuple
+        """
+        if game.get_player_count() != 2:
+            raise ValueError("the tree search plays two-player games")
+        start = time.perf_counter()
+        self._root = self._find_root(game)
+        deadline = start + self._time_limit
+        playouts = 0
+        while True:
+            self._playout(game)  # at least one playout, so the root has a move to choose from
+            playouts += 1
+            if self._playouts is not None:
+                if playouts >= self._playouts:
+                    break
+            elif time.perf_counter() > deadline:
+                break
+        self._last_playouts = playouts
+        self._last_elapsed = time.perf_counter() - start
+
+        if not self._root._children:
+            # No move could be expanded; step along a shortest path to the goal baseline
+            player = game.get_current_turn()
+            distances = game.get_distances(player)
+            square = min(mask_squares(game.pawn_move_mask(player)), key=distances.__getitem__)
+            self._root = None
+            return "p", game.get_geometry().square_coordinates[square]
+        best = max(self._root._children, key=Node.get_visits)
+        # Keep the subtree of the chosen move for the next call
+        best._parent = None
+        self._root = best
+        return best._move
+
+    def _find_root(self, game):
+        """
+        Returns the node of the game's position from the tree kept since the last move, or a new root.
+        """
+        key = game.get_hash()
+        if self._root is not None:
+            if self._root._key == key:
+                return self._root
+            # The opponent has moved since the last move was chosen
+            for child in self._root._children:
+                if child._key == key:
+                    child._parent = None
+                    return child
+        return Node(None, 3 - game.get_current_turn(), key)
+
+    def _tree_moves(self, game, player):
+        """
+        Returns the moves to expand for the player: every pawn move and the fences on the opponent's shortest paths.
+        """
+        coordinates = game.get_geometry().square_coordinates
+        moves = [("p", coordinates[square]) for square in mask_squares(game.pawn_move_mask(player))]
+        if game.get_fences_left(player) > 0:
+            moves.extend(set(blocking_fences(game, 3 - player)))
+        self._random.shuffle(moves)
+        return moves
+
+    def _playout(self, game):
+        """
+        Plays one playout: selects a path down the tree, expands one node, plays fast moves to the end
+        of the game (or playout_depth) and records the winner along the path.
+        """
+        undo_count = game.get_undo_count()
+        node = self._root
+
+        # 1. Selection: follow the best UCT child while the node is fully expanded
+        while node._untried is not None and not node._untried and node._children:
+            node = node.select_child(self._exploration)
+            game.make_move(node._player, node._move)
+
+        # 2. Expansion: add one untried move
+        if game.get_current_state() == 0:
+            player = game.get_current_turn()
+            if node._untried is None:
+                node._untried = self._tree_moves(game, player)
+            while node._untried:
+                move = node._untried.pop()
+                if game.make_move(player, move):  # skips illegal fences
+                    child = Node(move, player, game.get_hash(), node)
+                    node._children.append(child)
+                    node = child
+                    break
+
+        # 3. Playout and 4. backpropagation
+        winner = self._rollout(game)
+        while game.get_undo_count() > undo_count:
+            game.unmake_move()
+        while node is not None:
+            node._visits += 1
+            if node._player == winner:
+                node._wins += 1.0
+            node = node._parent
+
+    def _rollout(self, game):
+        """
+        Plays fast moves until the game is won or playout_depth moves have been played,
+        and returns the winner; an unfinished game goes to the player with the shorter path to play.
+        """
+        rand = self._random.random
+        size = game.get_board_size()
+        coordinates = game.get_geometry().square_coordinates
+        for i in range(self._playout_depth):
+            if game.get_current_state() != 0:
+                return game.get_current_state()
+            player = game.get_current_turn()
+
+            # Sometimes try a random fence; fall back to a pawn move if it is illegal
+            if rand() < self._fence_rate and game.get_fences_left(player) > 0:
+                move = (self._random.choice("hv"),
+                        (self._random.randrange(size), self._random.randrange(size)))
+                if game.make_move(player, move):
+                    continue
+
+            # Pawn move: usually the move that gets closest to the goal baseline
+            squares = mask_squares(game.pawn_move_mask(player))
+            if not squares:
+                break  # the pawn is boxed in by the other pawn
+            if rand() < self._greedy:
+                square = min(squares, key=game.get_distances(player).__getitem__)
+            else:
+                square = self._random.choice(squares)
+            game.make_move(player, ("p", coordinates[square]))
+
+        if game.get_current_state() != 0:
+            return game.get_current_state()
+        # The player to move is half a move ahead in a race to the goal baselines
+        player = game.get_current_turn()
+        if game.get_path_length(player) <= game.get_path_length(3 - player):
+            return player
+        return 3 - player
@@ -0,0 +1,170 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Opt-in instrumentation of the Quoridor rules engine hot paths, with dict and Prometheus export
+
+import bisect
+import functools
+import time
+
+from quoridor import QuoridorGame, add_debug_hook, remove_debug_hook
+
+# Methods of QuoridorGame instrumented by default: the ones play goes through. pawn_move_mask generates the
+# pawn moves (with the jumps of face-to-face pawns) and fence_masks and fence_cuts_path the fence moves;
+# fence_checker and pawn_interaction are list-based shims the engine no longer calls
+HOT_PATHS = ("valid_moves", "pawn_move_mask", "fence_masks", "fence_cuts_path", "move_pawn", "place_fence")
+# Upper bounds of the latency histogram buckets, in seconds; a last bucket counts everything slower
+BUCKETS = (1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4, 1e-3, 2e-3, 5e-3, 1e-2)
+
+
+class MethodStats:
+    """ A class that adds up the calls and sampled latencies of one method. """
+
+    __slots__ = ("calls", "sampled", "seconds", "buckets")
+
+    def __init__(self):
+        self.calls = 0  # every call
+        self.sampled = 0  # calls that were timed
+        self.seconds = 0.0  # total time of the timed calls
+        self.buckets = [0] * (len(BUCKETS) + 1)  # timed calls in each latency bucket, not cumulative
+
+    def record(self, elapsed):
+        """ Adds one timed call that took elapsed seconds. """
+        self.sampled += 1
+        self.seconds += elapsed
+        self.buckets[bisect.bisect_left(BUCKETS, elapsed)] += 1
+
+    def to_dict(self):
+        """ Returns the statistics as a JSON-ready dict. """
+        histogram = {}
+        for bound, count in zip(BUCKETS + (float("inf"),), self.buckets):
+            histogram[repr(bound) if bound != float("inf") else "+Inf"] = count
+        return {
+            "calls": self.calls,
+            "sampled": self.sampled,
+            "seconds": self.seconds,
+            "mean_us": self.seconds / self.sampled * 1e6 if self.sampled else 0.0,
+            "histogram": histogram,
+        }
+
+
+def _timed(function, stats, sample_every):
+    """
+    Returns a wrapper of the function that counts every call and times one call in sample_every.
+    """
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stats.calls += 1
+        if stats.calls % sample_every:
+            return function(*args, **kwargs)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.record(perf_counter() - start)
+
+    return wrapper
+
+
+class Instrumentation:
+    """
+    A class that instruments hot-path methods of QuoridorGame. Nothing is changed until enable() is called:
+    it replaces the methods on the class with timing wrappers, and disable() puts the original methods
+    back, so the engine runs at full speed whenever the instrumentation is off.
+    """
+
+    def __init__(self, methods=HOT_PATHS, sample_every=1):
+        """
+        Initializes data members of the Instrumentation class.
+        :param methods: names of the QuoridorGame methods to instrument
+        :param sample_every: time one call in this many; every call is still counted
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self._methods = tuple(methods)
+        self._sample_every = sample_every
+        self._stats = {name: MethodStats() for name in self._methods}
+        self._originals = {}
+        self._events = {}  # number of each debug event
+        self._event_hooks = []
+
+    def is_enabled(self):
+        """ Returns True if the methods are instrumented. """
+        return bool(self._originals)
+
+    def enable(self):
+        """
+        Instruments the methods of QuoridorGame and starts counting debug events.
+        """
+        if self._originals:
+            return
+        for name in self._methods:
+            original = QuoridorGame.__dict__[name]
+            if hasattr(original, "__wrapped__"):
+                raise RuntimeError("QuoridorGame.%s is already instrumented" % name)
+            self._originals[name] = original
+            setattr(QuoridorGame, name, _timed(original, self._stats[name], self._sample_every))
+        add_debug_hook(self._count_event)
+
+    def disable(self):
+        """
+        Puts the original methods of QuoridorGame back and stops counting debug events.
+        """
+        for name, original in self._originals.items():
+            setattr(QuoridorGame, name, original)
+        if self._originals:
+            remove_debug_hook(self._count_event)
+        self._originals = {}
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def reset(self):
+        """ Clears the statistics. """
+        for stats in self._stats.values():
+            stats.__init__()
+        self._events = {}
+
+    def _count_event(self, event, details):
+        """ Debug hook that counts the engine's debug events. """
+        self._events[event] = self._events.get(event, 0) + 1
+
+    def snapshot(self):
+        """
+        Returns the statistics as a JSON-ready dict: for every method the number of calls, the number of timed
+        calls, their total and mean time and the latency histogram, and the number of each debug event.
+        """
+        return {
+            "sample_every": self._sample_every,
+            "methods": {name: stats.to_dict() for name, stats in self._stats.items()},
+            "events": dict(self._events),
+        }
+
+    def to_prometheus(self, prefix="quoridor"):
+        """
+        Returns the statistics in the Prometheus text exposition format.
+        """
+        lines = ["# HELP %s_calls_total Calls of QuoridorGame methods." % prefix,
+                 "# TYPE %s_calls_total counter" % prefix]
+        for name, stats in self._stats.items():
+            lines.append('%s_calls_total{method="%s"} %d' % (prefix, name, stats.calls))
+        lines.append("# HELP %s_call_seconds Latency of the sampled calls of QuoridorGame methods." % prefix)
+        lines.append("# TYPE %s_call_seconds histogram" % prefix)
+        for name, stats in self._stats.items():
+            cumulative = 0
+            for bound, count in zip(BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append('%s_call_seconds_bucket{method="%s",le="%r"} %d' % (prefix, name, bound, cumulative))
+            lines.append('%s_call_seconds_bucket{method="%s",le="+Inf"} %d' % (prefix, name, stats.sampled))
+            lines.append('%s_call_seconds_sum{method="%s"} %r' % (prefix, name, stats.seconds))
+            lines.append('%s_call_seconds_count{method="%s"} %d' % (prefix, name, stats.sampled))
+        lines.append("# HELP %s_debug_events_total Debug events of the rules engine." % prefix)
+        lines.append("# TYPE %s_debug_events_total counter" % prefix)
+        for event, count in sorted(self._events.items()):
+            lines.append('%s_debug_events_total{event="%s"} %d' % (prefix, event, count))
+        return "\n".join(lines) + "\n"
@@ -2,8 +2,279 @@
 # Date: 7/31/2021
 # Description: Class for playing a board game called Quoridor
 
+import heapq
+import random
+import sys
+from array import array
+
+# Bitboard layout: every square of the board is one bit of a Python integer.
+# The Cell at column x, row y is bit (y * size + x), so on the standard 9x9 board
+# bit 0 is (0, 0) and bit 80 is (8, 8).
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3  # directions
+MAX_PLAYERS = 4
+
+# Distance used in the distance maps for squares that cannot reach the goal baseline
+UNREACHABLE = 0xFFFF
+
+# Player who moves after each player, by number of players. Player1 starts at the top, Player2 at the
+# bottom, Player3 on the left and Player4 on the right, so four players take turns clockwise: 1, 4, 2, 3.
+NEXT_PLAYERS = {2: (None, 2, 1), 4: (None, 4, 3, 1, 2)}
+
+
+class BoardGeometry:
+    """
+    A class that holds the tables of one board size: edge bitmasks, move generation tables,
+    start squares and goal baselines of every player, and Zobrist keys. The tables are precomputed
+    for every square so moves are found without building lists. Use get_geometry() to share them.
+    """
+
+    def __init__(self, size):
+        """
+        Initializes data members of the BoardGeometry class by building the tables for a size x size board.
+        """
+        if size < 3:
+            raise ValueError("board size must be at least 3")
+        self.size = size
+        self.squares = size * size
+        self.board_mask = (1 << self.squares) - 1  # all squares
+        self.top_edge = (1 << size) - 1  # row 0; Player1's baseline
+        self.bottom_edge = self.top_edge << (size * (size - 1))  # last row; Player2's baseline
+        self.left_edge = sum(1 << (row * size) for row in range(size))  # column 0; Player3's baseline
+        self.right_edge = self.left_edge << (size - 1)  # last column; Player4's baseline
+
+        # Start square and goal baseline of each player, indexed by player number:
+        # Player1 starts on the top edge and Player2 on the bottom edge (and Player3 on the left edge
+        # and Player4 on the right edge in a 4-player game), each in the middle, racing to the opposite edge
+        middle = size // 2
+        self.start_squares = (None, middle, (size - 1) * size + middle, middle * size, middle * size + size - 1)
+        self.baselines = (None, self.top_edge, self.bottom_edge, self.left_edge, self.right_edge)
+        self.goal_masks = (None, self.bottom_edge, self.top_edge, self.right_edge, self.left_edge)
+
+        self.square_coordinates = tuple((square % size, square // size) for square in range(self.squares))
+        # steps[square] holds one (direction, neighbor square, neighbor bit, horizontal, fence bit) entry for every
+        # direction that stays on the board; the step is cut off if the fence bit is set in the h fences
+        # (horizontal is True) or v fences
+        steps = []
+        # adjacent_coordinates[square] holds the coordinates of the adjacent squares, in pos_adjacent_moves order
+        adjacent = []
+        for square in range(self.squares):
+            x, y = self.square_coordinates[square]
+            square_steps = []
+            if y > 0:  # upward; cut off by an h fence on the current cell
+                square_steps.append((UP, square - size, 1 << (square - size), True, 1 << square))
+            if y < size - 1:  # downward; cut off by an h fence on the cell downwards
+                square_steps.append((DOWN, square + size, 1 << (square + size), True, 1 << (square + size)))
+            if x > 0:  # leftward; cut off by a v fence on the current cell
+                square_steps.append((LEFT, square - 1, 1 << (square - 1), False, 1 << square))
+            if x < size - 1:  # rightward; cut off by a v fence on the cell to the right
+                square_steps.append((RIGHT, square + 1, 1 << (square + 1), False, 1 << (square + 1)))
+            steps.append(tuple(square_steps))
+            adjacent.append(tuple(self.square_coordinates[step[1]]
+                                  for direction in (LEFT, RIGHT, UP, DOWN)
+                                  for step in square_steps if step[0] == direction))
+        self.steps = tuple(steps)
+        self.adjacent_coordinates = tuple(adjacent)
+        # jumps[square][direction] holds the moves of a pawn hopping in the direction over a pawn on the square:
+        # the steps entry of the hop (None off the board) and the steps entries of the two diagonal moves
+        jumps = []
+        for square in range(self.squares):
+            by_direction = {step[0]: step for step in self.steps[square]}
+            square_jumps = []
+            for direction in (UP, DOWN, LEFT, RIGHT):
+                sides = (LEFT, RIGHT) if direction in (UP, DOWN) else (UP, DOWN)
+                square_jumps.append((by_direction.get(direction),
+                                     tuple(by_direction[side] for side in sides if side in by_direction)))
+            jumps.append(tuple(square_jumps))
+        self.jumps = tuple(jumps)
+
+        # Zobrist keys: random 64-bit numbers xor-ed together into the hash of a position.
+        # The generator is seeded so every process computes the same hash for the same position;
+        # the keys of the standard two-player game come first so its hashes do not depend on the extensions
+        rng = random.Random(0x51D0 + (size - 9) * 0x10000)
+        self.max_fences = max(10, self.squares)  # most fences a player can be given
+        self.zobrist_pawns = [None] + [[rng.getrandbits(64) for square in range(self.squares)]
+                                       for player in (1, 2)]  # indexed by player number, then square
+        self.zobrist_h_fences = [rng.getrandbits(64) for square in range(self.squares)]
+        self.zobrist_v_fences = [rng.getrandbits(64) for square in range(self.squares)]
+        self.zobrist_fences_left = [None] + [[rng.getrandbits(64) for count in range(11)]
+                                             for player in (1, 2)]  # indexed by player number, then fences left
+        self.zobrist_turns = [None, 0, rng.getrandbits(64)]  # xor-ed in for the player to move
+        for player in range(3, MAX_PLAYERS + 1):
+            self.zobrist_pawns.append([rng.getrandbits(64) for square in range(self.squares)])
+            self.zobrist_fences_left.append([rng.getrandbits(64) for count in range(11)])
+            self.zobrist_turns.append(rng.getrandbits(64))
+        for player in range(1, MAX_PLAYERS + 1):
+            self.zobrist_fences_left[player].extend(rng.getrandbits(64) for count in range(11, self.max_fences + 1))
+
+    def __copy__(self):
+        return self  # the tables never change, so copies of a game share them
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return get_geometry, (self.size,)
+
+    def square_index(self, coordinates):
+        """ Returns the bit index of the square at the x, y coordinates. """
+        return coordinates[1] * self.size + coordinates[0]
+
+    def square_coordinates_of(self, square):
+        """ Returns the x, y coordinates of the square at the given bit index. """
+        return self.square_coordinates[square]
+
+    def flood_fill(self, region, h_fences, v_fences, target=0):
+        """
+        Grows the region bitmask one step at a time through the edges that are not cut off by a fence.
+        Returns the grown region once it stops growing or touches the target bitmask.
+        Each step costs a few shifts of board-sized integers, so a fill costs about
+        (squares / 64) word operations times the number of steps to the target.
+        """
+        size = self.size
+        not_up = ~self.top_edge
+        not_left = ~self.left_edge
+        not_right = ~self.right_edge
+        board_mask = self.board_mask
+        while True:
+            grown = region
+            grown |= (region & not_up & ~h_fences) >> size  # upward
+            grown |= (region << size) & ~h_fences & board_mask  # downward
+            grown |= (region & not_left & ~v_fences) >> 1  # leftward
+            grown |= ((region & not_right) << 1) & ~v_fences  # rightward
+            if grown == region or grown & target:
+                return grown
+            region = grown
+
+    def jump_mask(self, opponent_square, direction, pawns, h_fences, v_fences):
+        """
+        Returns a bitmask of the hop in the direction over the pawn on opponent_square,
+        or of the diagonal moves around it if the hop is blocked by a fence, a pawn or the edge of the board.
+        """
+        hop, sides = self.jumps[opponent_square][direction]
+        if hop is not None and not hop[4] & (h_fences if hop[3] else v_fences) and not hop[2] & pawns:
+            return hop[2]
+        moves = 0
+        for side_direction, neighbor, neighbor_bit, horizontal, fence_bit in sides:
+            if not fence_bit & (h_fences if horizontal else v_fences) and not neighbor_bit & pawns:
+                moves |= neighbor_bit
+        return moves
+
+    def pawn_moves(self, square, pawns, h_fences, v_fences):
+        """
+        Returns a bitmask of the squares a pawn on the square can move to.
+        :param square: bit index of the pawn
+        :param pawns: bitmask of the squares with a pawn, including the moving pawn
+        :param h_fences: bitmask of the cells with a horizontal fence
+        :param v_fences: bitmask of the cells with a vertical fence
+        """
+        moves = 0
+        for direction, neighbor, neighbor_bit, horizontal, fence_bit in self.steps[square]:
+            if fence_bit & (h_fences if horizontal else v_fences):
+                continue  # cut off by a fence
+            if neighbor_bit & pawns:
+                # Pawn-to-Pawn interaction: the hop or diagonal moves replace the other pawn's square
+                jumps = self.jump_mask(neighbor, direction, pawns, h_fences, v_fences)
+                moves |= jumps
+                if _debug_hooks:
+                    coordinates = self.square_coordinates
+                    details = {"player_pawn": coordinates[square], "opponent_pawn": coordinates[neighbor],
+                               "jumps": [coordinates[jump] for jump in mask_squares(jumps)]}
+                    for hook in _debug_hooks:
+                        hook("face_to_face", details)
+            else:
+                moves |= neighbor_bit
+        return moves
+
+    def goal_distances(self, goal, h_fences, v_fences):
+        """
+        Returns an array of the shortest distance from every square to the goal bitmask, or UNREACHABLE.
+        A breadth-first search, linear in the number of squares.
+        """
+        distances = array("H", [UNREACHABLE]) * self.squares
+        queue = mask_squares(goal)
+        for square in queue:
+            distances[square] = 0
+        steps = self.steps
+        for square in queue:
+            distance = distances[square] + 1
+            for direction, neighbor, neighbor_bit, horizontal, fence_bit in steps[square]:
+                if distance < distances[neighbor] and not fence_bit & (h_fences if horizontal else v_fences):
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+        return distances
+
+
+_geometries = {}
+
+
+def get_geometry(size):
+    """
+    Returns the BoardGeometry of a size x size board, building it the first time it is asked for.
+    """
+    geometry = _geometries.get(size)
+    if geometry is None:
+        geometry = _geometries[size] = BoardGeometry(size)
+    return geometry
+
+
+# The standard 9x9 board. The module-level names below are its tables, kept for the code written
+# for the standard board (records, transposition tables, the batched environment)
+STANDARD_GEOMETRY = get_geometry(9)
+BOARD_SIZE = STANDARD_GEOMETRY.size
+BOARD_MASK = STANDARD_GEOMETRY.board_mask  # all 81 squares
+TOP_EDGE = STANDARD_GEOMETRY.top_edge  # row 0; Player1's baseline
+BOTTOM_EDGE = STANDARD_GEOMETRY.bottom_edge  # row 8; Player2's baseline
+LEFT_EDGE = STANDARD_GEOMETRY.left_edge  # column 0
+RIGHT_EDGE = STANDARD_GEOMETRY.right_edge  # column 8
+SQUARE_COORDINATES = STANDARD_GEOMETRY.square_coordinates
+STEPS = STANDARD_GEOMETRY.steps
+ADJACENT_COORDINATES = STANDARD_GEOMETRY.adjacent_coordinates
+JUMPS = STANDARD_GEOMETRY.jumps
+ZOBRIST_PAWNS = STANDARD_GEOMETRY.zobrist_pawns
+ZOBRIST_H_FENCES = STANDARD_GEOMETRY.zobrist_h_fences
+ZOBRIST_V_FENCES = STANDARD_GEOMETRY.zobrist_v_fences
+ZOBRIST_FENCES_LEFT = STANDARD_GEOMETRY.zobrist_fences_left
+ZOBRIST_PLAYER2_TURN = STANDARD_GEOMETRY.zobrist_turns[2]  # xor-ed in when it's Player2's turn
+square_index = STANDARD_GEOMETRY.square_index
+square_coordinates = STANDARD_GEOMETRY.square_coordinates_of
+flood_fill = STANDARD_GEOMETRY.flood_fill
+jump_mask = STANDARD_GEOMETRY.jump_mask
+pawn_moves = STANDARD_GEOMETRY.pawn_moves
+goal_distances = STANDARD_GEOMETRY.goal_distances
+
+# Callables taking (event, details dict), called on debug events of the rules engine;
+# while the list is empty the engine only pays for checking it
+_debug_hooks = []
+
+
+def add_debug_hook(hook):
+    """
+    Registers a callable taking (event, details) to be called on the engine's debug events:
+    "face_to_face" when the pawn moves are generated for a pawn next to another pawn (BoardGeometry.pawn_moves),
+    with the coordinates of the player pawn, the opponent pawn and the jump moves.
+    """
+    _debug_hooks.append(hook)
+
+
+def remove_debug_hook(hook):
+    """ Unregisters a debug hook added with add_debug_hook. """
+    _debug_hooks.remove(hook)
+
+
+def mask_squares(mask):
+    """ Returns a list of the bit indices set in a bitmask, lowest first. """
+    squares = []
+    while mask:
+        low_bit = mask & -mask  # isolate the lowest set bit
+        squares.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return squares
+
+
 class Cell:
     """ A class that creates a Cell in a Quoridor board game. """
+    __slots__ = ("_x", "_y", "_pawn", "_v_fence", "_h_fence", "_baseline_cell", "_painted_cell")
+
     def __init__(self, x, y):
         """ Initializes data members of the Cell class. """
         self._x = x  # column number
@@ -57,9 +328,15 @@ class Cell:
         """ Places a horizontal fence in the cell. """
         self._h_fence = 1
 
+    def set_painted_cell(self):
+        """ Paints the cell as an allowed move. """
+        self._painted_cell = 1
+
 
 class Pawn:
     """ A class that creates a Pawn in a Quoridor board game."""
+    __slots__ = ("_x", "_y", "_player")
+
     def __init__(self, x, y, player):
         self._x = x   # current column number location of the pawn
         self._y = y   # current row number location of the pawn
@@ -76,7 +353,9 @@ class Pawn:
 
 
 class Fence:
-    """ A class that creates a Pawn in a Quoridor board game."""
+    """ A class that creates a Fence in a Quoridor board game."""
+    __slots__ = ("_x", "_y", "_player")
+
     def __init__(self, player, x=None, y=None):
         self._x = x  # current column number location of the fence; value is None at the beginning of game
         self._y = y  # current row number location of the fence; value is None at the beginning of game
@@ -92,238 +371,712 @@ class Fence:
         self._y = coordinates[1]
 
 
+class GameState:
+    """
+    A class that holds an immutable Quoridor position: the pawn squares, the fence bitmasks,
+    the fences left and the player to move. apply_move() returns a new GameState that shares
+    every unchanged part with this one. A GameState hashes to the position's Zobrist hash,
+    the same as QuoridorGame.get_hash(), so it can be used as a dict key and shared between threads.
+    """
+    __slots__ = ("_pawn_squares", "_h_fences", "_v_fences", "_fences_left", "_turn", "_hash", "_geometry")
+
+    def __init__(self, pawn_squares=None, h_fences=0, v_fences=0, fences_left=(None, 10, 10), turn=1,
+                 position_hash=None, geometry=STANDARD_GEOMETRY):
+        """
+        Initializes data members of the GameState class; the default is the starting position of the standard game.
+        :param pawn_squares: tuple (None, Player1 square, Player2 square, ...) with one square per player
+        :param h_fences: bitmask of the cells with a horizontal fence
+        :param v_fences: bitmask of the cells with a vertical fence
+        :param fences_left: tuple (None, Player1 fences left, Player2 fences left, ...)
+        :param turn: number of the player to move
+        :param position_hash: Zobrist hash of the position, computed if None
+        :param geometry: BoardGeometry of the board size
+        """
+        if pawn_squares is None:
+            pawn_squares = geometry.start_squares[:len(fences_left)]
+        self._pawn_squares = pawn_squares
+        self._h_fences = h_fences
+        self._v_fences = v_fences
+        self._fences_left = fences_left
+        self._turn = turn
+        self._geometry = geometry
+        if position_hash is None:
+            position_hash = geometry.zobrist_turns[turn]
+            for player in range(1, len(pawn_squares)):
+                position_hash ^= (geometry.zobrist_pawns[player][pawn_squares[player]] ^
+                                  geometry.zobrist_fences_left[player][fences_left[player]])
+            for square in mask_squares(h_fences):
+                position_hash ^= geometry.zobrist_h_fences[square]
+            for square in mask_squares(v_fences):
+                position_hash ^= geometry.zobrist_v_fences[square]
+        self._hash = position_hash
+
+    @classmethod
+    def from_game(cls, game):
+        """ Returns the GameState of a QuoridorGame's position. """
+        return game.get_game_state()
+
+    def to_game(self):
+        """ Returns a new QuoridorGame set to this position. """
+        return QuoridorGame.from_game_state(self)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return (self._hash == other._hash and self._pawn_squares == other._pawn_squares and
+                self._h_fences == other._h_fences and self._v_fences == other._v_fences and
+                self._fences_left == other._fences_left and self._turn == other._turn and
+                self._geometry is other._geometry)
+
+    def __repr__(self):
+        return "GameState(%r, %#x, %#x, %r, %r, size=%d)" % (self._pawn_squares, self._h_fences, self._v_fences,
+                                                              self._fences_left, self._turn, self._geometry.size)
+
+    def get_hash(self):
+        """ Returns the Zobrist hash of the position. """
+        return self._hash
+
+    def get_geometry(self):
+        """ Returns the BoardGeometry of the board. """
+        return self._geometry
+
+    def get_player_count(self):
+        """ Returns the number of players. """
+        return len(self._pawn_squares) - 1
+
+    def get_pawn_square(self, player):
+        """ Returns the square index of the player's pawn. """
+        return self._pawn_squares[player]
+
+    def get_h_fences(self):
+        """ Returns the bitmask of the cells with a horizontal fence. """
+        return self._h_fences
+
+    def get_v_fences(self):
+        """ Returns the bitmask of the cells with a vertical fence. """
+        return self._v_fences
+
+    def get_fences(self):
+        """ Returns the list of (fence_type, (x, y)) fences on the board. """
+        coordinates = self._geometry.square_coordinates
+        return ([("h", coordinates[square]) for square in mask_squares(self._h_fences)] +
+                [("v", coordinates[square]) for square in mask_squares(self._v_fences)])
+
+    def get_fences_left(self, player):
+        """ Returns the number of fences the player has left. """
+        return self._fences_left[player]
+
+    def get_current_turn(self):
+        """ Returns the number of the player to move. """
+        return self._turn
+
+    def get_current_state(self):
+        """ Returns 0 if the game is unfinished, or the number of the player that has won. """
+        goal_masks = self._geometry.goal_masks
+        for player in range(1, len(self._pawn_squares)):
+            if (1 << self._pawn_squares[player]) & goal_masks[player]:
+                return player
+        return 0
+
+    def pawn_move_mask(self):
+        """ Returns a bitmask of the squares the pawn of the player to move can move to. """
+        pawns = 0
+        for square in self._pawn_squares[1:]:
+            pawns |= 1 << square
+        return self._geometry.pawn_moves(self._pawn_squares[self._turn], pawns, self._h_fences, self._v_fences)
+
+    def apply_move(self, move):
+        """
+        Makes a move for the player to move, following the rules of QuoridorGame.make_move.
+        :param move: ("p" | "h" | "v", (x, y)) tuple
+        :return: the GameState after the move, or None if the move is not valid
+        """
+        move_type, coordinates = move
+        if self.get_current_state() != 0:
+            return None
+        geometry = self._geometry
+        if not (0 <= coordinates[0] < geometry.size and 0 <= coordinates[1] < geometry.size):
+            return None
+        player = self._turn
+        next_player = NEXT_PLAYERS[len(self._pawn_squares) - 1][player]
+        square = geometry.square_index(coordinates)
+        turn_keys = geometry.zobrist_turns[player] ^ geometry.zobrist_turns[next_player]
+
+        if move_type == "p":
+            if not self.pawn_move_mask() >> square & 1:
+                return None
+            zobrist = geometry.zobrist_pawns[player]
+            position_hash = self._hash ^ zobrist[self._pawn_squares[player]] ^ zobrist[square]
+            pawn_squares = self._pawn_squares[:player] + (square,) + self._pawn_squares[player + 1:]
+            turn = player
+            if not (1 << square) & geometry.goal_masks[player]:
+                turn = next_player  # the player to move only changes if the move did not win
+                position_hash ^= turn_keys
+            return GameState(pawn_squares, self._h_fences, self._v_fences, self._fences_left, turn, position_hash,
+                             geometry)
+
+        left = self._fences_left[player]
+        if left == 0:
+            return None
+        bit = 1 << square
+        h_fences, v_fences = self._h_fences, self._v_fences
+        if move_type == "h":
+            if bit & (geometry.top_edge | h_fences):
+                return None
+            h_fences |= bit
+            position_hash = self._hash ^ geometry.zobrist_h_fences[square]
+        elif move_type == "v":
+            if bit & (geometry.left_edge | v_fences):
+                return None
+            v_fences |= bit
+            position_hash = self._hash ^ geometry.zobrist_v_fences[square]
+        else:
+            return None
+        # Cannot place a fence that leaves any pawn without a path to its goal baseline
+        for pawn_player in range(1, len(self._pawn_squares)):
+            goal = geometry.goal_masks[pawn_player]
+            if not geometry.flood_fill(1 << self._pawn_squares[pawn_player], h_fences, v_fences, goal) & goal:
+                return None
+        zobrist = geometry.zobrist_fences_left[player]
+        position_hash ^= zobrist[left] ^ zobrist[left - 1] ^ turn_keys
+        fences_left = self._fences_left[:player] + (left - 1,) + self._fences_left[player + 1:]
+        return GameState(self._pawn_squares, h_fences, v_fences, fences_left, next_player, position_hash, geometry)
+
+
 class QuoridorGame:
     """ A class that creates a Quoridor board game. """
 
-    def __init__(self):
+    def __init__(self, size=BOARD_SIZE, players=2, fences=None):
         """
         Initializes data members of the QuoridorGame class.
+        :param size: number of rows and columns of the board; 9 for the standard game
+        :param players: 2, or 4 for the 4-player game
+        :param fences: fences given to each player; 10 in a 2-player game and 5 in a 4-player game by default
         """
-        # Create a 2d array with 9 rows and 9 columns to create the Quoridor board
-        rows, columns = (9, 9)
-        self._board = []
-        for i in range(rows):  # iterates from 0 to 9 since there are 9 columns
-            column = []  # create an empty array to be nested in the other array
-            for j in range(columns):  # iterates from 0 to 9 since there are 9 rows
-                column.append(Cell(j, i))  # creates a Cell object with the coordinates j, i
-            self._board.append(column)  # once iteration is finished over a row, adds the row array to the main array
-
-        # Initiate 10 fences for Player1 and Player2
-        self._p1_fences = []
-        for i in range(1, 11):
-            self._p1_fences.append(Fence(1))  # Create a Fence object for Player 1
-        self._p2_fences = []
-        for i in range(1, 11):
-            self._p2_fences.append(Fence(2))  # Create a Fence object for Player 2
-
-        # Initiate pawns for Player1 and Player 2 in the correct starting position
-        self._p1 = Pawn(4, 0, 1)  # Creates a Pawn object for Player1 at location 4, 0
-        self._p2 = Pawn(4, 8, 2)  # Creates a Pawn object for Player2 at location 4, 8
-        self._board[0][4].set_pawn(1), self._board[8][4].set_pawn(2)  # Sets the Cell pawn status to 1
-
-        # Initiate baseline cells from 0 to 1
-        self._p1_baseline = []  # P1's baseline cells; P2 must reach this baseline in order to win
-        self._p2_baseline = []  # P2's baseline cells; P1 must reach this baseline in order to win
-        for i in range(9):
-            self._p1_baseline.append(self._board[0][i].get_coordinates())
-            self._p2_baseline.append(self._board[8][i].get_coordinates())
-            self._board[0][i].set_baseline_cell(1), self._board[8][i].set_baseline_cell(2)
+        if players not in (2, 4):
+            raise ValueError("a game has 2 or 4 players")
+        geometry = get_geometry(size)
+        if fences is None:
+            fences = 10 if players == 2 else 5
+        if not 0 <= fences <= geometry.max_fences:
+            raise ValueError("fences must be between 0 and %d" % geometry.max_fences)
+        self._geometry = geometry
+        self._players = players
+
+        # The board is stored as bitboards instead of a 2d array of Cell objects;
+        # get_board() builds the Cell view of the board from these on demand
+        self._h_fences = 0  # bit set if the cell has a horizontal fence (on its top edge)
+        self._v_fences = 0  # bit set if the cell has a vertical fence (on its left edge)
+
+        # Initiate the fences of every player; each list is the player's fence tab, indexed by player number
+        self._fence_tabs = [None]
+        for player in range(1, players + 1):
+            self._fence_tabs.append([Fence(player) for i in range(fences)])
+
+        # Initiate pawns for every player in the correct starting position, the middle of the player's baseline
+        # Square index of each player's pawn; index 0 is unused so the list can be indexed by player number
+        self._pawn_squares = list(geometry.start_squares[:players + 1])
+        self._pawn_pieces = [None]
+        self._pawns = 0
+        for player in range(1, players + 1):
+            x, y = geometry.square_coordinates[self._pawn_squares[player]]
+            self._pawn_pieces.append(Pawn(x, y, player))
+            self._pawns |= 1 << self._pawn_squares[player]
+
+        # Initiate baseline cells: the cells of each player's starting edge, indexed by player number;
+        # the player across the board must reach this baseline in order to win
+        self._baselines = [None]
+        for player in range(1, players + 1):
+            self._baselines.append([geometry.square_coordinates[square]
+                                    for square in mask_squares(geometry.baselines[player])])
+        # Bitmask of the baseline each player must reach in order to win, indexed by player number
+        self._goal_masks = list(geometry.goal_masks[:players + 1])
+
+        # Shortest distance from every square to each player's goal baseline, ignoring pawns,
+        # indexed by player number; kept up to date as fences are added and removed
+        self._distances = [None]
+        for player in range(1, players + 1):
+            self._distances.append(geometry.goal_distances(self._goal_masks[player], 0, 0))
 
         # Set player turn and current game state
         self._current_turn = 1
-        self._current_state = 0  # 0 means unfinished, 1 or 2 means Player1 or Player2 has won respectively
+        self._current_state = 0  # 0 means unfinished, otherwise the number of the player that has won
+
+        # Zobrist hash of the position, updated by every move
+        self._hash = 0
+        for player in range(1, players + 1):
+            self._hash ^= (geometry.zobrist_pawns[player][self._pawn_squares[player]] ^
+                           geometry.zobrist_fences_left[player][fences])
+
+        # Moves made with make_move() and what is needed to take them back with unmake_move()
+        self._undo_stack = []
+
+        # Legal moves of the current position, computed on first use and cleared by every change of position:
+        # the pawn move bitmask of each player (indexed by player number) and the fence_masks() tuple
+        self._pawn_move_cache = [None] * (players + 1)
+        self._fence_cache = None
+        self._fence_list_cache = None  # valid_fences() list
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def get_board_size(self):
+        """
+        Returns the number of rows and columns of the board.
+        """
+        return self._geometry.size
+
+    def get_player_count(self):
+        """
+        Returns the number of players.
+        """
+        return self._players
+
+    def get_geometry(self):
+        """
+        Returns the BoardGeometry holding the tables of the board size.
+        """
+        return self._geometry
+
+    def next_player(self, player):
+        """
+        Returns the number of the player who moves after the player.
+        """
+        return NEXT_PLAYERS[self._players][player]
+
+    def get_hash(self):
+        """
+        Returns the 64-bit Zobrist hash of the position: pawn squares, fences, fences left and player turn.
+        """
+        return self._hash
+
+    def get_game_state(self):
+        """
+        Returns an immutable GameState of the current position.
+        """
+        fences_left = tuple([None] + [len(fences) for fences in self._fence_tabs[1:]])
+        return GameState(tuple(self._pawn_squares), self._h_fences, self._v_fences, fences_left, self._current_turn,
+                         self._hash, self._geometry)
+
+    @classmethod
+    def from_game_state(cls, state):
+        """
+        Returns a new QuoridorGame set to the position of a GameState, with no moves to take back.
+        """
+        players = state.get_player_count()
+        geometry = state.get_geometry()
+        game = cls(geometry.size, players, max(state.get_fences_left(player) for player in range(1, players + 1)))
+        game._pawns = 0
+        for player in range(1, players + 1):
+            square = state.get_pawn_square(player)
+            game._pawn_squares[player] = square
+            game._pawn_pieces[player].set_coordinates(geometry.square_coordinates[square])
+            game._pawns |= 1 << square
+            del game._fence_tabs[player][state.get_fences_left(player):]
+        game._h_fences = state.get_h_fences()
+        game._v_fences = state.get_v_fences()
+        for player in range(1, players + 1):
+            game._distances[player] = geometry.goal_distances(game._goal_masks[player], game._h_fences,
+                                                              game._v_fences)
+        game._current_turn = state.get_current_turn()
+        game._current_state = state.get_current_state()
+        game._hash = state.get_hash()
+        game._clear_move_cache()
+        return game
+
+    def get_fence_hash(self):
+        """
+        Returns the Zobrist hash of the fences on the board alone, worked out from the position hash.
+        """
+        geometry = self._geometry
+        fence_hash = self._hash ^ geometry.zobrist_turns[self._current_turn]
+        for player in range(1, self._players + 1):
+            fence_hash ^= (geometry.zobrist_pawns[player][self._pawn_squares[player]] ^
+                           geometry.zobrist_fences_left[player][len(self._fence_tabs[player])])
+        return fence_hash
+
+    def get_book_move(self, book):
+        """
+        Returns the move stored for the position in an OpeningBook (see book.py), or None.
+        """
+        return book.get_move(self)
+
+    def get_endgame_result(self, tables):
+        """
+        Returns the exact result of the position from EndgameTables (see book.py) when neither player
+        has fences left: a positive number of moves for the player to move to win, a negative number
+        of moves to lose, 0 for neither, or None if a player has fences left, the game is over or the
+        tables have no result for the fence layout.
+        """
+        return tables.probe(self)
+
+    def get_board(self):
+        """
+        Returns a 2d array of Cells (9 rows and 9 columns on the standard board) built from the bitboards.
+        The Cells are a view of the current position; changing them does not change the game.
+        """
+        board = []
+        size = self._geometry.size
+        for i in range(size):  # iterates over the rows
+            row = []
+            for j in range(size):  # iterates over the columns
+                row.append(self.get_cell((j, i)))
+            board.append(row)
+        # Paint the cells the current player's pawn is allowed to move to
+        if self._current_state == 0:
+            for coordinates in self.valid_moves():
+                board[coordinates[1]][coordinates[0]].set_painted_cell()
+        return board
+
+    def get_cell(self, coordinates):
+        """
+        Returns a Cell object describing the square at the x, y coordinates.
+        """
+        geometry = self._geometry
+        bit = 1 << geometry.square_index(coordinates)
+        cell = Cell(coordinates[0], coordinates[1])
+        if bit & self._pawns:
+            cell.set_pawn(self._pawn_squares.index(geometry.square_index(coordinates)))
+        # The top and bottom edges are Player1's and Player2's baselines;
+        # the left and right edges are Player3's and Player4's in a 4-player game
+        for player in range(1, self._players + 1):
+            if bit & geometry.baselines[player]:
+                cell.set_baseline_cell(player)
+                break
+        if bit & self._v_fences:
+            cell.set_v_fence()
+        if bit & self._h_fences:
+            cell.set_h_fence()
+        return cell
+
+    def open_steps(self, square):
+        """
+        Returns a bitmask of the squares one step away from the square
+        that are not cut off by a fence or the edge of the board.
+        """
+        h_fences, v_fences = self._h_fences, self._v_fences
+        steps = 0
+        for direction, neighbor, neighbor_bit, horizontal, fence_bit in self._geometry.steps[square]:
+            if not fence_bit & (h_fences if horizontal else v_fences):
+                steps |= neighbor_bit
+        return steps
+
+    def jump_moves(self, square, opponent_square):
+        """
+        Returns a bitmask of the squares a pawn on square can reach by hopping over the opponent pawn,
+        or moving diagonally around it if the hop is blocked by a fence or the edge of the board.
+        The opponent pawn must be one open step away from square.
+        """
+        for direction, neighbor, neighbor_bit, horizontal, fence_bit in self._geometry.steps[square]:
+            if neighbor == opponent_square:
+                return self._geometry.jump_mask(opponent_square, direction, self._pawns, self._h_fences,
+                                                self._v_fences)
+        return 0
+
+    def get_pawn_square(self, player):
+        """
+        Returns the bit index of the square the player's pawn is on.
+        """
+        return self._pawn_squares[player]
+
+    def get_h_fences(self):
+        """
+        Returns the bitmask of the cells with a horizontal fence.
+        """
+        return self._h_fences
+
+    def get_v_fences(self):
+        """
+        Returns the bitmask of the cells with a vertical fence.
+        """
+        return self._v_fences
+
+    def get_fences_left(self, player):
+        """
+        Returns the number of fences the player has left to place.
+        """
+        return len(self._fence_tabs[player])
+
+    def get_distances(self, player):
+        """
+        Returns the player's distance map: the number of moves from every square (by bit index)
+        to the player's goal baseline, ignoring pawns. The map is updated in place as fences are placed.
+        """
+        return self._distances[player]
+
+    def get_path_length(self, player):
+        """
+        Returns the number of moves on the shortest path from the player's pawn to the goal baseline,
+        ignoring pawns, or UNREACHABLE if the pawn is cut off.
+        """
+        return self._distances[player][self._pawn_squares[player]]
 
     @staticmethod
-    def pos_adjacent_moves(player_pawn):
+    def fence_edge(fence_type, square, size=BOARD_SIZE):
         """
-        Returns a list of possible adjacent moves.
+        Returns the two squares separated by a v or h fence placed on the square of a size x size board.
         """
-        # First, create a list of tuples/coordinates of adjacent squares
-        adjacent_squares = [(player_pawn[0] - 1, player_pawn[1]),
-                            (player_pawn[0] + 1, player_pawn[1]),
-                            (player_pawn[0], player_pawn[1] - 1),
-                            (player_pawn[0], player_pawn[1] + 1),
-                            ]
-        # Then, remove coordinates less than 0 or greater than 8 since these are out of bounds
-        for coordinates in adjacent_squares:
-            for i in coordinates:
-                if i < 0 or i > 8:
-                    adjacent_squares.remove(coordinates)
-        return adjacent_squares
+        if fence_type == "h":
+            return square - size, square  # the cell above and the cell with the fence
+        return square - 1, square  # the cell to the left and the cell with the fence
+
+    def fence_cuts_path(self, fence_type, coordinates):
+        """
+        Returns True if placing a v or h fence at the x, y coordinates would leave
+        a pawn without a path to its goal baseline.
+        """
+        geometry = self._geometry
+        square = geometry.square_index(coordinates)
+        bit = 1 << square
+        h_fences, v_fences = self._h_fences, self._v_fences
+        if fence_type == "h":
+            if bit & geometry.top_edge:
+                return False  # a fence on the edge of the board does not cut off anything
+            h_fences |= bit
+        else:
+            if bit & geometry.left_edge:
+                return False
+            v_fences |= bit
+        above_or_left, square = self.fence_edge(fence_type, square, geometry.size)
+
+        # A fence between two squares at the same distance is not on any shortest path,
+        # so every pawn keeps its path; this is the common case
+        for distances in self._distances[1:]:
+            if distances[above_or_left] != distances[square]:
+                break
+        else:
+            return False
+
+        # Search around the fence; if the two squares are still connected no path was cut
+        if geometry.flood_fill(1 << above_or_left, h_fences, v_fences, bit) & bit:
+            return False
+
+        # The fence splits the board in two, so check every pawn can still reach its goal baseline
+        for player in range(1, self._players + 1):
+            goal = self._goal_masks[player]
+            if not geometry.flood_fill(1 << self._pawn_squares[player], h_fences, v_fences, goal) & goal:
+                return True
+        return False
+
+    def _close_edge(self, first, second):
+        """
+        Updates the distance maps after the edge between two squares has been cut off by a fence.
+        Only the squares whose distance changes are visited, so the cost grows with the size of the change
+        rather than the size of the board.
+        """
+        h_fences, v_fences = self._h_fences, self._v_fences
+        steps = self._geometry.steps
+        for distances in self._distances[1:]:
+            if distances[first] == distances[second]:
+                continue  # not on any shortest path
+            if distances[first] > distances[second]:
+                first, second = second, first
+            # Only squares whose every shortest path went through the far square of the edge are affected.
+            # Visit them in order of distance, keeping the squares that still have a neighbor one step closer
+            affected = set()
+            queue = [second]
+            queued = {second}
+            for square in queue:
+                distance = distances[square]
+                if distance == 0:
+                    continue  # goal baseline
+                supported = False
+                for direction, neighbor, neighbor_bit, horizontal, fence_bit in steps[square]:
+                    if (distances[neighbor] == distance - 1 and neighbor not in affected and
+                            not fence_bit & (h_fences if horizontal else v_fences)):
+                        supported = True
+                        break
+                if supported:
+                    continue
+                affected.add(square)
+                for direction, neighbor, neighbor_bit, horizontal, fence_bit in steps[square]:
+                    if (distances[neighbor] == distance + 1 and neighbor not in queued and
+                            not fence_bit & (h_fences if horizontal else v_fences)):
+                        queued.add(neighbor)
+                        queue.append(neighbor)
+
+            # Recompute the affected squares from their unaffected neighbors
+            for square in affected:
+                distances[square] = UNREACHABLE
+            heap = []
+            for square in affected:
+                best = UNREACHABLE
+                for direction, neighbor, neighbor_bit, horizontal, fence_bit in steps[square]:
+                    if distances[neighbor] + 1 < best and not fence_bit & (h_fences if horizontal else v_fences):
+                        best = distances[neighbor] + 1
+                if best < UNREACHABLE:
+                    distances[square] = best
+                    heap.append((best, square))
+            heapq.heapify(heap)
+            while heap:
+                distance, square = heapq.heappop(heap)
+                if distance > distances[square]:
+                    continue  # already reached by a shorter path
+                for direction, neighbor, neighbor_bit, horizontal, fence_bit in steps[square]:
+                    if distance + 1 < distances[neighbor] and not fence_bit & (h_fences if horizontal else v_fences):
+                        distances[neighbor] = distance + 1
+                        heapq.heappush(heap, (distance + 1, neighbor))
+
+    def _open_edge(self, first, second):
+        """
+        Updates the distance maps after the fence between two squares has been removed.
+        """
+        h_fences, v_fences = self._h_fences, self._v_fences
+        steps = self._geometry.steps
+        for distances in self._distances[1:]:
+            if distances[first] > distances[second]:
+                first, second = second, first
+            if distances[first] + 1 >= distances[second]:
+                continue  # the new edge gives no shorter path
+            # Spread the shorter distances outwards from the far square of the edge
+            distances[second] = distances[first] + 1
+            queue = [second]
+            for square in queue:
+                distance = distances[square] + 1
+                for direction, neighbor, neighbor_bit, horizontal, fence_bit in steps[square]:
+                    if distance < distances[neighbor] and not fence_bit & (h_fences if horizontal else v_fences):
+                        distances[neighbor] = distance
+                        queue.append(neighbor)
+
+    @staticmethod
+    def pos_adjacent_moves(player_pawn, size=BOARD_SIZE):
+        """
+        Returns a list of possible adjacent moves on a size x size board.
+        """
+        # Coordinates less than 0 or greater than size - 1 are out of bounds and left out of the table
+        geometry = get_geometry(size)
+        return list(geometry.adjacent_coordinates[geometry.square_index(player_pawn)])
 
     def fence_checker(self, player_pawn, adjacent_squares):
         """
         Checks for Fences and returns a list of valid adjacent moves.
+        Kept for callers of the list-based API; the engine itself generates moves with pawn_move_mask.
         """
-        # 1. Check for validity of upward movement; if current cell has a horizontal fence, can't move upwards
-        row = player_pawn[1]  # the second element in the Tuple is the row
-        column = player_pawn[0]  # the first element in the Tuple is the column
-        if self._board[row][column].get_h_fence() == 1:  # if current cell has a horizontal fence
-            adjacent_squares.remove((player_pawn[0], player_pawn[1] - 1))  # remove coordinates from list
-
-        # 2. Check for validity of downward movement; if cell downwards has a horizontal fence, can't move downwards
-        row = player_pawn[1] + 1
-        column = player_pawn[0]
-
-        # Use try except block to handle out of range for checking cell near corners
-        try:
-            if self._board[row][column].get_h_fence() == 1:  # if the downward cell has a horizontal fence
-                adjacent_squares.remove((player_pawn[0], player_pawn[1] + 1))  # remove coordinates from list
-        except IndexError:
-            pass
-
-        # 3. Check for validity of left movement; if current cell has a vertical fence, can't move leftwards
-        row = player_pawn[1]
-        column = player_pawn[0]
-        if self._board[row][column].get_v_fence() == 1:  # if the current cell has a vertical fence
-            adjacent_squares.remove((player_pawn[0] - 1, player_pawn[1]))  # remove coordinates from list
-
-        # 4. Check for validity of right movement; if rightward cell has a vertical fence, can't move rightwards
-        row = player_pawn[1]
-        column = player_pawn[0] + 1
-        if self._board[row][column].get_v_fence() == 1:  # if the rightward cell has a vertical fence
-            adjacent_squares.remove((player_pawn[0] + 1, player_pawn[1]))  # remove coordinates from list
-
-        cleared_squares = adjacent_squares
+        square_index_of = self._geometry.square_index
+        steps = self.open_steps(square_index_of(player_pawn))  # squares not cut off by a fence
+        cleared_squares = []
+        for coordinates in adjacent_squares:
+            if steps >> square_index_of(coordinates) & 1:
+                cleared_squares.append(coordinates)
         return cleared_squares  # Cleared list of valid moves (without Fence restrictions)
 
     def pawn_interaction(self, player_pawn, opponent_pawn, new_list):
+        """
+        Takes the list of Fence-cleared moves and returns it with the opponent pawn's square replaced
+        by the hop or diagonal moves when the two pawns are face to face.
+        Kept for callers of the list-based API; the engine itself generates moves with pawn_move_mask,
+        which is where the "face_to_face" debug event comes from.
+        """
         # When a pawn is face to face with another - special interaction allows a hop or a diagonal movement
         # depending on the surrounding fences
-        # 1. Check if there is pawn face to face
-        # A pawn is face to face if it's in the adjacent list we made earlier
-        # compare opponent pawn to new_list to see if it's face to face with current player pawn
-        if opponent_pawn in new_list:  # if opponent is face to face with the other pawn
-            # if both pawns are in the same column, that means they are vertically face to face
-            face_orientation = None
-            if opponent_pawn[0] == player_pawn[0]:
-                face_orientation = "vertical"
-            # if both pawns are in the same row, that means they are horizontally face to face
-            elif opponent_pawn[1] == player_pawn[1]:
-                face_orientation = "horizontal"
-
-            # remove opponent pawns coordinates from painted cells since two pawns can't be on the same cell
-            new_list.remove(self._board[opponent_pawn[1]][opponent_pawn[0]].get_coordinates())
-
-            # if they are face to face vertically
-            if face_orientation == "vertical":
-                if player_pawn < opponent_pawn:  # < or > determines direction of hop by comparing both tuples
-                    # if opponent pawn's cell has no horizontal fence (in between the two pawns), allow hop
-                    if self._board[opponent_pawn[1]][opponent_pawn[0]].get_h_fence() == 0:
-                        # if the destination cell to jump to has a horizontal wall, allow diagonal move
-                        # if the destination cell to jump to has no horizontal wall, allow hop
-                        if self._board[opponent_pawn[1] + 1][opponent_pawn[0]].get_h_fence() == 1:  # if horizontal wall
-                            # if no vertical walls stopping hop, add possible diagonal moves to painted cells
-                            if self._board[opponent_pawn[1]][opponent_pawn[0]].get_v_fence() != 1:
-                                new_list.append(
-                                    self._board[opponent_pawn[1]][opponent_pawn[0] - 1].get_coordinates())
-                            if self._board[opponent_pawn[1]][opponent_pawn[0] + 1].get_v_fence() != 1:
-                                new_list.append(
-                                    self._board[opponent_pawn[1]][opponent_pawn[0] + 1].get_coordinates())
-                        else:  # if no horizontal wall, allow hop and add coordinates to possible moves/painted cells
-                            new_list.append(self._board[opponent_pawn[1] + 1][opponent_pawn[0]].get_coordinates())
-                elif player_pawn > opponent_pawn:
-                    # if opponent pawn's cell has no horizontal fence (in between the two pawns), allow hop
-                    if self._board[player_pawn[1]][player_pawn[0]].get_h_fence() == 0:
-                        # add coordinates to possible moves/painted cells
-                        print(self._board[opponent_pawn[1]][opponent_pawn[0] + 1].get_coordinates())
-                        if self._board[opponent_pawn[1]][opponent_pawn[0]].get_h_fence() == 1:  # if horizontal wall
-                            # if no vertical walls stopping hop, add possible diagonal moves to painted cells
-                            if self._board[opponent_pawn[1]][opponent_pawn[0]].get_v_fence() != 1:
-                                new_list.append(
-                                    self._board[opponent_pawn[1]][opponent_pawn[0] - 1].get_coordinates())
-                            if self._board[opponent_pawn[1]][opponent_pawn[0] + 1].get_v_fence() != 1:
-                                new_list.append(
-                                    self._board[opponent_pawn[1]][opponent_pawn[0] + 1].get_coordinates())
-                        else:  # if no horizontal wall, allow hop and add coordinates to possible moves/painted cells
-                            new_list.append(self._board[opponent_pawn[1] - 1][opponent_pawn[0]].get_coordinates())
-
-            # if they are face to face horizontally
-            elif face_orientation == "horizontal":
-                if player_pawn < opponent_pawn:
-                    # if opponent pawn's cell has no vertical fence (in between the two pawns), allow hop
-                    if self._board[opponent_pawn[1]][opponent_pawn[0]].get_v_fence() == 0:
-                        # if the destination cell to jump to has a vertical wall, allow diagonal move
-                        # if the destination cell to jump to has no vertical wall, allow hop
-                        if self._board[opponent_pawn[1]][opponent_pawn[0] + 1].get_v_fence() == 1:  # if vertical wall
-                            # if no vertical walls stopping hop, add possible diagonal moves to painted cells
-                            if self._board[opponent_pawn[1]][opponent_pawn[0]].get_h_fence() != 1:
-                                new_list.append(
-                                    self._board[opponent_pawn[1] - 1][opponent_pawn[0]].get_coordinates())
-                            if self._board[opponent_pawn[1] + 1][opponent_pawn[0]].get_h_fence() != 1:
-                                new_list.append(
-                                    self._board[opponent_pawn[1] + 1][opponent_pawn[0]].get_coordinates())
-                        else:  # if the destination cell to jump to has no vertical wall, allow hop
-                            new_list.append(
-                                self._board[opponent_pawn[1]][opponent_pawn[0] + 1].get_coordinates())
-                elif player_pawn > opponent_pawn:
-                    # if opponent pawn's cell has no vertical fence (in between the two pawns), allow hop
-                    if self._board[player_pawn[1]][player_pawn[0]].get_v_fence() == 0:
-                        # if the destination cell to jump to has a vertical wall, allow diagonal move
-                        # if the destination cell to jump to has no vertical wall, allow hop
-                        if self._board[opponent_pawn[1]][opponent_pawn[0]].get_v_fence() == 1:
-                            # if no vertical walls stopping hop, add possible diagonal moves to painted cells
-                            if self._board[opponent_pawn[1]][opponent_pawn[0]].get_h_fence() != 1:
-                                new_list.append(
-                                    self._board[opponent_pawn[1] - 1][opponent_pawn[0]].get_coordinates())
-                            if self._board[opponent_pawn[1] + 1][opponent_pawn[0]].get_h_fence() != 1:
-                                new_list.append(
-                                    self._board[opponent_pawn[1] + 1][opponent_pawn[0]].get_coordinates())
-                        # add coordinates to possible moves/painted cells
-                        else:
-                            new_list.append(
-                                self._board[opponent_pawn[1]][opponent_pawn[0] - 1].get_coordinates())
-
+        # A pawn is face to face if it's in the Fence-cleared list of adjacent moves
+        if opponent_pawn not in new_list:
             return new_list
 
+        # remove opponent pawns coordinates from painted cells since two pawns can't be on the same cell
+        new_list.remove(opponent_pawn)
+
+        # add the hop, or the diagonal moves if the hop is blocked, to possible moves/painted cells
+        geometry = self._geometry
+        jumps = self.jump_moves(geometry.square_index(player_pawn), geometry.square_index(opponent_pawn))
+        jump_list = [geometry.square_coordinates[square] for square in mask_squares(jumps)]
+        new_list.extend(jump_list)
+        return new_list
+
+    def _clear_move_cache(self):
+        """
+        Forgets the legal moves of the previous position; called whenever the position changes.
+        """
+        self._pawn_move_cache = [None] * (self._players + 1)
+        self._fence_cache = None
+        self._fence_list_cache = None
+
+    def get_cache_stats(self):
+        """
+        Returns a dict with the number of legal-move lookups answered from the cache (hits)
+        and computed (misses).
+        """
+        return {"hits": self._cache_hits, "misses": self._cache_misses}
+
+    def pawn_move_mask(self, player):
+        """
+        Returns a bitmask of the squares the player's pawn can move to.
+        """
+        mask = self._pawn_move_cache[player]
+        if mask is None:
+            self._cache_misses += 1
+            mask = self._geometry.pawn_moves(self._pawn_squares[player], self._pawns, self._h_fences, self._v_fences)
+            self._pawn_move_cache[player] = mask
+        else:
+            self._cache_hits += 1
+        return mask
+
     def valid_moves(self):
         """
         Returns a list of possible tuple/coordinates of valid moves.
         """
-        # Assign appropriate player Pawn to be moved
-        player_pawn = None
-        opponent_pawn = None
-        if self._current_turn == 1:
-            player_pawn = self._p1.get_coordinates()  # Assign coordinates of the Pawn object
-            opponent_pawn = self._p2.get_coordinates()
-        elif self._current_turn == 2:
-            player_pawn = self._p2.get_coordinates()
-            opponent_pawn = self._p1.get_coordinates()
-
-        # Check possible adjacent square moves by calling adjacent_moves()
-        adjacent_squares = self.pos_adjacent_moves(player_pawn)  # Returns a list of possible adjacent moves
-
-        # Create a new list for use later for pawn to pawn interaction/diagonal movement.
-        new_list = adjacent_squares[:]  # A copy of the above list will be used for checking Pawn restrictions
-
-        # Check for movement restrictions
-        # A. Fences
-        # Returns a list of Fence-cleared moves
-        cleared_fences = self.fence_checker(player_pawn, adjacent_squares)
-
-        # B. Pawn
-        # Returns a list of valid Pawn-to-Pawn interaction moves
-        cleared_pawn = self.pawn_interaction(player_pawn, opponent_pawn, new_list)
-
-        # Adds both Fence-cleared and Pawn-to-Pawn interaction moves
-        # and returns the final list of tuples/coordinates for possible moves for current player's Pawn
-        # Use try-except block to avoid error if there is no pawn to pawn interaction.
-        try:
-            valid_moves = cleared_fences + cleared_pawn
-        except TypeError:
-            return cleared_fences
-
-        return valid_moves
+        moves = []
+        mask = self.pawn_move_mask(self._current_turn)
+        coordinates = self._geometry.square_coordinates
+        while mask:
+            low_bit = mask & -mask
+            moves.append(coordinates[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return moves
+
+    def fence_masks(self):
+        """
+        Returns a tuple of two bitmasks of the squares the current player can place an h fence and a v fence on.
+        """
+        if self._current_state != 0 or self.get_fences_left(self._current_turn) == 0:
+            return 0, 0
+        if self._fence_cache is not None:
+            self._cache_hits += 1
+            return self._fence_cache
+        self._cache_misses += 1
+        masks = []
+        geometry = self._geometry
+        # Every square except the edges and the squares that already have a fence of that type
+        for fence_type, taken in (("h", geometry.top_edge | self._h_fences),
+                                  ("v", geometry.left_edge | self._v_fences)):
+            mask = geometry.board_mask & ~taken
+            candidates = mask
+            while candidates:
+                low_bit = candidates & -candidates
+                if self.fence_cuts_path(fence_type, geometry.square_coordinates[low_bit.bit_length() - 1]):
+                    mask ^= low_bit
+                candidates ^= low_bit
+            masks.append(mask)
+        self._fence_cache = masks[0], masks[1]
+        return self._fence_cache
+
+    def valid_fences(self):
+        """
+        Returns a list of possible (fence_type, (x, y)) fence placements for the current player.
+        """
+        if self._fence_list_cache is not None:
+            self._cache_hits += 1
+            return list(self._fence_list_cache)
+        fences = []
+        coordinates = self._geometry.square_coordinates
+        for fence_type, mask in zip(("h", "v"), self.fence_masks()):
+            for square in mask_squares(mask):
+                fences.append((fence_type, coordinates[square]))
+        self._fence_list_cache = tuple(fences)
+        return fences
 
     def get_current_state(self):
         """
         Returns 0 if game state is unfinished, or 1 or 2 if Player1 or Player2 has won respectively
+        (3 or 4 for Player3 or Player4 in a 4-player game)
         """
         return self._current_state
 
     def get_current_turn(self):
         """
-        Returns 1 or 2 if it's Player1 or Player2's turn
+        Returns 1 or 2 if it's Player1 or Player2's turn (3 or 4 for Player3 or Player4 in a 4-player game)
         """
         return self._current_turn
 
@@ -345,46 +1098,31 @@ class QuoridorGame:
             return False
 
         # Check if coordinates (tuple (x, y)) is a valid move
-        # Call valid_moves() to get a list of tuples/coordinates of the valid moves
-        # and check if the given coordinates is in the list
-        # 1. Return false if it's not a valid move
-        if coordinates not in self.valid_moves():
+        # Return false if it's out of bounds or not in the bitmask of valid moves
+        geometry = self._geometry
+        if not (0 <= coordinates[0] < geometry.size and 0 <= coordinates[1] < geometry.size):
+            return False
+        square = coordinates[1] * geometry.size + coordinates[0]
+        if not self.pawn_move_mask(player_turn) >> square & 1:
             return False
-        # 2. Return True if it is a valid move.
-        elif coordinates in self.valid_moves():
-            # Check if it's a winning move
-            if self.get_current_turn() == 1:
-                # if player turn is 1 and the baseline cell is player 2's baseline, player 1 wins
-                if self._board[coordinates[1]][coordinates[0]].get_baseline_cell() == 2:
-                    self._current_state = 1  # set game state to Player1 won
-                    return True
-            elif self.get_current_turn() == 2:
-                # if player turn is 2 and the baseline cell is player 1's baseline, player 2 wins
-                if self._board[coordinates[1]][coordinates[0]].get_baseline_cell() == 1:
-                    self._current_state = 2  # set game state to Player2 won
-                    return True
 
         # Move the pawn from it's original position
-        if self.get_current_turn() == 1:
-            # Set original cell pawn status to 0
-            self._board[self._p1.get_coordinates()[1]][self._p1.get_coordinates()[0]].set_pawn(0)
-            # Move pawn to new position
-            self._p1.set_coordinates(coordinates)
-            # Set new pawn coordinates and set new cell pawn status to 1
-            self._board[self._p1.get_coordinates()[1]][self._p1.get_coordinates()[0]].set_pawn(1)
-        elif self.get_current_turn() == 2:
-            # Set original cell pawn status to 0
-            self._board[self._p2.get_coordinates()[1]][self._p2.get_coordinates()[0]].set_pawn(0)
-            # Move pawn to new position
-            self._p2.set_coordinates(coordinates)
-            # Set new pawn coordinates and set new cell pawn status to 2
-            self._board[self._p2.get_coordinates()[1]][self._p2.get_coordinates()[0]].set_pawn(2)
+        zobrist = geometry.zobrist_pawns[player_turn]
+        self._pawns ^= (1 << self._pawn_squares[player_turn]) | (1 << square)
+        self._hash ^= zobrist[self._pawn_squares[player_turn]] ^ zobrist[square]
+        self._pawn_squares[player_turn] = square
+        self._clear_move_cache()
+        self._pawn_pieces[player_turn].set_coordinates(coordinates)
+        self._undo_stack = []  # unmake_move cannot take back a move made directly, nor the moves before it
+
+        # Check if it's a winning move
+        # if the pawn reached the baseline of the other player, the player wins
+        if (1 << square) & self._goal_masks[player_turn]:
+            self._current_state = player_turn  # set game state to the player that won
+            return True
 
         # Switch to next player's turn
-        if self.get_current_turn() == 1:
-            self._current_turn = 2
-        elif self.get_current_turn() == 2:
-            self._current_turn = 1
+        self._switch_turn()
 
         # Return True if the move is valid and successful
         return True
@@ -408,69 +1146,140 @@ class QuoridorGame:
             return False
 
         # Check to see if a player has fences
-        if player_turn == 1:
-            if len(self._p1_fences) == 0:  # if Player1 has 0 fences, return False
-                return False
-        elif player_turn == 2:  # if Player2 has 0 fences, return False
-            if len(self._p2_fences) == 0:
-                return False
+        fences = self._fence_tabs[player_turn]
+        if len(fences) == 0:  # if the player has 0 fences, return False
+            return False
 
         # Check to see if the coordinates are valid
-        # Cannot place fence out of bounds (x > 9 or y > 9)
-        if coordinates[0] > 8 or coordinates[1] > 8:
+        # Cannot place fence out of bounds (x or y less than 0 or greater than 8 on the standard board)
+        geometry = self._geometry
+        if not (0 <= coordinates[0] < geometry.size and 0 <= coordinates[1] < geometry.size):
             return False
+        square = coordinates[1] * geometry.size + coordinates[0]
+        bit = 1 << square
 
+        # Check to see if the player is placing a horizontal fence or vertical fence
         # Cannot place horizontal fence from (0,0) to (8,0)
         # and vertical fence from (0,0) to (0,8) since these are the edges of the board
-        invalid_coordinates = []  # list of tuple coordinates that are invalid
-        if fence_type == "h":
-            for i in range(0, 9):
-                invalid_coordinates.append((i, 0))
-        elif fence_type == "v":
-            for i in range(0, 9):
-                invalid_coordinates.append((0, i))
-        # If given tuple of coordinates in invalid coordinates - the move is invalid and return False
-        if coordinates in invalid_coordinates:
-            return False
+        # Check to see if there is already a fence of that type there
+        if fence_type == "v":
+            if bit & (geometry.left_edge | self._v_fences):
+                return False  # return False if it's the edge or there is already a vertical fence there
+        elif fence_type == "h":
+            if bit & (geometry.top_edge | self._h_fences):
+                return False  # return False if it's the edge or there is already a horizontal fence there
+        else:
+            return False  # fence_type must be v or h
 
-        # Place the fence using given x, y coordinates
-        # Syntax is self._board[row][column] to access coordinates
-        # Ex. coordinates given is (6,4), syntax is self._board[5][6] (5th array, 6rd element in the array) to access
-        # the cell with (6,5) coordinates
-        row = coordinates[1]  # the second element in the Tuple is the row
-        column = coordinates[0]  # the first element in the Tuple is the column
+        # Cannot place a fence that leaves either pawn without a path to its goal baseline
+        if self.fence_cuts_path(fence_type, coordinates):
+            return False
 
-        # Check to see if the player is placing a horizontal fence or vertical fence
-        if fence_type == "v":  # check to see if the player is placing a horizontal fence or vertical fence
-            # Check to see if there is already a fence of that type there, otherwise place the fence
-            if self._board[row][column].get_v_fence() == 1:
-                return False  # return False if there is already a vertical fence there
-            else:
-                self._board[row][column].set_v_fence()  # set that cell (6, 5) to have a vertical fence
-        elif fence_type == "h":
-            if self._board[row][column].get_h_fence() == 1:
-                return False  # return False if there is already a horizontal fence there
-            else:
-                self._board[row][column].set_h_fence()  # set that cell (6, 5) to have a horizontal fence
+        # Place the fence and update the distance maps
+        if fence_type == "v":
+            self._v_fences |= bit
+            self._hash ^= geometry.zobrist_v_fences[square]
+        else:
+            self._h_fences |= bit
+            self._hash ^= geometry.zobrist_h_fences[square]
+        self._close_edge(*self.fence_edge(fence_type, square, geometry.size))
+        self._clear_move_cache()
 
         # Remove a fence from the Player's fence tab and set new coordinates of the fence
-        if player_turn == 1:
-            fence = self._p1_fences.pop(0)  # remove the first fence on Player1's fence tab
-            fence.set_coordinates(coordinates)
-
-        elif player_turn == 2:
-            fence = self._p2_fences.pop(0)  # remove the first fence on Player2's fence tab
-            fence.set_coordinates(coordinates)
+        fence = fences.pop(0)  # remove the first fence on the Player's fence tab
+        fence.set_coordinates(coordinates)
+        zobrist = geometry.zobrist_fences_left[player_turn]
+        self._hash ^= zobrist[len(fences) + 1] ^ zobrist[len(fences)]
+        self._undo_stack = []  # unmake_move cannot take back a move made directly, nor the moves before it
 
         # Switch to next player's turn
-        if self.get_current_turn() == 1:
-            self._current_turn = 2
-        elif self.get_current_turn() == 2:
-            self._current_turn = 1
+        self._switch_turn()
 
         # return True if fence placement is valid
         return True
 
+    def _switch_turn(self):
+        """
+        Passes the turn to the next player and updates the hash.
+        """
+        turns = self._geometry.zobrist_turns
+        next_turn = NEXT_PLAYERS[self._players][self._current_turn]
+        self._hash ^= turns[self._current_turn] ^ turns[next_turn]
+        self._current_turn = next_turn
+
+    def make_move(self, player_turn, move):
+        """
+        Takes an integer that represents the player making the move and a move tuple:
+        ("p", (x, y)) to move the pawn, or ("v", (x, y)) / ("h", (x, y)) to place a fence.
+        Makes the move with move_pawn or place_fence and remembers how to take it back with unmake_move.
+        :param player_turn: 1 or 2 depending if it's Player1 or Player2's turn
+        :param move: tuple of the move type and the x, y coordinates
+        :return: True or False depending on validity of move
+        """
+        move_type, coordinates = move
+        if player_turn != self._current_turn:
+            return False
+        # Remember the state the move is going to change
+        previous_turn = self._current_turn
+        previous_state = self._current_state
+        previous_hash = self._hash
+        previous_cache = self._pawn_move_cache, self._fence_cache, self._fence_list_cache
+        # move_pawn and place_fence start a new stack for moves made directly; keep this one
+        undo_stack = self._undo_stack
+        if move_type == "p":
+            undo = self._pawn_squares[player_turn]  # square the pawn moves from
+            if not self.move_pawn(player_turn, coordinates):
+                return False
+        else:
+            fences = self._fence_tabs[player_turn]
+            undo = fences[0] if fences else None  # Fence object taken from the player's fence tab
+            if not self.place_fence(player_turn, move_type, coordinates):
+                return False
+        undo_stack.append((player_turn, move_type, coordinates, undo,
+                           previous_turn, previous_state, previous_hash, previous_cache))
+        self._undo_stack = undo_stack
+        return True
+
+    def get_undo_count(self):
+        """
+        Returns the number of moves made with make_move that unmake_move can take back.
+        """
+        return len(self._undo_stack)
+
+    def unmake_move(self):
+        """
+        Takes back the last move made with make_move, restoring the game to the state before it.
+        A move made directly with move_pawn or place_fence cannot be taken back, nor the moves before it.
+        :return: the (player_turn, move) that was taken back, or None if there is no move to take back
+        """
+        if not self._undo_stack:
+            return None
+        (player_turn, move_type, coordinates, undo,
+         previous_turn, previous_state, previous_hash, previous_cache) = self._undo_stack.pop()
+
+        if move_type == "p":
+            # Move the pawn back to the square it came from
+            self._pawns ^= (1 << self._pawn_squares[player_turn]) | (1 << undo)
+            self._pawn_squares[player_turn] = undo
+            self._pawn_pieces[player_turn].set_coordinates(self._geometry.square_coordinates[undo])
+        else:
+            # Remove the fence from the board and put it back on the front of the player's fence tab
+            square = self._geometry.square_index(coordinates)
+            if move_type == "v":
+                self._v_fences ^= 1 << square
+            else:
+                self._h_fences ^= 1 << square
+            self._open_edge(*self.fence_edge(move_type, square, self._geometry.size))
+            undo.set_coordinates((None, None))
+            self._fence_tabs[player_turn].insert(0, undo)
+
+        self._current_turn = previous_turn
+        self._current_state = previous_state
+        self._hash = previous_hash
+        # The legal moves cached before the move are valid again
+        self._pawn_move_cache, self._fence_cache, self._fence_list_cache = previous_cache
+        return player_turn, (move_type, coordinates)
+
     def is_winner(self, player):
         """
         Takes a single integer representing the player number and returns True if the player has own and
@@ -478,7 +1287,7 @@ class QuoridorGame:
         :param player: integer
         :return: boolean
         """
-        if player == self._current_state:  # self._current_state would be either 0, 1, or 2
+        if player == self._current_state:  # self._current_state would be either 0 or a player number
             return True
         else:
             return False
@@ -493,44 +1302,8 @@ class QuoridorGame:
         ‾P1_Pawn‾ denotes a horizontal fence above the pawn
         | P1_Pawn denotes a vertical fence to the left of the pawn
         | ‾P1_Pawn‾ denotes the presence of both a horizontal and vertical fence in the cell
-        """
 
-        array = []  # create empty array
-        for row in self._board:  # iterate over each row array
-            new_row = []  # empty array to add Cell coordinates
-            for cell in row:  # iterate over each Cell in row
-                # append the specific Cell to the new_row
-                if cell.get_pawn() == 1:  # if the pawn is in that coordinate, print "Pawn"
-                    if cell.get_v_fence() == 1 and cell.get_h_fence() == 1:
-                        new_row.append("| ‾P1_Pawn‾")
-                    elif cell.get_v_fence() == 1:
-                        new_row.append("| P1_Pawn")  # | denotes a vertical fence
-                    elif cell.get_h_fence() == 1:
-                        new_row.append("‾P1_Pawn‾")  # ‾‾ denotes a horizontal fence
-                    else:
-                        new_row.append("P1_Pawn")
-                elif cell.get_pawn() == 2:
-                    if cell.get_v_fence() == 1 and cell.get_h_fence() == 1:
-                        new_row.append("| ‾P2_Pawn‾")
-                    elif cell.get_v_fence() == 1:
-                        new_row.append("| P2_Pawn")
-                    elif cell.get_h_fence() == 1:
-                        new_row.append("‾P2_Pawn‾")
-                    else:
-                        new_row.append("P2_Pawn")
-                elif cell.get_v_fence() == 1 and cell.get_h_fence() == 1:
-                    new_row.append("|‾‾")
-                elif cell.get_v_fence() == 1:
-                    new_row.append("|")  # if a vertical fence is in that coordinate, print "V Fence"
-                elif cell.get_h_fence() == 1:
-                    new_row.append("‾‾")  # if a horizontal fence is in that coordinate, print "H Fence"
-                else:
-                    new_row.append(cell.get_coordinates())  # otherwise, print the coordinates of the Cell
-            array.append(new_row)  # append the row/new_array of coordinates to main array
-
-        for row in array:  # print each row to create a visual
-            print(row)
-
-
-my_game = QuoridorGame()
-my_game.print_board()
\ No newline at end of file
+        The whole board goes out in a single write; render.BoardRenderer keeps it up to date move by move.
+        """
+        from render import BoardRenderer  # imported here so importing quoridor does not load it
+        sys.stdout.write(BoardRenderer(self).frame())
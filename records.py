@@ -0,0 +1,213 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Compact binary format for recording Quoridor games, with a streaming writer and reader
+
+import mmap
+
+from quoridor import QuoridorGame, BOARD_SIZE, square_index, square_coordinates
+
+# File layout: the header, then every game as its move records followed by END_OF_GAME.
+#
+# A move record is one call to move_pawn or place_fence:
+#   short pawn move, 1 byte:  0 | player - 1 (1 bit) | 00 | offset code (4 bits)
+#       the pawn moved by PAWN_OFFSETS[offset code] from its square; only used for moves that were made
+#   long move, 2 bytes:       1 | player - 1 (1 bit) | kind (2 bits) | rejected (1 bit) | 000, then the square
+#       kind 0 is a pawn move to the square, 1 an h fence and 2 a v fence on the square;
+#       rejected is set if the game did not allow the call
+# The square (y * 9 + x) is never 0xFF, so END_OF_GAME can only appear at the end of a game.
+# Only squares on the board can be recorded: calls to off-board coordinates are refused by the writer.
+HEADER = b"QRGR\x01" + bytes([BOARD_SIZE])
+END_OF_GAME = 0xFF
+
+# (dx, dy) of the pawn moves with a short record: steps, hops and diagonal moves
+PAWN_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0),
+                (0, -2), (0, 2), (-2, 0), (2, 0),
+                (-1, -1), (1, -1), (-1, 1), (1, 1))
+_OFFSET_CODES = {offset: code for code, offset in enumerate(PAWN_OFFSETS)}
+_KINDS = {"p": 0, "h": 1, "v": 2}
+_MOVE_TYPES = ("p", "h", "v")
+_START_SQUARES = (None, square_index((4, 0)), square_index((4, 8)))
+
+
+class RecordError(Exception):
+    """ Raised when an archive is not in the game record format. """
+    pass
+
+
+def encode_move(player, move, pawn_square, legal=True):
+    """
+    Returns the bytes of one move record.
+    :param player: 1 or 2
+    :param move: ("p" | "h" | "v", (x, y)) tuple
+    :param pawn_square: square of the player's pawn before the move
+    :param legal: False if the game did not allow the move
+    :raises ValueError: if the move cannot be recorded: the player is not 1 or 2, the move type not p, h or v,
+                        or the square is off the board, even for a rejected call
+    """
+    move_type, coordinates = move
+    if player not in (1, 2) or move_type not in _KINDS:
+        raise ValueError("cannot record a move of player %r of type %r" % (player, move_type))
+    if not (0 <= coordinates[0] < BOARD_SIZE and 0 <= coordinates[1] < BOARD_SIZE):
+        raise ValueError("cannot record a move to %r, which is off the board" % (coordinates,))
+    if move_type == "p" and legal:
+        x, y = square_coordinates(pawn_square)
+        code = _OFFSET_CODES.get((coordinates[0] - x, coordinates[1] - y))
+        if code is not None:
+            return bytes(((player - 1) << 6 | code,))
+    return bytes((0x80 | (player - 1) << 6 | _KINDS[move_type] << 4 | (0 if legal else 0x08),
+                  square_index(coordinates)))
+
+
+def decode_game(data):
+    """
+    Decodes the move records of one game (without END_OF_GAME).
+    :param data: bytes-like move records
+    :return: list of (player, move, legal) tuples
+    """
+    pawn_squares = list(_START_SQUARES)
+    moves = []
+    i = 0
+    end = len(data)
+    while i < end:
+        first = data[i]
+        player = (first >> 6 & 1) + 1
+        if first < 0x80:
+            # Short pawn move relative to the pawn's square
+            dx, dy = PAWN_OFFSETS[first & 0x0F]
+            x, y = square_coordinates(pawn_squares[player])
+            coordinates = (x + dx, y + dy)
+            pawn_squares[player] = square_index(coordinates)
+            moves.append((player, ("p", coordinates), True))
+            i += 1
+            continue
+        if i + 1 >= end:
+            raise RecordError("truncated move record")
+        move_type = _MOVE_TYPES[first >> 4 & 0x03]
+        legal = not first & 0x08
+        square = data[i + 1]
+        if move_type == "p" and legal:
+            pawn_squares[player] = square
+        moves.append((player, (move_type, square_coordinates(square)), legal))
+        i += 2
+    return moves
+
+
+class RecordWriter:
+    """
+    A class that streams games to a binary file object, one move at a time.
+    """
+
+    def __init__(self, file):
+        """
+        Initializes data members of the RecordWriter class and writes the file header.
+        :param file: binary file object opened for writing
+        """
+        self._file = file
+        self._file.write(HEADER)
+        self._pawn_squares = list(_START_SQUARES)
+        self._games = 0
+        self._moves = 0
+
+    def get_game_count(self):
+        """ Returns the number of games written. """
+        return self._games
+
+    def write_move(self, player, move, legal=True):
+        """
+        Writes one call to move_pawn or place_fence of the current game.
+        :param player: 1 or 2
+        :param move: ("p" | "h" | "v", (x, y)) tuple
+        :param legal: False if the game did not allow the move
+        :raises ValueError: if the move cannot be recorded (see encode_move); nothing is written
+        """
+        self._file.write(encode_move(player, move, self._pawn_squares[player], legal))
+        if move[0] == "p" and legal:
+            self._pawn_squares[player] = square_index(move[1])
+        self._moves += 1
+
+    def end_game(self):
+        """ Ends the current game; the next move written starts a new game. """
+        self._file.write(bytes((END_OF_GAME,)))
+        self._pawn_squares = list(_START_SQUARES)
+        self._games += 1
+
+    def write_game(self, moves):
+        """
+        Writes a whole game.
+        :param moves: list of (player, move) or (player, move, legal) tuples, such as the moves of a selfplay result
+        """
+        for record in moves:
+            self.write_move(*record)
+        self.end_game()
+
+
+def iter_games(data, start=None, stop=None):
+    """
+    Yields the games of an archive one at a time, as lists of (player, move, legal) tuples.
+    :param data: bytes-like archive, such as an mmap
+    :param start: byte offset; only games that start at or after it are read
+    :param stop: byte offset; only games that start before it are read
+    """
+    if bytes(data[:len(HEADER)]) != HEADER:
+        raise RecordError("not a game record archive")
+    if stop is None or stop > len(data):
+        stop = len(data)
+    if start is None or start <= len(HEADER):
+        start = len(HEADER)
+    else:
+        # Games start right after an END_OF_GAME byte
+        start = data.find(bytes((END_OF_GAME,)), start - 1) + 1
+        if start == 0:
+            return
+    while start < stop:
+        end = data.find(bytes((END_OF_GAME,)), start)
+        if end < 0:
+            raise RecordError("archive ends in the middle of a game")
+        yield decode_game(data[start:end])
+        start = end + 1
+
+
+def read_games(path, start=None, stop=None):
+    """
+    Yields the games of an archive file one at a time, as lists of (player, move, legal) tuples.
+    The file is memory mapped, so only the pages being decoded are read into memory.
+    :param start: byte offset; only games that start at or after it are read
+    :param stop: byte offset; only games that start before it are read
+    """
+    with open(path, "rb") as file:
+        if file.seek(0, 2) == 0:
+            raise RecordError("not a game record archive")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from iter_games(data, start, stop)
+
+
+def replay(moves, game=None):
+    """
+    Replays the moves of one game through move_pawn and place_fence.
+    :param moves: list of (player, move, legal) tuples
+    :param game: QuoridorGame to replay on; a new game by default
+    :return: tuple of the QuoridorGame and the number of moves the game rejected
+    """
+    if game is None:
+        game = QuoridorGame()
+    rejected = 0
+    for player, (move_type, coordinates), legal in moves:
+        if move_type == "p":
+            made = game.move_pawn(player, coordinates)
+        else:
+            made = game.place_fence(player, move_type, coordinates)
+        if not made:
+            rejected += 1
+    return game, rejected
+
+
+def replay_games(path, start=None, stop=None):
+    """
+    Yields (QuoridorGame, moves, rejected) for every game of an archive file, replaying each game
+    through move_pawn and place_fence as it is read.
+    :param start: byte offset; only games that start at or after it are replayed
+    :param stop: byte offset; only games that start before it are replayed
+    """
+    for moves in read_games(path, start, stop):
+        game, rejected = replay(moves)
+        yield game, moves, rejected
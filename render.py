@@ -0,0 +1,207 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Incremental Quoridor board renderer and a compact delta stream for spectators
+
+import struct
+
+from quoridor import mask_squares
+
+# A delta lists the cells changed since the last one:
+#   header "<BH": status (the player to move in the low 4 bits, the winner or 0 in the high 4 bits)
+#                 and the number of cells that follow
+#   cell "<HB":   square (y * size + x) and its state: the number of the pawn on it (0 for none)
+#                 in the low 3 bits, PAWN_MASK, then H_FENCE and V_FENCE
+# A keyframe is a delta that lists every cell, so a spectator can join at any point of a game.
+DELTA_HEADER = struct.Struct("<BH")
+DELTA_CELL = struct.Struct("<HB")
+PAWN_MASK = 0x07
+H_FENCE = 0x08
+V_FENCE = 0x10
+
+
+class DeltaError(Exception):
+    """ Raised when a delta is not in the delta stream format or does not fit the board. """
+    pass
+
+
+def cell_text(x, y, state):
+    """
+    Returns the text print_board shows for a cell, as it appears in the printed row:
+    the coordinates, or the quoted pawn and fences of the cell.
+    :param state: state of the cell in the delta format
+    """
+    pawn = state & PAWN_MASK
+    if pawn:
+        text = "P%d_Pawn" % pawn
+        if state & V_FENCE and state & H_FENCE:
+            text = "| ‾" + text + "‾"
+        elif state & V_FENCE:
+            text = "| " + text  # | denotes a vertical fence
+        elif state & H_FENCE:
+            text = "‾" + text + "‾"  # ‾‾ denotes a horizontal fence
+    elif state & V_FENCE and state & H_FENCE:
+        text = "|‾‾"
+    elif state & V_FENCE:
+        text = "|"
+    elif state & H_FENCE:
+        text = "‾‾"
+    else:
+        return "(%d, %d)" % (x, y)
+    return "'" + text + "'"
+
+
+class BoardView:
+    """
+    A class that holds the state of every cell of a board with the text of each cell and row cached,
+    so a frame is rebuilt only from the rows whose cells changed.
+    """
+
+    def __init__(self, size):
+        """
+        Initializes data members of the BoardView class with an empty size x size board.
+        """
+        self._size = size
+        self._states = [0] * (size * size)
+        self._texts = [cell_text(square % size, square // size, 0) for square in range(size * size)]
+        self._rows = [None] * size  # text of each row, or None if a cell of the row changed
+        self._status = 0
+
+    def get_board_size(self):
+        """ Returns the number of squares on each side of the board. """
+        return self._size
+
+    def get_cell_state(self, square):
+        """ Returns the state of the cell on the square, in the delta format. """
+        return self._states[square]
+
+    def get_current_turn(self):
+        """ Returns the player to move. """
+        return self._status & 0x0F
+
+    def get_current_state(self):
+        """ Returns 0 if the game is unfinished, or the number of the player that has won. """
+        return self._status >> 4
+
+    def set_cell(self, square, state):
+        """ Sets the state of the cell on the square. """
+        if self._states[square] != state:
+            self._states[square] = state
+            self._texts[square] = cell_text(square % self._size, square // self._size, state)
+            self._rows[square // self._size] = None
+
+    def frame(self):
+        """
+        Returns the whole board as the text print_board prints: one line per row.
+        """
+        size = self._size
+        rows = self._rows
+        for y in range(size):
+            if rows[y] is None:
+                rows[y] = "[" + ", ".join(self._texts[y * size:(y + 1) * size]) + "]\n"
+        return "".join(rows)
+
+    def write_frame(self, file):
+        """ Writes the whole board to a text file object in a single write. """
+        file.write(self.frame())
+
+
+class BoardRenderer(BoardView):
+    """
+    A class that follows a QuoridorGame (or GameState) and renders it incrementally. After every
+    move_pawn or place_fence, update() finds the cells that changed from the pawn squares and the
+    fence bitmasks, so the work and the delta grow with the cells a move changes, not the board.
+    """
+
+    def __init__(self, game):
+        """
+        Initializes data members of the BoardRenderer class from the position of the game.
+        """
+        BoardView.__init__(self, game.get_geometry().size)
+        self._game = game
+        self._pawn_squares = ()
+        self._h_fences = 0
+        self._v_fences = 0
+        self.update()
+
+    def get_game(self):
+        """ Returns the game being rendered. """
+        return self._game
+
+    def set_game(self, game):
+        """
+        Follows another game of the same board size, such as the next GameState of a game;
+        the next update() returns the cells that differ between the positions.
+        """
+        if game.get_geometry().size != self._size:
+            raise ValueError("the game must have the same board size as the renderer")
+        self._game = game
+
+    def _cell_state(self, square):
+        """ Returns the state of the cell on the square in the game, in the delta format. """
+        state = 0
+        for player, pawn_square in enumerate(self._pawn_squares, 1):
+            if pawn_square == square:
+                state = player
+        if self._h_fences >> square & 1:
+            state |= H_FENCE
+        if self._v_fences >> square & 1:
+            state |= V_FENCE
+        return state
+
+    def update(self):
+        """
+        Brings the rendered board up to date with the game and returns the delta of the cells that changed,
+        as bytes. A move that changed nothing returns a delta with no cells, and the status only.
+        """
+        game = self._game
+        pawn_squares = tuple(game.get_pawn_square(player) for player in range(1, game.get_player_count() + 1))
+        h_fences, v_fences = game.get_h_fences(), game.get_v_fences()
+        changed = set(mask_squares((h_fences ^ self._h_fences) | (v_fences ^ self._v_fences)))
+        if pawn_squares != self._pawn_squares:
+            changed.update(self._pawn_squares)
+            changed.update(pawn_squares)
+        self._pawn_squares = pawn_squares
+        self._h_fences, self._v_fences = h_fences, v_fences
+        self._status = game.get_current_turn() | game.get_current_state() << 4
+
+        cells = []
+        for square in sorted(changed):
+            state = self._cell_state(square)
+            self.set_cell(square, state)
+            cells.append(DELTA_CELL.pack(square, state))
+        return DELTA_HEADER.pack(self._status, len(cells)) + b"".join(cells)
+
+    def keyframe(self):
+        """
+        Returns a delta of every cell, as bytes, that brings a new spectator to the current position.
+        """
+        cells = [DELTA_CELL.pack(square, state) for square, state in enumerate(self._states)]
+        return DELTA_HEADER.pack(self._status, len(cells)) + b"".join(cells)
+
+
+class SpectatorBoard(BoardView):
+    """
+    A class that rebuilds a board from a delta stream: a keyframe followed by the deltas of each move.
+    """
+
+    def apply(self, data):
+        """
+        Applies the deltas in the bytes to the board.
+        :return: list of the squares whose cells changed
+        """
+        squares = []
+        offset = 0
+        while offset < len(data):
+            if offset + DELTA_HEADER.size > len(data):
+                raise DeltaError("truncated delta header")
+            self._status, count = DELTA_HEADER.unpack_from(data, offset)
+            offset += DELTA_HEADER.size
+            if offset + count * DELTA_CELL.size > len(data):
+                raise DeltaError("truncated delta")
+            for square, state in DELTA_CELL.iter_unpack(data[offset:offset + count * DELTA_CELL.size]):
+                if square >= len(self._states):
+                    raise DeltaError("square %d is off the board" % square)
+                self.set_cell(square, state)
+                squares.append(square)
+            offset += count * DELTA_CELL.size
+        return squares
@@ -0,0 +1,294 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Alpha-beta search with iterative deepening for playing Quoridor
+
+import time
+
+from quoridor import mask_squares
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+WIN_SCORE = 100000  # score of a won position; wins found sooner score higher
+WIN_BOUND = WIN_SCORE // 2  # scores beyond this are wins or losses; evaluate() never gets near it
+PATH_WEIGHT = 100  # score of one move of shortest path difference
+FENCE_WEIGHT = 10  # score of one fence left in hand
+
+
+class SearchTimeout(Exception):
+    """ Raised inside the search when the time budget for the move runs out. """
+    pass
+
+
+def evaluate(game, player):
+    """
+    Returns the score of the position for the player: how many moves shorter the player's shortest path
+    to the goal baseline is than the opponent's, plus a small bonus for fences left in hand.
+    """
+    opponent = 3 - player
+    return (PATH_WEIGHT * (game.get_path_length(opponent) - game.get_path_length(player)) +
+            FENCE_WEIGHT * (game.get_fences_left(player) - game.get_fences_left(opponent)))
+
+
+def blocking_fences(game, player):
+    """
+    Returns a list of (fence_type, (x, y)) fences that cut an edge of one of the player's shortest paths,
+    nearest to the player's pawn first. These are the only fences that can make the player's path longer.
+    The fences are not checked for legality.
+    """
+    distances = game.get_distances(player)
+    size = game.get_board_size()
+    coordinates = game.get_geometry().square_coordinates
+    fences = []
+    seen = set()
+    frontier = [game.get_pawn_square(player)]
+    while frontier:
+        next_frontier = []
+        for square in frontier:
+            distance = distances[square]
+            if distance == 0:
+                continue  # reached the goal baseline
+            for neighbor in mask_squares(game.open_steps(square)):
+                if distances[neighbor] != distance - 1:
+                    continue
+                # The fence between two squares goes on the lower or righter of the two
+                if neighbor - square in (size, -size):
+                    fence = ("h", coordinates[max(square, neighbor)])
+                else:
+                    fence = ("v", coordinates[max(square, neighbor)])
+                fences.append(fence)
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return fences
+
+
+def _score_to_table(score, ply):
+    """
+    Returns the score to store in the transposition table for a position ply moves from the root.
+    Win and loss scores count the moves from the root; stored, they count the moves from the position,
+    so a position reached at another ply reads back the right distance.
+    """
+    if score > WIN_BOUND:
+        return score + ply
+    if score < -WIN_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    """
+    Returns a score read from the transposition table as a score for a position ply moves from the root.
+    """
+    if score > WIN_BOUND:
+        return score - ply
+    if score < -WIN_BOUND:
+        return score + ply
+    return score
+
+
+class SearchResult:
+    """ A class that holds the outcome of a search. """
+
+    def __init__(self, move, score, depth, nodes, elapsed):
+        self._move = move  # best move found, as a make_move tuple
+        self._score = score  # score of the best move for the player to move
+        self._depth = depth  # deepest iteration that was searched to the end
+        self._nodes = nodes  # positions visited
+        self._elapsed = elapsed  # seconds spent searching
+
+    def get_move(self):
+        """ Returns the best move found, as a ("p" | "h" | "v", (x, y)) tuple. """
+        return self._move
+
+    def get_score(self):
+        """ Returns the score of the best move for the player to move. """
+        return self._score
+
+    def get_depth(self):
+        """ Returns the depth of the deepest completed iteration. """
+        return self._depth
+
+    def get_nodes(self):
+        """ Returns the number of positions visited. """
+        return self._nodes
+
+    def get_elapsed(self):
+        """ Returns the number of seconds spent searching. """
+        return self._elapsed
+
+    def get_nodes_per_second(self):
+        """ Returns the search speed in positions per second. """
+        if self._elapsed <= 0:
+            return 0.0
+        return self._nodes / self._elapsed
+
+
+class SearchEngine:
+    """
+    A class that finds a move for the player to move in a QuoridorGame
+    with alpha-beta search, iterative deepening and a wall-clock budget per move.
+    """
+
+    def __init__(self, time_limit=0.1, max_depth=32, table=None):
+        """
+        Initializes data members of the SearchEngine class.
+        :param time_limit: seconds allowed per move; the search stops when they run out. None searches
+                           to max_depth whatever it takes, so the move does not depend on the machine
+        :param max_depth: deepest iteration to search
+        :param table: TranspositionTable to share between searches; a 16 MB table by default,
+                      replaced by a new one when a game on another board size is searched
+        """
+        self._time_limit = time_limit
+        self._max_depth = max_depth
+        self._table = table if table is not None else TranspositionTable()
+        self._own_table = table is None
+        self._deadline = 0.0
+        self._nodes = 0
+
+    def get_table(self):
+        """ Returns the TranspositionTable used by the engine. """
+        return self._table
+
+    def order_moves(self, game, player, best_move=None):
+        """
+        Returns the moves to search for the player, most promising first: the best move from an earlier
+        search, pawn moves that shorten the player's path, then fences on the opponent's shortest paths.
+        """
+        distances = game.get_distances(player)
+        pawn_squares = mask_squares(game.pawn_move_mask(player))
+        pawn_squares.sort(key=distances.__getitem__)
+        coordinates = game.get_geometry().square_coordinates
+        moves = [("p", coordinates[square]) for square in pawn_squares]
+        if game.get_fences_left(player) > 0:
+            seen = set()
+            for fence in blocking_fences(game, 3 - player):
+                if fence not in seen:
+                    seen.add(fence)
+                    moves.append(fence)
+        if best_move is not None and best_move in moves:
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+        return moves
+
+    def search(self, game):
+        """
+        Searches the position for the player to move, deepening one move at a time until
+        the time limit or max_depth is reached. The game is left as it was given.
+        :param game: two-player QuoridorGame that has not been won
+        :return: SearchResult with the best move of the deepest completed iteration
+        """
+        if game.get_player_count() != 2:
+            raise ValueError("the search plays two-player games")
+        if game.get_board_size() != self._table.get_board_size():
+            if not self._own_table:
+                raise ValueError("the transposition table is for another board size")
+            self._table = TranspositionTable(board_size=game.get_board_size())
+        start = time.perf_counter()
+        self._deadline = start + self._time_limit if self._time_limit is not None else float("inf")
+        self._nodes = 0
+        self._table.new_search()
+        player = game.get_current_turn()
+        undo_count = game.get_undo_count()
+
+        best_move = None
+        best_score = 0
+        completed_depth = 0
+        for depth in range(1, self._max_depth + 1):
+            try:
+                score, move = self._search_root(game, player, depth, best_move)
+            except SearchTimeout:
+                # Take back the moves left on the board when the search was stopped
+                while game.get_undo_count() > undo_count:
+                    game.unmake_move()
+                break
+            best_move, best_score, completed_depth = move, score, depth
+            if abs(score) >= WIN_SCORE - self._max_depth:
+                break  # the game is decided; searching deeper will not change the move
+
+        if best_move is None:
+            # Not even the first iteration finished; fall back to the most promising move
+            best_move = self.order_moves(game, player)[0]
+        return SearchResult(best_move, best_score, completed_depth, self._nodes, time.perf_counter() - start)
+
+    def _search_root(self, game, player, depth, best_move):
+        """
+        Searches every move at the root to the depth and returns the best (score, move).
+        """
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        root_best = None
+        for move in self.order_moves(game, player, best_move):
+            if not game.make_move(player, move):
+                continue  # illegal fence
+            score = -self._negamax(game, 3 - player, depth - 1, -beta, -alpha, 1)
+            game.unmake_move()
+            if root_best is None or score > alpha:
+                alpha = score
+                root_best = move
+        self._table.store(game.get_hash(), depth, alpha, EXACT, root_best)
+        return alpha, root_best
+
+    def _negamax(self, game, player, depth, alpha, beta, ply):
+        """
+        Returns the score of the position for the player to move, searched to the depth.
+        """
+        self._nodes += 1
+        if time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        # The previous player's move won the game
+        if game.get_current_state() != 0:
+            return -WIN_SCORE + ply
+        if depth == 0:
+            return evaluate(game, player)
+
+        # Use the stored result if it was searched deep enough
+        key = game.get_hash()
+        table_move = None
+        entry = self._table.probe(key)
+        if entry is not None:
+            entry_depth, value, flag, table_move = entry
+            value = _score_from_table(value, ply)
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER_BOUND and value > alpha:
+                    alpha = value
+                elif flag == UPPER_BOUND and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    return value
+
+        original_alpha = alpha
+        best_score = None
+        best_move = None
+        for move in self.order_moves(game, player, table_move):
+            if not game.make_move(player, move):
+                continue  # illegal fence
+            score = -self._negamax(game, 3 - player, depth - 1, -beta, -alpha, ply + 1)
+            game.unmake_move()
+            if best_score is None or score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break  # the opponent will not allow this position
+        if best_score is None:
+            return evaluate(game, player)  # no legal move
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(key, depth, _score_to_table(best_score, ply), flag, best_move)
+        return best_score
+
+
+def best_move(game, time_limit=0.1):
+    """
+    Returns the best move for the player to move in the game found within the time limit,
+    as a ("p" | "h" | "v", (x, y)) tuple for QuoridorGame.make_move.
+    """
+    return SearchEngine(time_limit).search(game).get_move()
@@ -0,0 +1,157 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Plays Quoridor games between two players across a pool of processes
+
+import multiprocessing
+import random
+import time
+import weakref
+
+from quoridor import QuoridorGame, mask_squares
+
+
+def random_player(game, rng, fence_rate=0.2):
+    """
+    Player that makes a random pawn move, or places a random legal fence with a chance of fence_rate.
+    Every player is a callable that takes the QuoridorGame and a random.Random and returns a move tuple.
+    """
+    player = game.get_current_turn()
+    if game.get_fences_left(player) > 0 and rng.random() < fence_rate:
+        fences = game.valid_fences()
+        if fences:
+            return rng.choice(fences)
+    return "p", game.get_geometry().square_coordinates[rng.choice(mask_squares(game.pawn_move_mask(player)))]
+
+
+def shortest_path_player(game, rng):
+    """
+    Player that always moves its pawn along a shortest path to its goal baseline, breaking ties at random.
+    """
+    player = game.get_current_turn()
+    distances = game.get_distances(player)
+    squares = mask_squares(game.pawn_move_mask(player))
+    best = min(distances[square] for square in squares)
+    square = rng.choice([square for square in squares if distances[square] == best])
+    return "p", game.get_geometry().square_coordinates[square]
+
+
+# SearchEngine of this process for each (time_limit, depth) of search_player, with a weak reference to the
+# last game it searched; kept between moves so the transposition table is allocated once per worker
+_engines = {}
+
+
+def search_player(game, rng, time_limit=0.01, depth=None):
+    """
+    Player that uses the alpha-beta SearchEngine; use functools.partial to choose the time limit or the depth.
+    With a time limit the moves depend on the speed and load of the machine. With a depth the search has no
+    time limit and the transposition table is emptied when a new game starts, so the moves depend only on the game.
+    """
+    from search import SearchEngine  # imported here so workers that do not search do not load it
+    entry = _engines.get((time_limit, depth))
+    if entry is None:
+        engine = SearchEngine(None, depth) if depth is not None else SearchEngine(time_limit)
+        entry = _engines[(time_limit, depth)] = [engine, None]
+    engine, last_game = entry
+    if last_game is None or last_game() is not game:
+        if depth is not None:
+            engine.get_table().clear()
+        entry[1] = weakref.ref(game)
+    return engine.search(game).get_move()
+
+
+def game_seed(seed, index):
+    """
+    Returns the seed of the game at the index of a run; the same game gets the same seed
+    whichever worker plays it.
+    """
+    return (seed * 1000003 + index) & 0xFFFFFFFFFFFFFFFF
+
+
+def play_game(player1, player2, seed, max_moves=400, keep_moves=True):
+    """
+    Plays one game between two players.
+    :param player1: player callable for Player1
+    :param player2: player callable for Player2
+    :param seed: seed for the random.Random passed to the players
+    :param max_moves: moves after which the game is stopped as a draw
+    :param keep_moves: if True the result includes the list of moves
+    :return: dict with the seed, winner (0 for a draw), number of moves, reason the game ended and moves
+    """
+    rng = random.Random(seed)
+    game = QuoridorGame()
+    players = (None, player1, player2)
+    moves = []
+    winner = 0
+    reason = "max_moves"
+    while len(moves) < max_moves:
+        player = game.get_current_turn()
+        move = players[player](game, rng)
+        if move[0] == "p":
+            legal = game.move_pawn(player, move[1])
+        else:
+            legal = game.place_fence(player, move[0], move[1])
+        if not legal:
+            # An illegal move loses the game
+            winner = 3 - player
+            reason = "illegal"
+            break
+        moves.append((player, move))
+        if game.get_current_state() != 0:
+            winner = game.get_current_state()
+            reason = "goal"
+            break
+    result = {"seed": seed, "winner": winner, "length": len(moves), "reason": reason}
+    if keep_moves:
+        result["moves"] = moves
+    return result
+
+
+def _play_batch(task):
+    """
+    Plays a batch of games in a worker process and returns their results.
+    """
+    player1, player2, seed, indexes, max_moves, keep_moves = task
+    results = []
+    for index in indexes:
+        result = play_game(player1, player2, game_seed(seed, index), max_moves, keep_moves)
+        result["index"] = index
+        results.append(result)
+    return results
+
+
+def run_selfplay(player1, player2, games, processes=None, seed=0, batch_size=16, max_moves=400,
+                 keep_moves=True, progress=None, progress_interval=1.0):
+    """
+    Plays games between two players across a pool of processes and yields the results as batches finish.
+    The results of a run depend only on the players, games and seed, not on the number of processes,
+    although they are yielded in the order the batches finish; players that search with a time limit
+    also depend on the speed and load of the machine (search_player with a depth does not).
+    :param player1: player callable for Player1; must be picklable (a module-level function or functools.partial)
+    :param player2: player callable for Player2
+    :param games: number of games to play
+    :param processes: number of worker processes; os.cpu_count() by default
+    :param seed: seed of the run
+    :param batch_size: games played per task sent to a worker
+    :param max_moves: moves after which a game is stopped as a draw
+    :param keep_moves: if True each result includes the list of moves
+    :param progress: callable taking (games done, games, games per second), called every progress_interval seconds
+    :param progress_interval: seconds between calls to progress
+    :return: generator of result dicts from play_game, with the game index added
+    """
+    tasks = []
+    for start in range(0, games, batch_size):
+        indexes = range(start, min(start + batch_size, games))
+        tasks.append((player1, player2, seed, indexes, max_moves, keep_moves))
+
+    start_time = time.perf_counter()
+    last_report = start_time
+    done = 0
+    with multiprocessing.Pool(processes) as pool:
+        for results in pool.imap_unordered(_play_batch, tasks):
+            done += len(results)
+            for result in results:
+                yield result
+            now = time.perf_counter()
+            if progress is not None and (now - last_report >= progress_interval or done == games):
+                progress(done, games, done / (now - start_time))
+                last_report = now
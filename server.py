@@ -0,0 +1,353 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Asyncio server hosting many Quoridor games over a line-delimited JSON protocol
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from quoridor import QuoridorGame, square_coordinates
+
+# Protocol: every request and response is one JSON object on one line.
+# Requests carry an "op" and an optional "id" that is copied into the response.
+#   {"op": "new_game"}                                            -> {"ok": true, "game": 1}
+#   {"op": "move_pawn", "game": 1, "player": 1, "coordinates": [4, 1]}         -> {"ok": true, ...state}
+#   {"op": "place_fence", "game": 1, "player": 1, "fence_type": "h", "coordinates": [4, 4]}
+#   {"op": "valid_moves", "game": 1}                              -> {"ok": true, "moves": [[4, 1], ...]}
+#   {"op": "state", "game": 1}                                    -> {"ok": true, ...state}
+#   {"op": "close_game", "game": 1}                               -> {"ok": true}
+#       only on the connection that created the match
+#   {"op": "metrics", "format": "prometheus"}                     -> {"ok": true, "metrics": "..."}
+#       engine statistics when the server runs with instrumentation; "format" defaults to "json"
+# A move that is not allowed gets {"ok": false, "error": ...} and the game is unchanged; so does a request
+# with fields of the wrong type. The move clocks are charged on state and valid_moves requests too, so a player
+# that stops moving loses on time.
+
+
+def _is_int(value):
+    """ Returns True if a JSON value is an integer (and not true or false). """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class Match:
+    """ A class that creates a match: a QuoridorGame with a move clock for each player. """
+
+    def __init__(self, game_id, clock):
+        self._id = game_id
+        self._game = QuoridorGame()
+        self._clocks = [None, clock, clock]  # seconds left for each player, indexed by player number
+        self._turn_started = time.monotonic()  # when the player to move started thinking
+        self._flag_winner = 0  # winner on time, if a player's clock ran out
+
+    def get_game(self):
+        """ Returns the QuoridorGame of the match. """
+        return self._game
+
+    def get_winner(self):
+        """ Returns 0 if the match is unfinished, or 1 or 2 for the player that won on the board or on time. """
+        return self._game.get_current_state() or self._flag_winner
+
+    def charge_clock(self):
+        """
+        Charges the time since the turn started to the player to move, and ends the match if the clock ran out.
+        :return: True if the player to move still has time
+        """
+        if self.get_winner() != 0:
+            return False
+        player = self._game.get_current_turn()
+        now = time.monotonic()
+        self._clocks[player] -= now - self._turn_started
+        self._turn_started = now
+        if self._clocks[player] <= 0:
+            self._clocks[player] = 0.0
+            self._flag_winner = 3 - player
+            return False
+        return True
+
+    def get_state(self):
+        """ Returns a dict describing the match for a state response. """
+        game = self._game
+        return {
+            "game": self._id,
+            "turn": game.get_current_turn(),
+            "winner": self.get_winner(),
+            "pawns": [square_coordinates(game.get_pawn_square(1)), square_coordinates(game.get_pawn_square(2))],
+            "fences_left": [game.get_fences_left(1), game.get_fences_left(2)],
+            "clocks": [round(self._clocks[1], 3), round(self._clocks[2], 3)],
+        }
+
+
+class GameServer:
+    """
+    A class that serves many matches from one event loop. Each connection is read one request at a time,
+    and the next request is only read once the response has been written to the client, so a client that
+    does not read its responses is slowed down instead of growing the server's buffers.
+    """
+
+    def __init__(self, clock=300.0, write_timeout=10.0, line_limit=4096, instrumentation=None):
+        """
+        Initializes data members of the GameServer class.
+        :param clock: seconds on each player's move clock
+        :param write_timeout: seconds a client may take to accept a response before it is disconnected
+        :param line_limit: longest request line accepted, in bytes
+        :param instrumentation: enabled profiling.Instrumentation served by the metrics op, or None
+        """
+        self._instrumentation = instrumentation
+        self._clock = clock
+        self._write_timeout = write_timeout
+        self._line_limit = line_limit
+        self._matches = {}
+        self._next_id = 1
+        self._server = None
+        self._requests = 0
+
+    def get_match_count(self):
+        """ Returns the number of matches being hosted. """
+        return len(self._matches)
+
+    def get_request_count(self):
+        """ Returns the number of requests handled. """
+        return self._requests
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Starts listening for connections and returns the port the server listens on.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=self._line_limit)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """ Serves connections until the server is closed. """
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """ Stops listening for connections. """
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Reads requests from a connection and writes a response to each, until the client disconnects.
+        Matches created on the connection are removed when it closes.
+        """
+        owned = []
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    break  # request line longer than line_limit
+                if not line:
+                    break
+                response = self.handle_request(line, owned)
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                await asyncio.wait_for(writer.drain(), self._write_timeout)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            for game_id in owned:
+                self._matches.pop(game_id, None)
+            writer.close()
+
+    def handle_request(self, line, owned=None):
+        """
+        Handles one request line and returns the response dict.
+        :param line: bytes or str of one JSON request
+        :param owned: list of the ids of the matches created on the connection; new_game adds to it and
+                      close_game only closes the matches in it
+        """
+        self._requests += 1
+        try:
+            request = json.loads(line)
+            op = request["op"]
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "error": "bad request"}
+        try:
+            response = self._dispatch(op, request, owned)
+        except Exception:
+            # A request must never take the connection, and the matches it owns, down with it
+            response = {"ok": False, "error": "bad request"}
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def _dispatch(self, op, request, owned):
+        """
+        Runs a request and returns the response dict.
+        """
+        if op == "new_game":
+            game_id = self._next_id
+            self._next_id += 1
+            self._matches[game_id] = Match(game_id, self._clock)
+            if owned is not None:
+                owned.append(game_id)
+            return {"ok": True, "game": game_id}
+        if op == "metrics":
+            if self._instrumentation is None:
+                return {"ok": False, "error": "instrumentation disabled"}
+            if request.get("format") == "prometheus":
+                return {"ok": True, "metrics": self._instrumentation.to_prometheus()}
+            return {"ok": True, "metrics": self._instrumentation.snapshot()}
+
+        game_id = request.get("game")
+        if not _is_int(game_id):
+            return {"ok": False, "error": "bad request"}
+        match = self._matches.get(game_id)
+        if match is None:
+            return {"ok": False, "error": "unknown game"}
+        game = match.get_game()
+
+        if op == "state":
+            match.charge_clock()  # so a player that stalls loses on time without sending a move
+            response = match.get_state()
+            response["ok"] = True
+            return response
+        if op == "valid_moves":
+            match.charge_clock()
+            return {"ok": True, "moves": game.valid_moves() if match.get_winner() == 0 else []}
+        if op == "close_game":
+            # Only the connection that created a match may close it
+            if owned is None or game_id not in owned:
+                return {"ok": False, "error": "not your game"}
+            owned.remove(game_id)
+            del self._matches[game_id]
+            return {"ok": True}
+
+        if op in ("move_pawn", "place_fence"):
+            player = request.get("player")
+            coordinates = request.get("coordinates")
+            fence_type = request.get("fence_type")
+            if (not _is_int(player) or not isinstance(coordinates, list) or len(coordinates) != 2 or
+                    not all(_is_int(value) for value in coordinates) or
+                    (op == "place_fence" and fence_type not in ("h", "v"))):
+                return {"ok": False, "error": "bad request"}
+            coordinates = tuple(coordinates)
+            if player != game.get_current_turn() or not match.charge_clock():
+                legal = False
+            elif op == "move_pawn":
+                legal = game.move_pawn(player, coordinates)
+            else:
+                legal = game.place_fence(player, fence_type, coordinates)
+            response = match.get_state()
+            response["ok"] = legal
+            if not legal:
+                response["error"] = "illegal move"
+            return response
+
+        return {"ok": False, "error": "unknown op"}
+
+
+async def _load_client(host, port, games, rng, latencies, fence_rate):
+    """
+    Plays games on the server as both players with random moves and records the latency of every move.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(request):
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    for i in range(games):
+        game_id = (await call({"op": "new_game"}))["game"]
+        state = await call({"op": "state", "game": game_id})
+        while state["winner"] == 0:
+            player = state["turn"]
+            if rng.random() < fence_rate:
+                request = {"op": "place_fence", "game": game_id, "player": player,
+                           "fence_type": rng.choice("hv"), "coordinates": [rng.randrange(9), rng.randrange(9)]}
+            else:
+                moves = (await call({"op": "valid_moves", "game": game_id}))["moves"]
+                request = {"op": "move_pawn", "game": game_id, "player": player, "coordinates": rng.choice(moves)}
+            start = time.perf_counter()
+            state = await call(request)
+            latencies.append(time.perf_counter() - start)
+        await call({"op": "close_game", "game": game_id})
+    writer.close()
+
+
+async def run_load(host, port, clients=100, games=5, seed=0, fence_rate=0.1):
+    """
+    Runs clients concurrent load-generator clients against a server, each playing games to the end,
+    and returns a dict with the number of moves, moves per second and the p50, p99 and max move latency in ms.
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[_load_client(host, port, games, random.Random(seed + i), latencies, fence_rate)
+                           for i in range(clients)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000 if latencies else 0.0
+
+    return {
+        "clients": clients,
+        "moves": len(latencies),
+        "moves_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "max_ms": percentile(1.0),
+    }
+
+
+async def _local_load(clients, games, seed):
+    """
+    Starts a server in this process on a free port and runs the load generator against it.
+    """
+    server = GameServer()
+    port = await server.start()
+    try:
+        return await run_load("127.0.0.1", port, clients, games, seed)
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    """
+    Runs the server or the load generator from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Quoridor game server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--clock", type=float, default=300.0, help="seconds on each player's move clock")
+    serve.add_argument("--instrument", type=int, metavar="N",
+                       help="instrument the engine, timing one call in N, and serve the metrics op")
+    load = commands.add_parser("load", help="run the load generator")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=8765)
+    load.add_argument("--local", action="store_true", help="start a server in this process to run against")
+    load.add_argument("--clients", type=int, default=100)
+    load.add_argument("--games", type=int, default=5, help="games played by each client")
+    load.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        instrumentation = None
+        if args.instrument:
+            from profiling import Instrumentation
+            instrumentation = Instrumentation(sample_every=args.instrument)
+            instrumentation.enable()
+        server = GameServer(clock=args.clock, instrumentation=instrumentation)
+
+        async def serve_forever():
+            port = await server.start(args.host, args.port)
+            print("listening on %s:%d" % (args.host, port))
+            await server.serve_forever()
+
+        asyncio.run(serve_forever())
+    elif args.local:
+        print(json.dumps(asyncio.run(_local_load(args.clients, args.games, args.seed))))
+    else:
+        print(json.dumps(asyncio.run(run_load(args.host, args.port, args.clients, args.games, args.seed))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Checks that the replay and analytics pipeline adds up the same statistics however it splits archives
+
+import glob
+import os
+
+import pytest
+
+from analytics import GameStats, analyze_chunk, make_tasks, run_pipeline
+from records import RecordWriter, read_games, replay
+from selfplay import play_game, random_player, shortest_path_player
+
+
+@pytest.fixture(scope="module")
+def archives(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("archives")
+    for archive in range(2):
+        with open(os.path.join(str(directory), "games%d.qrg" % archive), "wb") as file:
+            writer = RecordWriter(file)
+            for seed in range(12):
+                moves = play_game(random_player, shortest_path_player, archive * 100 + seed, max_moves=120)["moves"]
+                writer.write_game(moves)
+    return str(directory)
+
+
+def sequential_stats(paths):
+    """ Returns the GameStats of the archives, replaying one game after the other. """
+    stats = GameStats()
+    for path in paths:
+        for moves in read_games(path):
+            game, rejected = replay(moves)
+            stats.add_game(game, moves, rejected)
+    return stats
+
+
+@pytest.mark.parametrize("chunk_size", [64, 1000, 1 << 20])
+def test_merged_chunks_match_sequential_replay(archives, chunk_size):
+    # user-013: every game is counted once whatever the byte ranges, and merge adds up every statistic
+    paths = sorted(glob.glob(os.path.join(archives, "*.qrg")))
+    total = GameStats()
+    for task in make_tasks(paths, chunk_size):
+        total.merge(analyze_chunk(task))
+    expected = sequential_stats(paths).to_dict()
+    assert expected["games"] == 24
+    assert total.to_dict() == expected
+
+
+def test_pipeline_matches_sequential_replay(archives):
+    # user-013
+    paths = sorted(glob.glob(os.path.join(archives, "*.qrg")))
+    stats = run_pipeline(archives, processes=2, chunk_size=256)
+    assert stats.to_dict() == sequential_stats(paths).to_dict()
@@ -0,0 +1,88 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Checks the batched NumPy Quoridor environment against the QuoridorGame rules engine
+
+import random
+
+import numpy as np
+import pytest
+
+from batch_env import BatchQuoridor, evaluate_positions, encode_positions, ACTIONS, SQUARES, square_index
+from quoridor import QuoridorGame
+
+
+def random_games(rng, count, max_moves=40):
+    """ Returns a list of games played from the start with random moves, fences often. """
+    games = []
+    for i in range(count):
+        game = QuoridorGame()
+        for move in range(rng.randrange(max_moves)):
+            if game.get_current_state() != 0:
+                break
+            fences = game.valid_fences() if rng.random() < 0.5 else []
+            game.make_move(game.get_current_turn(),
+                           rng.choice(fences) if fences else ("p", rng.choice(game.valid_moves())))
+        games.append(game)
+    return games
+
+
+def test_cross_check_agrees_with_the_engine():
+    # user-008: every mask and step is compared against a mirrored QuoridorGame
+    rng = np.random.default_rng(8)
+    batch = BatchQuoridor(32, cross_check=True)
+    for i in range(250):
+        mask = batch.action_mask()
+        actions = []
+        for legal in mask:
+            legal = np.flatnonzero(legal)
+            pawn_moves = legal[legal < SQUARES]
+            if not len(legal) or rng.random() < 0.05:
+                actions.append(int(rng.integers(-5, ACTIONS + 5)))  # often illegal or out of range
+            elif len(pawn_moves) and rng.random() < 0.6:
+                actions.append(int(rng.choice(pawn_moves)))
+            else:
+                actions.append(int(rng.choice(legal)))
+        batch.step(np.array(actions))
+        done = np.flatnonzero(batch.get_state() != 0)
+        if len(done):
+            batch.reset(done)
+
+
+def test_cross_check_leaves_loaded_games_untouched():
+    # user-008: a cross-checked batch mirrors loaded games in copies of its own
+    game = random_games(random.Random(1), 1)[0]
+    position = game.get_game_state()
+    batch = BatchQuoridor.from_games([game, game], cross_check=True)
+    for i in range(4):
+        moves = np.flatnonzero(batch.pawn_move_mask()[0])
+        batch.step(np.array([moves[0], moves[0]]))
+    assert game.get_game_state() == position
+    assert batch.get_pawns()[0].tolist() == batch.get_pawns()[1].tolist()
+
+
+@pytest.mark.parametrize("action", [-1, ACTIONS, -SQUARES])
+def test_out_of_range_actions_are_illegal(action):
+    # user-008
+    batch = BatchQuoridor(1, cross_check=True)
+    assert not batch.step(np.array([action]))[0]
+    assert batch.get_pawns()[0].tolist() == [square_index((4, 0)), square_index((4, 8))]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_evaluate_positions_matches_the_engine(chunk_size):
+    # user-019: path lengths and mobility are the QuoridorGame's, whatever the chunk size
+    games = random_games(random.Random(19), 40)
+    features = evaluate_positions(games, chunk_size)
+    assert features["path_lengths"].shape == (40, 2)
+    for game, path_lengths, mobility in zip(games, features["path_lengths"], features["mobility"]):
+        assert path_lengths.tolist() == [game.get_path_length(1), game.get_path_length(2)]
+        assert mobility.tolist() == [bin(game.pawn_move_mask(1)).count("1"), bin(game.pawn_move_mask(2)).count("1")]
+    encoded = evaluate_positions(encode_positions(games), chunk_size)
+    assert all(np.array_equal(encoded[name], features[name]) for name in features)
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_evaluate_positions_refuses_empty_chunks(chunk_size):
+    # user-019
+    with pytest.raises(ValueError):
+        evaluate_positions(random_games(random.Random(1), 3), chunk_size)
@@ -0,0 +1,103 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Checks the endgame tables of book.py against searches of the QuoridorGame rules engine
+
+import random
+
+import pytest
+
+from book import EndgameTables, write_endgame_tables, solve_race, table_index
+from quoridor import QuoridorGame
+
+
+def endgame(rng, fences=3):
+    """ Returns a game in which both players placed their fences at random and have none left. """
+    game = QuoridorGame(fences=fences)
+    while game.get_fences_left(1) or game.get_fences_left(2):
+        game.make_move(game.get_current_turn(), rng.choice(game.valid_fences()))
+    return game
+
+
+def race_minimax(game, depth):
+    """
+    Returns the result of the pawn race for the player to move found by searching every move to the depth:
+    n > 0 for a win in n moves, -n for a loss in n moves, or 0 if neither is forced within the depth.
+    """
+    if depth == 0:
+        return 0
+    player = game.get_current_turn()
+    children = []
+    for coordinates in game.valid_moves():
+        game.make_move(player, ("p", coordinates))
+        if game.get_current_state() != 0:
+            game.unmake_move()
+            return 1  # the move reaches the goal baseline
+        children.append(race_minimax(game, depth - 1))
+        game.unmake_move()
+    if any(child < 0 for child in children):
+        return min(-child for child in children if child < 0) + 1  # the quickest win
+    if all(child > 0 for child in children):
+        return -(max(children) + 1)  # the slowest loss
+    return 0
+
+
+@pytest.fixture(scope="module")
+def table_file(tmp_path_factory):
+    game = endgame(random.Random(14))
+    path = str(tmp_path_factory.mktemp("book") / "endgames.qeg")
+    assert write_endgame_tables([game], path) == 1
+    return game, path
+
+
+def test_probe_reads_the_file_only_by_default(table_file):
+    # user-014: layouts not in the file are not solved unless asked, so probes stay constant-time
+    game, path = table_file
+    tables = EndgameTables(path)
+    try:
+        assert tables.get_size() == 1
+        assert isinstance(game.get_endgame_result(tables), int)
+        other = endgame(random.Random(15))
+        assert other.get_fence_hash() != game.get_fence_hash()
+        assert other.get_endgame_result(tables) is None
+    finally:
+        tables.close()
+
+
+def test_solve_missing_matches_the_file(table_file):
+    # user-014
+    game, path = table_file
+    game = QuoridorGame.from_game_state(game.get_game_state())
+    tables = EndgameTables(path)
+    solving = EndgameTables(solve_missing=True, cache_size=1)
+    try:
+        rng = random.Random(16)
+        while game.get_current_state() == 0:
+            assert game.get_endgame_result(solving) == game.get_endgame_result(tables)
+            game.make_move(game.get_current_turn(), ("p", rng.choice(game.valid_moves())))
+        assert game.get_endgame_result(solving) is None
+    finally:
+        tables.close()
+        solving.close()
+
+
+def test_solve_race_matches_minimax():
+    # user-014: the retrograde analysis agrees with a plain search wherever the result is within its depth
+    rng = random.Random(10)
+    depth = 5
+    decided = 0
+    for layout in range(3):
+        game = endgame(rng)
+        table = solve_race(game.get_h_fences(), game.get_v_fences())
+        for move in range(40):
+            if game.get_current_state() != 0:
+                break
+            solved = table[table_index(game.get_pawn_square(1), game.get_pawn_square(2), game.get_current_turn())]
+            assert race_minimax(game, depth) == (solved if abs(solved) <= depth else 0)
+            decided += solved != 0 and abs(solved) <= depth
+            player = game.get_current_turn()
+            distances = game.get_distances(player)
+            moves = game.valid_moves()
+            if rng.random() < 0.6:
+                moves = [min(moves, key=lambda coordinates: distances[game.get_geometry().square_index(coordinates)])]
+            game.make_move(player, ("p", rng.choice(moves)))
+    assert decided >= 10
@@ -0,0 +1,35 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Checks the Monte Carlo Tree Search player against the QuoridorGame rules engine
+
+import random
+
+import pytest
+
+from mcts import MCTSPlayer
+from quoridor import QuoridorGame
+
+
+@pytest.mark.parametrize("playouts", [0, 1, 200])
+def test_moves_are_legal_and_leave_the_game_unchanged(playouts):
+    # user-006: the player keeps its tree between moves and never changes the game it is given
+    rng = random.Random(6)
+    player = MCTSPlayer(playouts=playouts, seed=6)
+    game = QuoridorGame()
+    while game.get_current_state() == 0 and game.get_undo_count() < 30:
+        position = game.get_game_state()
+        move = player.choose_move(game)
+        assert game.get_game_state() == position
+        assert game.make_move(game.get_current_turn(), move)
+        if game.get_current_state() == 0:
+            game.make_move(game.get_current_turn(), ("p", rng.choice(game.valid_moves())))
+
+
+def test_takes_a_win_in_one():
+    # user-006
+    game = QuoridorGame()
+    for move in [("p", (4, 1)), ("p", (4, 7)), ("p", (4, 2)), ("p", (4, 6)), ("p", (4, 3)), ("p", (3, 6)),
+                 ("p", (4, 4)), ("p", (3, 5)), ("p", (4, 5)), ("p", (3, 4)), ("p", (4, 6)), ("p", (3, 3)),
+                 ("p", (4, 7)), ("p", (3, 2))]:
+        assert game.make_move(game.get_current_turn(), move)
+    assert MCTSPlayer(playouts=300, seed=1).choose_move(game) == ("p", (4, 8))
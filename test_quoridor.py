@@ -0,0 +1,207 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Checks the incremental state of the Quoridor rules engine against recomputation from scratch
+
+import random
+
+import pytest
+
+from quoridor import QuoridorGame, GameState, UNREACHABLE, NEXT_PLAYERS
+
+
+def random_game(rng, size=9, players=2, moves=60, fence_rate=0.4, undo_rate=0.2):
+    """
+    Yields a game after every random move or take-back; fences are placed and taken back often.
+    """
+    game = QuoridorGame(size, players)
+    for i in range(moves):
+        if game.get_undo_count() and rng.random() < undo_rate:
+            game.unmake_move()
+            yield game
+            continue
+        if game.get_current_state() != 0:
+            return
+        player = game.get_current_turn()
+        fences = game.valid_fences() if rng.random() < fence_rate else []
+        move = rng.choice(fences) if fences else ("p", rng.choice(game.valid_moves()))
+        assert game.make_move(player, move)
+        yield game
+
+
+def goals(game, player):
+    """ Returns a function telling whether x, y is on the player's goal baseline. """
+    last = game.get_board_size() - 1
+    return (None, lambda x, y: y == last, lambda x, y: y == 0,
+            lambda x, y: x == last, lambda x, y: x == 0)[player]
+
+
+def reaches_goal(game, player, h_fences, v_fences):
+    """
+    Returns True if the player's pawn has a path to its goal baseline, with a breadth-first search over
+    x, y coordinates that does not use the engine's tables.
+    """
+    size = game.get_board_size()
+    geometry = game.get_geometry()
+    is_goal = goals(game, player)
+    start = geometry.square_coordinates[game.get_pawn_square(player)]
+    seen = {start}
+    queue = [start]
+    for x, y in queue:
+        if is_goal(x, y):
+            return True
+        steps = []
+        if y > 0 and not h_fences >> (y * size + x) & 1:
+            steps.append((x, y - 1))
+        if y < size - 1 and not h_fences >> ((y + 1) * size + x) & 1:
+            steps.append((x, y + 1))
+        if x > 0 and not v_fences >> (y * size + x) & 1:
+            steps.append((x - 1, y))
+        if x < size - 1 and not v_fences >> (y * size + x + 1) & 1:
+            steps.append((x + 1, y))
+        for step in steps:
+            if step not in seen:
+                seen.add(step)
+                queue.append(step)
+    return False
+
+
+def scratch_hash(game):
+    """ Returns the Zobrist hash of the game's position computed from scratch. """
+    players = range(1, game.get_player_count() + 1)
+    state = GameState(tuple([None] + [game.get_pawn_square(player) for player in players]),
+                      game.get_h_fences(), game.get_v_fences(),
+                      tuple([None] + [game.get_fences_left(player) for player in players]),
+                      game.get_current_turn(), geometry=game.get_geometry())
+    return state.get_hash()
+
+
+def snapshot(game):
+    """ Returns everything observable about the game's position. """
+    players = range(1, game.get_player_count() + 1)
+    return (GameState.from_game(game), game.get_hash(), game.get_current_state(),
+            [game.get_fences_left(player) for player in players],
+            [list(game.get_distances(player)) for player in players],
+            game.valid_moves(), game.valid_fences())
+
+
+@pytest.mark.parametrize("size, players", [(9, 2), (9, 4), (5, 2)])
+def test_distances_match_full_search(size, players):
+    # user-002, user-018: distance maps kept up to date by every fence, on any board size
+    rng = random.Random(size * 10 + players)
+    for seed in range(15):
+        for game in random_game(rng, size, players):
+            geometry = game.get_geometry()
+            for player in range(1, players + 1):
+                expected = geometry.goal_distances(geometry.goal_masks[player], game.get_h_fences(),
+                                                   game.get_v_fences())
+                assert list(game.get_distances(player)) == list(expected)
+                assert game.get_path_length(player) != UNREACHABLE
+
+
+@pytest.mark.parametrize("size, players", [(9, 2), (7, 4)])
+def test_fence_cuts_path_matches_brute_force(size, players):
+    # user-002
+    rng = random.Random(size + players)
+    for seed in range(4):
+        for game in random_game(rng, size, players, moves=60, fence_rate=0.8):
+            if rng.random() < 0.7:
+                continue
+            coordinates = game.get_geometry().square_coordinates
+            for fence_type in ("h", "v"):
+                taken = game.get_h_fences() if fence_type == "h" else game.get_v_fences()
+                for square in range(size * size):
+                    x, y = coordinates[square]
+                    if taken >> square & 1 or (fence_type == "h" and y == 0) or (fence_type == "v" and x == 0):
+                        continue
+                    h_fences = game.get_h_fences() | (1 << square if fence_type == "h" else 0)
+                    v_fences = game.get_v_fences() | (1 << square if fence_type == "v" else 0)
+                    expected = not all(reaches_goal(game, player, h_fences, v_fences)
+                                       for player in range(1, players + 1))
+                    assert game.fence_cuts_path(fence_type, (x, y)) == expected
+
+
+def test_unmake_move_restores_position():
+    # user-003
+    rng = random.Random(3)
+    for seed in range(20):
+        game = QuoridorGame()
+        history = [snapshot(game)]
+        while game.get_current_state() == 0 and len(history) < 40:
+            player = game.get_current_turn()
+            fences = game.valid_fences() if rng.random() < 0.4 else []
+            move = rng.choice(fences) if fences else ("p", rng.choice(game.valid_moves()))
+            assert game.make_move(player, move)
+            history.append(snapshot(game))
+        history.pop()
+        while history:
+            assert game.unmake_move() is not None
+            assert snapshot(game) == history.pop()
+        assert game.unmake_move() is None
+
+
+def test_direct_moves_end_the_undo_stack():
+    # user-003: unmake_move only takes back what make_move made
+    game = QuoridorGame()
+    assert game.make_move(1, ("p", (4, 1)))
+    assert game.move_pawn(2, (4, 7))
+    assert game.get_undo_count() == 0
+    assert game.unmake_move() is None
+    assert game.get_pawn_square(2) == game.get_geometry().square_index((4, 7))
+    assert game.get_hash() == scratch_hash(game)
+
+    # make_move keeps its stack and takes back only its own moves after a direct move
+    assert game.make_move(1, ("h", (0, 4)))
+    assert game.place_fence(2, "v", (5, 5))
+    assert game.make_move(1, ("p", (4, 2)))
+    after_fence = snapshot(game)
+    assert game.make_move(2, ("p", (4, 6)))
+    assert game.get_undo_count() == 2
+    assert game.unmake_move() == (2, ("p", (4, 6)))
+    assert snapshot(game) == after_fence
+    assert game.unmake_move() == (1, ("p", (4, 2)))
+    assert game.unmake_move() is None
+    assert game.get_hash() == scratch_hash(game)
+
+
+@pytest.mark.parametrize("size, players", [(9, 2), (9, 4)])
+def test_hashes_match_recomputation(size, players):
+    # user-004, user-016: hashes of QuoridorGame moves and of GameState.apply_move
+    rng = random.Random(players)
+    for seed in range(15):
+        state = GameState.from_game(QuoridorGame(size, players))
+        for game in random_game(rng, size, players, undo_rate=0.1):
+            assert game.get_hash() == scratch_hash(game)
+            state = GameState.from_game(game)
+            assert state.get_hash() == game.get_hash()
+        # apply_move keeps the hash incrementally too
+        for i in range(20):
+            if state.get_current_state() != 0:
+                break
+            game = state.to_game()
+            fences = game.valid_fences() if rng.random() < 0.4 else []
+            move = rng.choice(fences) if fences else ("p", rng.choice(game.valid_moves()))
+            state = state.apply_move(move)
+            assert state is not None
+            assert state.get_hash() == scratch_hash(state.to_game())
+
+
+def test_cached_moves_match_recomputation():
+    # user-017: the cached legal moves are cleared by every change of position
+    rng = random.Random(17)
+    for seed in range(10):
+        for game in random_game(rng, 9, 2):
+            moves, fences = game.valid_moves(), game.valid_fences()
+            game._clear_move_cache()
+            assert game.valid_moves() == moves and game.valid_fences() == fences
+
+
+def test_four_players_take_turns_clockwise():
+    # user-018: Player1 starts at the top, then Player4 on the right, Player2 at the bottom, Player3 on the left
+    game = QuoridorGame(9, 4)
+    turns = []
+    for i in range(8):
+        player = game.get_current_turn()
+        turns.append(player)
+        assert game.make_move(player, ("p", game.valid_moves()[0]))
+        assert GameState.from_game(game).get_current_turn() == NEXT_PLAYERS[4][player]
+    assert turns == [1, 4, 2, 3, 1, 4, 2, 3]
@@ -0,0 +1,58 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Checks the compact binary game record format against replays in the QuoridorGame rules engine
+
+import io
+import random
+
+import pytest
+
+from quoridor import QuoridorGame
+from records import RecordWriter, HEADER, iter_games, replay
+
+
+@pytest.mark.parametrize("move", [("p", (9, 0)), ("h", (-1, 4)), ("v", (3, 9)), ("x", (3, 3))])
+def test_off_board_moves_are_refused(move):
+    # user-012: an off-board call must not be stored as a different, on-board one
+    file = io.BytesIO()
+    writer = RecordWriter(file)
+    writer.write_move(1, ("p", (4, 1)))
+    with pytest.raises(ValueError):
+        writer.write_move(2, move, legal=False)
+    writer.write_move(2, ("h", (4, 4)), legal=True)
+    writer.end_game()
+    assert list(iter_games(file.getvalue())) == [[(1, ("p", (4, 1)), True), (2, ("h", (4, 4)), True)]]
+    assert file.getvalue().startswith(HEADER)
+
+
+def test_records_round_trip():
+    # user-012: games, rejected calls included, decode and replay to the same positions
+    rng = random.Random(12)
+    file = io.BytesIO()
+    writer = RecordWriter(file)
+    games = []
+    for seed in range(30):
+        game = QuoridorGame()
+        moves = []
+        while game.get_current_state() == 0 and len(moves) < 80:
+            player = game.get_current_turn()
+            if rng.random() < 0.1:
+                # A fence on the top edge is never allowed; it is recorded as rejected
+                move = ("h", (rng.randrange(9), 0))
+                assert not game.place_fence(player, move[0], move[1])
+                moves.append((player, move, False))
+                continue
+            fences = game.valid_fences() if rng.random() < 0.3 else []
+            move = rng.choice(fences) if fences else ("p", rng.choice(game.valid_moves()))
+            assert game.make_move(player, move)
+            moves.append((player, move, True))
+        writer.write_game(moves)
+        games.append((moves, game.get_hash()))
+    assert writer.get_game_count() == len(games)
+
+    decoded = list(iter_games(file.getvalue()))
+    assert [moves for moves, position_hash in games] == decoded
+    for moves, position_hash in games:
+        game, rejected = replay(moves)
+        assert rejected == sum(1 for record in moves if not record[2])
+        assert game.get_hash() == position_hash
@@ -0,0 +1,53 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Checks the incremental board renderer and the spectator delta stream against the board's Cells
+
+import random
+
+import pytest
+
+from quoridor import QuoridorGame
+from render import BoardRenderer, SpectatorBoard
+
+
+def board_text(game):
+    """ Returns the board as print_board printed it before the renderer: the list of each row of Cells. """
+    text = ""
+    for row in game.get_board():
+        new_row = []
+        for cell in row:
+            pawn, v_fence, h_fence = cell.get_pawn(), cell.get_v_fence() == 1, cell.get_h_fence() == 1
+            if pawn:
+                name = "P%d_Pawn" % pawn
+                new_row.append(("| " if v_fence else "") + ("‾%s‾" % name if h_fence else name))
+            elif v_fence or h_fence:
+                new_row.append(("|" if v_fence else "") + ("‾‾" if h_fence else ""))
+            else:
+                new_row.append(cell.get_coordinates())
+        text += str(new_row) + "\n"
+    return text
+
+
+@pytest.mark.parametrize("size, players", [(9, 2), (9, 4), (5, 2)])
+def test_spectator_follows_the_renderer(size, players):
+    # user-021: a spectator that joins with a keyframe and applies every delta sees the renderer's frame
+    rng = random.Random(size + players)
+    for seed in range(5):
+        game = QuoridorGame(size, players)
+        renderer = BoardRenderer(game)
+        spectator = SpectatorBoard(size)
+        spectator.apply(renderer.keyframe())
+        while game.get_current_state() == 0 and game.get_undo_count() < 60:
+            player = game.get_current_turn()
+            fences = game.valid_fences() if rng.random() < 0.4 else []
+            game.make_move(player, rng.choice(fences) if fences else ("p", rng.choice(game.valid_moves())))
+            if rng.random() < 0.1:
+                game.unmake_move()
+            spectator.apply(renderer.update())
+            assert renderer.frame() == board_text(game)
+            assert spectator.frame() == renderer.frame()
+            assert spectator.get_current_turn() == game.get_current_turn()
+            assert spectator.get_current_state() == game.get_current_state()
+        late = SpectatorBoard(size)
+        late.apply(renderer.keyframe())
+        assert late.frame() == renderer.frame()
@@ -0,0 +1,56 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Checks the alpha-beta search against exact results of the Quoridor rules engine
+
+import random
+
+from book import solve_race, table_index
+from quoridor import QuoridorGame
+from search import SearchEngine, WIN_SCORE
+from transposition import TranspositionTable
+
+
+def race_positions(rng, count, fences=3):
+    """
+    Yields games in which both players placed their fences at random and have none left, then moved their
+    pawns, mostly along a shortest path, with the solve_race table of the fence layout.
+    """
+    for i in range(count):
+        game = QuoridorGame(fences=fences)
+        while game.get_fences_left(1) or game.get_fences_left(2):
+            game.make_move(game.get_current_turn(), rng.choice(game.valid_fences()))
+        table = solve_race(game.get_h_fences(), game.get_v_fences())
+        for move in range(rng.randrange(8, 16)):
+            if game.get_current_state() != 0:
+                break
+            player = game.get_current_turn()
+            moves = game.valid_moves()
+            if rng.random() < 0.75:
+                distances = game.get_distances(player)
+                moves = [min(moves, key=lambda coordinates: distances[game.get_geometry().square_index(coordinates)])]
+            game.make_move(player, ("p", rng.choice(moves)))
+        if game.get_current_state() == 0:
+            yield game, table
+
+
+def test_win_distances_match_solved_races():
+    # user-005: win scores read back from the transposition table keep their distance from the root
+    rng = random.Random(5)
+    table = TranspositionTable(1 << 14)  # shared by every search, as a player's engine shares it
+    depth = 7
+    decided = 0
+    for game, race in race_positions(rng, 15):
+        # Both players play the race out with the engine, so later searches read earlier results at other plies
+        while game.get_current_state() == 0:
+            result = SearchEngine(None, depth, table).search(game)
+            solved = race[table_index(game.get_pawn_square(1), game.get_pawn_square(2), game.get_current_turn())]
+            if 0 < solved <= depth:
+                assert result.get_score() == WIN_SCORE - solved
+                decided += 1
+            elif 0 < -solved <= depth:
+                assert result.get_score() == -WIN_SCORE - solved
+                decided += 1
+            else:
+                assert abs(result.get_score()) < WIN_SCORE - depth
+            game.make_move(game.get_current_turn(), result.get_move())
+    assert decided >= 20
@@ -0,0 +1,41 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Checks the request handling of the Quoridor game server
+
+import json
+
+from server import GameServer
+
+
+def request(server, owned=None, **fields):
+    """ Sends one request to the server and returns the response. """
+    return server.handle_request(json.dumps(fields), owned)
+
+
+def test_only_the_creator_closes_a_match():
+    # user-011: another connection cannot close a match, and closing it forgets the id
+    server = GameServer()
+    creator, other = [], []
+    game_id = request(server, creator, op="new_game")["game"]
+    assert request(server, other, op="close_game", game=game_id) == {"ok": False, "error": "not your game"}
+    assert request(server, None, op="close_game", game=game_id)["ok"] is False
+    assert request(server, other, op="state", game=game_id)["ok"] is True
+    assert request(server, creator, op="close_game", game=game_id, id=7) == {"ok": True, "id": 7}
+    assert creator == [] and server.get_match_count() == 0
+    assert request(server, creator, op="close_game", game=game_id) == {"ok": False, "error": "unknown game"}
+
+
+def test_malformed_requests_are_refused():
+    # user-011: a request with fields of the wrong type gets an error and changes nothing
+    server = GameServer()
+    owned = []
+    game_id = request(server, owned, op="new_game")["game"]
+    for fields in ({"player": 1, "coordinates": [4]}, {"player": True, "coordinates": [4, 1]},
+                   {"player": 1, "coordinates": "41"}, {"player": 1, "coordinates": [4.0, 1]}):
+        assert request(server, owned, op="move_pawn", game=game_id, **fields)["ok"] is False
+    assert request(server, owned, op="place_fence", game=game_id, player=1, fence_type="d",
+                   coordinates=[4, 4])["ok"] is False
+    assert server.handle_request(b"{not json", owned) == {"ok": False, "error": "bad request"}
+    assert request(server, owned, op="state", game=str(game_id))["ok"] is False
+    state = request(server, owned, op="move_pawn", game=game_id, player=1, coordinates=[4, 1])
+    assert state["ok"] is True and state["pawns"] == [(4, 1), (4, 8)] and state["turn"] == 2
@@ -0,0 +1,137 @@
+# Author: agent
+# Date: 10/17/2026
+# Description: Fixed-size transposition table for searching Quoridor positions
+
+from array import array
+
+from quoridor import BOARD_SIZE
+
+# Kinds of value stored with a position
+EXACT = 0  # the value is the exact score of the position
+LOWER_BOUND = 1  # the search failed high; the score is at least the value
+UPPER_BOUND = 2  # the search failed low; the score is at most the value
+
+# Bytes used by one entry: key (8), depth (1), value (4), flag (1), age (1) and move (2)
+ENTRY_BYTES = 17
+
+_MOVE_TYPES = ("p", "h", "v")
+
+
+def encode_move(move, size=BOARD_SIZE):
+    """
+    Packs a ("p" | "h" | "v", (x, y)) move tuple on a size x size board into a small integer; 0 means no move.
+    """
+    if move is None:
+        return 0
+    x, y = move[1]
+    return 1 + _MOVE_TYPES.index(move[0]) * size * size + y * size + x
+
+
+def decode_move(code, size=BOARD_SIZE):
+    """
+    Unpacks an integer made by encode_move back into a move tuple.
+    """
+    if code == 0:
+        return None
+    move_type, square = divmod(code - 1, size * size)
+    return _MOVE_TYPES[move_type], (square % size, square // size)
+
+
+class TranspositionTable:
+    """
+    A class that stores search results keyed by the Zobrist hash of a position (QuoridorGame.get_hash()).
+    The table never grows past its memory budget; when two positions share a slot the entry
+    from the older search or the shallower depth is replaced.
+    """
+
+    def __init__(self, size_bytes=16 * 1024 * 1024, board_size=BOARD_SIZE):
+        """
+        Initializes data members of the TranspositionTable class.
+        :param size_bytes: memory budget of the table in bytes
+        :param board_size: size of the board of the positions stored; moves are packed for it
+        """
+        if encode_move(("v", (board_size - 1, board_size - 1)), board_size) > 0xFFFF:
+            raise ValueError("board too large for the packed moves of the table")
+        self._board_size = board_size
+        # Use the largest power of two number of entries that fits in the budget
+        entries = 1 << max(0, (size_bytes // ENTRY_BYTES).bit_length() - 1)
+        self._mask = entries - 1
+        self._keys = array("Q", [0]) * entries
+        self._depths = array("b", [-1]) * entries  # -1 means the slot is empty
+        self._values = array("i", [0]) * entries
+        self._flags = array("B", [0]) * entries
+        self._ages = array("B", [0]) * entries
+        self._moves = array("H", [0]) * entries  # best move, packed by encode_move
+        self._age = 0  # age of the current search; entries from earlier searches are replaced first
+
+        # Counters for tuning the table size
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0
+
+    def get_size(self):
+        """
+        Returns the number of entries the table can hold.
+        """
+        return self._mask + 1
+
+    def get_board_size(self):
+        """
+        Returns the size of the board the table stores positions of.
+        """
+        return self._board_size
+
+    def get_stats(self):
+        """
+        Returns a dict with the number of probes, hits and stores since the table was created.
+        """
+        return {"probes": self._probes, "hits": self._hits, "stores": self._stores}
+
+    def new_search(self):
+        """
+        Starts a new search; entries stored before it are replaced before newer ones.
+        """
+        self._age = (self._age + 1) & 0xFF
+
+    def clear(self):
+        """
+        Empties the table.
+        """
+        self._depths = array("b", [-1]) * (self._mask + 1)
+
+    def probe(self, key):
+        """
+        Looks up a position by its hash.
+        :param key: 64-bit Zobrist hash of the position
+        :return: tuple (depth, value, flag, move) or None if the position is not in the table
+        """
+        self._probes += 1
+        slot = key & self._mask
+        if self._depths[slot] < 0 or self._keys[slot] != key:
+            return None
+        self._hits += 1
+        self._ages[slot] = self._age  # the entry is still useful to the current search
+        return (self._depths[slot], self._values[slot], self._flags[slot],
+                decode_move(self._moves[slot], self._board_size))
+
+    def store(self, key, depth, value, flag, move=None):
+        """
+        Stores a search result for a position, unless the slot holds a deeper result from the current search.
+        :param key: 64-bit Zobrist hash of the position
+        :param depth: depth the position was searched to (0 to 127)
+        :param value: score of the position
+        :param flag: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move: best move found in the position, or None
+        :return: True if the result was stored
+        """
+        slot = key & self._mask
+        if self._depths[slot] >= 0 and self._ages[slot] == self._age and depth < self._depths[slot]:
+            return False
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._values[slot] = value
+        self._flags[slot] = flag
+        self._ages[slot] = self._age
+        self._moves[slot] = encode_move(move, self._board_size)
+        self._stores += 1
+        return True